@@ -0,0 +1,54 @@
+"""
+Application counters on job offers
+Kept up to date by database triggers, reconciled in bulk by a periodic task
+"""
+
+from django.db import connections, transaction
+
+
+# JobOffer counter -> application statuses it counts
+STATUS_COUNTERS = {
+    'applications_count': None,  # every status except WITHDRAWN
+    'submitted_count': 'SUBMITTED',
+    'shortlisted_count': 'SHORTLISTED',
+    'interview_count': 'INTERVIEW_SCHEDULED',
+    'accepted_count': 'ACCEPTED',
+}
+
+
+def _counter_filter(status):
+    if status is None:
+        return "a.status <> 'WITHDRAWN'"
+    return f"a.status = '{status}'"
+
+
+RECONCILE_SQL = """
+    UPDATE job_offers AS j SET {assignments}, updated_at = now()
+    FROM (
+        SELECT o.id, {aggregates}
+        FROM job_offers AS o
+        LEFT JOIN applications AS a ON a.job_offer_id = o.id
+        GROUP BY o.id
+    ) AS c
+    WHERE j.id = c.id
+      AND ({current}) IS DISTINCT FROM ({expected})
+    RETURNING j.id
+""".format(
+    assignments=', '.join(f'{name} = c.{name}' for name in STATUS_COUNTERS),
+    aggregates=', '.join(
+        f'count(a.id) FILTER (WHERE {_counter_filter(status)}) AS {name}'
+        for name, status in STATUS_COUNTERS.items()
+    ),
+    current=', '.join(f'j.{name}' for name in STATUS_COUNTERS),
+    expected=', '.join(f'c.{name}' for name in STATUS_COUNTERS),
+)
+
+
+def reconcile_application_counters(using='default'):
+    """
+    Recompute every job's application counters with one aggregate query
+    Only jobs whose counters drifted are written. Returns their ids.
+    """
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        cursor.execute(RECONCILE_SQL)
+        return [row[0] for row in cursor.fetchall()]
@@ -0,0 +1,20 @@
+"""
+Management command to recompute application counters on job offers
+"""
+
+from django.core.management.base import BaseCommand
+
+from applications.counters import reconcile_application_counters
+
+
+class Command(BaseCommand):
+    help = 'Recomputes applications_count and per-status counters for every job offer'
+
+    def handle(self, *args, **options):
+        fixed = reconcile_application_counters()
+        if fixed:
+            self.stdout.write(self.style.WARNING(
+                f'Fixed drifted counters on {len(fixed)} job offers'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS('All application counters are up to date'))
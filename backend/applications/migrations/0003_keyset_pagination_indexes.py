@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_initial'),
+        ('jobs', '0004_trigram_indexes'),
+        ('users', '0002_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['-applied_at', 'id'], name='application_applied_4d45ac_idx'),
+        ),
+    ]
@@ -0,0 +1,106 @@
+from django.db import migrations
+
+
+# Keep job_offers.applications_count (every application except withdrawn
+# ones) and the per-status counters in step with the applications table.
+# Statement-level triggers aggregate the transition tables so a bulk insert
+# or a set-based status update touches each job row once, with a single
+# atomic `count = count + delta`. updated_at moves with the counters, so the
+# job's ETag / Last-Modified validators do too.
+COUNTER_TRIGGERS_SQL = """
+CREATE OR REPLACE FUNCTION job_offers_application_counters() RETURNS trigger AS $$
+DECLARE
+    changed_rows text;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed_rows := 'SELECT job_offer_id, status, 1 AS sign FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        changed_rows := 'SELECT job_offer_id, status, -1 AS sign FROM old_rows';
+    ELSE
+        changed_rows := 'SELECT job_offer_id, status, 1 AS sign FROM new_rows '
+                        'UNION ALL SELECT job_offer_id, status, -1 AS sign FROM old_rows';
+    END IF;
+
+    EXECUTE format($sql$
+        UPDATE job_offers AS j SET
+            applications_count = j.applications_count + d.total,
+            submitted_count = j.submitted_count + d.submitted,
+            shortlisted_count = j.shortlisted_count + d.shortlisted,
+            interview_count = j.interview_count + d.interview,
+            accepted_count = j.accepted_count + d.accepted,
+            updated_at = now()
+        FROM (
+            SELECT
+                job_offer_id,
+                sum(CASE WHEN status <> 'WITHDRAWN' THEN sign ELSE 0 END) AS total,
+                sum(CASE WHEN status = 'SUBMITTED' THEN sign ELSE 0 END) AS submitted,
+                sum(CASE WHEN status = 'SHORTLISTED' THEN sign ELSE 0 END) AS shortlisted,
+                sum(CASE WHEN status = 'INTERVIEW_SCHEDULED' THEN sign ELSE 0 END) AS interview,
+                sum(CASE WHEN status = 'ACCEPTED' THEN sign ELSE 0 END) AS accepted
+            FROM (%s) AS changed
+            GROUP BY job_offer_id
+        ) AS d
+        WHERE j.id = d.job_offer_id
+          AND (d.total, d.submitted, d.shortlisted, d.interview, d.accepted) <> (0, 0, 0, 0, 0)
+    $sql$, changed_rows);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER applications_counters_insert
+    AFTER INSERT ON applications
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION job_offers_application_counters();
+
+CREATE TRIGGER applications_counters_update
+    AFTER UPDATE ON applications
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION job_offers_application_counters();
+
+CREATE TRIGGER applications_counters_delete
+    AFTER DELETE ON applications
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION job_offers_application_counters();
+"""
+
+DROP_COUNTER_TRIGGERS_SQL = """
+DROP TRIGGER IF EXISTS applications_counters_delete ON applications;
+DROP TRIGGER IF EXISTS applications_counters_update ON applications;
+DROP TRIGGER IF EXISTS applications_counters_insert ON applications;
+DROP FUNCTION IF EXISTS job_offers_application_counters();
+"""
+
+BACKFILL_COUNTERS_SQL = """
+UPDATE job_offers AS j SET
+    applications_count = c.total,
+    submitted_count = c.submitted,
+    shortlisted_count = c.shortlisted,
+    interview_count = c.interview,
+    accepted_count = c.accepted
+FROM (
+    SELECT
+        o.id,
+        count(a.id) FILTER (WHERE a.status <> 'WITHDRAWN') AS total,
+        count(a.id) FILTER (WHERE a.status = 'SUBMITTED') AS submitted,
+        count(a.id) FILTER (WHERE a.status = 'SHORTLISTED') AS shortlisted,
+        count(a.id) FILTER (WHERE a.status = 'INTERVIEW_SCHEDULED') AS interview,
+        count(a.id) FILTER (WHERE a.status = 'ACCEPTED') AS accepted
+    FROM job_offers AS o
+    LEFT JOIN applications AS a ON a.job_offer_id = o.id
+    GROUP BY o.id
+) AS c
+WHERE j.id = c.id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0003_keyset_pagination_indexes'),
+        ('jobs', '0007_joboffer_application_status_counters'),
+    ]
+
+    operations = [
+        migrations.RunSQL(COUNTER_TRIGGERS_SQL, DROP_COUNTER_TRIGGERS_SQL),
+        migrations.RunSQL(BACKFILL_COUNTERS_SQL, migrations.RunSQL.noop),
+    ]
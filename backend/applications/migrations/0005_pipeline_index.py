@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_application_counters'),
+        ('jobs', '0014_joboffer_simhash'),
+        ('users', '0005_yearly_xof_salaries'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(models.F('job_offer'), models.F('status'), models.OrderBy(models.F('match_score'), descending=True, nulls_last=True), models.F('applied_at'), name='applications_pipeline'),
+        ),
+    ]
@@ -15,6 +15,9 @@ from jobs.models import JobOffer
 class Application(models.Model):
     """
     Job application model representing candidate applications to job offers
+    
+    The job offer's applications_count and per-status counters are kept in
+    sync by database triggers (see migration 0004_application_counters).
     """
     
     STATUS_CHOICES = [
@@ -27,6 +30,17 @@ class Application(models.Model):
         ('WITHDRAWN', 'Withdrawn'),
     ]
     
+    # Status a recruiter can move applications to in bulk -> statuses it can be
+    # reached from (see applications.transitions). Deliberately stricter than the
+    # single-item actions, which accept any current status: a bulk move only
+    # touches the applications in one of these statuses and skips the others.
+    BULK_TRANSITIONS = {
+        'VIEWED': ('SUBMITTED',),
+        'SHORTLISTED': ('SUBMITTED', 'VIEWED', 'INTERVIEW_SCHEDULED'),
+        'REJECTED': ('SUBMITTED', 'VIEWED', 'SHORTLISTED', 'INTERVIEW_SCHEDULED', 'ACCEPTED'),
+        'ACCEPTED': ('SUBMITTED', 'VIEWED', 'SHORTLISTED', 'INTERVIEW_SCHEDULED', 'REJECTED'),
+    }
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     candidate = models.ForeignKey(
         Candidate,
@@ -79,6 +93,13 @@ class Application(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['-match_score']),
             models.Index(fields=['-applied_at']),
+            models.Index(fields=['-applied_at', 'id']),
+            # Pipeline board columns (see applications.pipeline)
+            models.Index(
+                models.F('job_offer'), models.F('status'),
+                models.F('match_score').desc(nulls_last=True), models.F('applied_at'),
+                name='applications_pipeline',
+            ),
         ]
     
     def __str__(self):
@@ -122,13 +143,3 @@ class Application(models.Model):
         """Withdraw the application (by candidate)"""
         self.status = 'WITHDRAWN'
         self.save()
-    
-    def save(self, *args, **kwargs):
-        """Override save to update job offer applications count"""
-        is_new = self.pk is None
-        super().save(*args, **kwargs)
-        
-        if is_new:
-            # Increment applications count on job offer
-            self.job_offer.applications_count += 1
-            self.job_offer.save(update_fields=['applications_count'])
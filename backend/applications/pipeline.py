@@ -0,0 +1,95 @@
+"""
+Recruiter pipeline board of a job offer
+One column per application status: a grouped count and the column's first cards from one windowed query
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+
+from .models import Application
+from .serializers import ApplicationCardSerializer
+
+
+CACHE_KEY = 'applications:pipeline:{}:{}:{}'  # job offer, generation, limit
+GENERATION_KEY = 'applications:pipeline:{}:generation'
+
+# Candidate user fields shown on a card: their boards are rebuilt when these change
+CANDIDATE_FIELDS = ('first_name', 'last_name', 'email')
+
+# Columns ApplicationCardSerializer reads, cover letters and notes left out
+CARD_COLUMNS = (
+    'id', 'candidate', 'status', 'match_score', 'interview_date', 'applied_at',
+    *(f'candidate__id__{field}' for field in CANDIDATE_FIELDS),
+)
+
+# Best matches first, then the earliest applications
+CARD_ORDERING = [F('match_score').desc(nulls_last=True), F('applied_at').asc(), F('pk').asc()]
+
+
+def get_generation(job_offer_id):
+    return cache.get(GENERATION_KEY.format(job_offer_id), 0)
+
+
+def invalidate(job_offer_id):
+    """Drop the cached boards of a job offer; old entries are never read again and expire"""
+    key = GENERATION_KEY.format(job_offer_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+        cache.incr(key)
+
+
+def invalidate_candidate(candidate_id):
+    """Drop the cached boards of every job offer the candidate applied to"""
+    job_offer_ids = (
+        Application.objects.filter(candidate_id=candidate_id)
+        .order_by().values_list('job_offer_id', flat=True).distinct()
+    )
+    for job_offer_id in job_offer_ids:
+        invalidate(job_offer_id)
+
+
+def build_pipeline(job_offer_id, limit):
+    """
+    Columns of a job offer's board, in STATUS_CHOICES order
+    Counts come from one GROUP BY status; the first `limit` cards of every
+    column from one query numbering each status' applications with ROW_NUMBER().
+    """
+    applications = Application.objects.filter(job_offer_id=job_offer_id)
+    counts = dict(
+        applications.order_by().values('status').annotate(count=Count('pk')).values_list('status', 'count')
+    )
+    cards = (
+        applications
+        .select_related('candidate__id')
+        .only(*CARD_COLUMNS)
+        .annotate(position=Window(RowNumber(), partition_by=F('status'), order_by=CARD_ORDERING))
+        .filter(position__lte=limit)
+        .order_by('status', 'position')
+    )
+
+    cards_by_status = {}
+    for card in cards:
+        cards_by_status.setdefault(card.status, []).append(card)
+    return [
+        {
+            'status': status,
+            'label': label,
+            'count': counts.get(status, 0),
+            'applications': ApplicationCardSerializer(cards_by_status.get(status, []), many=True).data,
+        }
+        for status, label in Application.STATUS_CHOICES
+    ]
+
+
+def get_pipeline(job_offer_id, limit):
+    """Cached board of a job offer, rebuilt once an application to it changes"""
+    key = CACHE_KEY.format(job_offer_id, get_generation(job_offer_id), limit)
+    columns = cache.get(key)
+    if columns is None:
+        columns = build_pipeline(job_offer_id, limit)
+        cache.set(key, columns, settings.JOB_PIPELINE_CACHE_TIMEOUT)
+    return columns
@@ -0,0 +1,69 @@
+"""
+Application match scores
+Applications are scored in chunks with the recommendation engine's feature matrices
+"""
+
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from jobs.models import JobOffer
+from jobs.recommendations import JOB_COLUMNS, JobFeatures, load_candidates, score_matrix
+from users.models import Candidate
+from . import pipeline
+from .models import Application
+
+
+SCORE_PRECISION = Decimal('0.01')
+
+
+def _score_chunk(rows):
+    """Application objects carrying the new match_score of each (id, candidate, job) row"""
+    job_ids = list({job_id for _, _, job_id in rows})
+    candidate_ids = list({candidate_id for _, candidate_id, _ in rows})
+
+    jobs = JobFeatures.from_rows(list(JobOffer.objects.filter(pk__in=job_ids).values_list(*JOB_COLUMNS)))
+    candidates = load_candidates(Candidate.objects.filter(pk__in=candidate_ids), jobs.vocabulary)
+    scores = score_matrix(candidates, jobs)
+
+    # Pick each application's (candidate, job) cell out of the chunk's matrix
+    job_index = {job_id: index for index, job_id in enumerate(jobs.ids)}
+    candidate_index = {candidate_id: index for index, candidate_id in enumerate(candidates.ids)}
+    rows = [row for row in rows if row[1] in candidate_index and row[2] in job_index]
+    picked = scores[
+        np.array([candidate_index[candidate_id] for _, candidate_id, _ in rows], dtype=np.intp),
+        np.array([job_index[job_id] for _, _, job_id in rows], dtype=np.intp),
+    ]
+
+    now = timezone.now()
+    return [
+        Application(
+            pk=pk,
+            match_score=Decimal(float(score)).quantize(SCORE_PRECISION),
+            updated_at=now,
+        )
+        for (pk, _, _), score in zip(rows, picked)
+    ]
+
+
+def score_applications(queryset):
+    """
+    Recompute match_score of every application in the queryset, return the count
+    Applications are scored APPLICATION_SCORING_CHUNK_SIZE at a time, each chunk
+    written with one bulk_update. updated_at moves too, so list ETags change;
+    bulk_update sends no post_save, so pipeline boards are dropped here.
+    """
+    chunk_size = settings.APPLICATION_SCORING_CHUNK_SIZE
+    rows = list(queryset.order_by('pk').values_list('pk', 'candidate_id', 'job_offer_id'))
+
+    scored = 0
+    for start in range(0, len(rows), chunk_size):
+        applications = _score_chunk(rows[start:start + chunk_size])
+        Application.objects.bulk_update(applications, ['match_score', 'updated_at'])
+        scored += len(applications)
+    for job_offer_id in {job_offer_id for _, _, job_offer_id in rows}:
+        transaction.on_commit(lambda job_offer_id=job_offer_id: pipeline.invalidate(job_offer_id))
+    return scored
@@ -3,13 +3,15 @@ Serializers for Applications app
 Handles serialization of Application model
 """
 
+from django.conf import settings
 from rest_framework import serializers
 from .models import Application
 from jobs.serializers import JobOfferListSerializer
 from users.serializers import CandidateListSerializer
+from core.projection import SparseFieldsetMixin
 
 
-class ApplicationSerializer(serializers.ModelSerializer):
+class ApplicationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Application model"""
     
     candidate_info = CandidateListSerializer(source='candidate', read_only=True)
@@ -29,7 +31,7 @@ class ApplicationSerializer(serializers.ModelSerializer):
         ]
 
 
-class ApplicationCreateSerializer(serializers.ModelSerializer):
+class ApplicationCreateSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for creating applications"""
     
     class Meta:
@@ -55,7 +57,7 @@ class ApplicationCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ApplicationListSerializer(serializers.ModelSerializer):
+class ApplicationListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Lightweight serializer for listing applications"""
     
     candidate_name = serializers.CharField(source='candidate.id.full_name', read_only=True)
@@ -71,7 +73,21 @@ class ApplicationListSerializer(serializers.ModelSerializer):
         ]
 
 
-class ApplicationUpdateSerializer(serializers.ModelSerializer):
+class ApplicationCardSerializer(serializers.ModelSerializer):
+    """Application card of a job's pipeline board, the column giving its status"""
+    
+    candidate_name = serializers.CharField(source='candidate.id.full_name', read_only=True)
+    candidate_email = serializers.EmailField(source='candidate.id.email', read_only=True)
+    
+    class Meta:
+        model = Application
+        fields = [
+            'id', 'candidate', 'candidate_name', 'candidate_email',
+            'match_score', 'interview_date', 'applied_at'
+        ]
+
+
+class ApplicationUpdateSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for updating application status (by recruiter)"""
     
     class Meta:
@@ -94,7 +110,22 @@ class ApplicationUpdateSerializer(serializers.ModelSerializer):
         return value
 
 
-class ApplicationDetailSerializer(serializers.ModelSerializer):
+class ApplicationBulkStatusSerializer(serializers.Serializer):
+    """Applications to move to one status at once (by recruiter)"""
+    
+    ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False)
+    status = serializers.ChoiceField(choices=list(Application.BULK_TRANSITIONS))
+    reason = serializers.CharField(required=False, allow_blank=True)
+    
+    def validate_ids(self, value):
+        if len(value) > settings.APPLICATION_BULK_STATUS_MAX_IDS:
+            raise serializers.ValidationError(
+                f'At most {settings.APPLICATION_BULK_STATUS_MAX_IDS} applications can be updated at once.'
+            )
+        return value
+
+
+class ApplicationDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Detailed serializer for Application with full information"""
     
     candidate_info = CandidateListSerializer(source='candidate', read_only=True)
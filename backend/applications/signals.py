@@ -0,0 +1,28 @@
+"""
+Signal handlers for Applications app
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.models import User
+from . import pipeline
+from .models import Application
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_pipeline(sender, instance, **kwargs):
+    """A job's pipeline board changes with every application to it"""
+    transaction.on_commit(lambda: pipeline.invalidate(instance.job_offer_id))
+
+
+@receiver(post_save, sender=User)
+def invalidate_candidate_pipelines(sender, instance, created=False, update_fields=None, **kwargs):
+    """Boards show the candidate's name and email: rebuild those of their jobs when these change"""
+    if created or instance.role != 'CANDIDATE':
+        return
+    if update_fields is not None and not set(update_fields) & set(pipeline.CANDIDATE_FIELDS):
+        return
+    transaction.on_commit(lambda: pipeline.invalidate_candidate(instance.pk))
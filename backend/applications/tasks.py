@@ -0,0 +1,48 @@
+"""
+Celery tasks for Applications app
+"""
+
+import logging
+
+from celery import shared_task
+
+from jobs import response_cache
+from .counters import reconcile_application_counters
+from .models import Application
+from .scoring import score_applications
+from .transitions import notify_candidates
+
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def reconcile_job_application_counters():
+    """Recompute application counters on job offers and report drift"""
+    fixed = reconcile_application_counters()
+    if fixed:
+        logger.warning('Application counters drifted on %s job offers', len(fixed))
+        # Raw SQL sends no post_save: drop cached job payloads here
+        response_cache.bump_generation()
+    return f"Reconciled {len(fixed)} job offers"
+
+
+@shared_task
+def score_application(application_id):
+    """Compute the match score of a new application"""
+    scored = score_applications(Application.objects.filter(pk=application_id))
+    return f"Scored {scored} application"
+
+
+@shared_task
+def rescore_job_applications(job_offer_id):
+    """Recompute the match score of every application to a job offer"""
+    scored = score_applications(Application.objects.filter(job_offer_id=job_offer_id))
+    return f"Rescored {scored} applications"
+
+
+@shared_task
+def notify_status_changes(application_ids, status):
+    """Notify the candidates of applications moved to a new status in bulk"""
+    notified = notify_candidates(application_ids, status)
+    return f"Notified {notified} candidates"
@@ -1,3 +1,421 @@
-from django.test import TestCase
+"""
+Query budget tests for the Applications API
+"""
 
-# Create your tests here.
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from applications import pipeline
+from applications.counters import reconcile_application_counters
+from applications.models import Application
+from applications.scoring import score_applications
+from applications.transitions import notify_candidates
+from core.testing import (
+    QueryBudgetTestCase, make_candidate, make_recruiter, make_admin, make_job,
+    make_application,
+)
+from jobs.models import JobOffer, PublishedJobCard
+from notifications.models import Notification
+
+
+class ApplicationQueryBudgetTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.candidate = make_candidate()
+        self.job = make_job(self.recruiter)
+        self.application = make_application(self.candidate, self.job)
+
+    def add_applications(self, n=5):
+        for _ in range(n):
+            make_application(self.candidate, make_job(self.recruiter))
+            make_application(make_candidate(), self.job)
+
+    def test_candidate_list(self):
+        self.client.force_authenticate(self.candidate.id)
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/applications/?page_size=100'), grow=self.add_applications)
+
+    def test_recruiter_list(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/applications/?page_size=100'), grow=self.add_applications)
+
+    def test_admin_list(self):
+        self.client.force_authenticate(make_admin().id)
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/applications/?page_size=100'), grow=self.add_applications)
+
+    def test_recruiter_list_cursor(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertQueryBudget(1, lambda: self.client.get(
+            '/api/v1/applications/?pagination=cursor&page_size=100'
+        ), grow=self.add_applications)
+
+    def test_cursor_page_not_modified(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.add_applications()
+        url = '/api/v1/applications/?pagination=cursor&page_size=3'
+        response = self.client.get(url)
+        next_url = response.data['next']
+        etag = self.client.get(next_url)['ETag']
+        self.assertNotEqual(etag, response['ETag'])
+
+        self.assertQueryBudget(1, lambda: self.client.get(next_url, HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(self.client.get(next_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        on_page = Application.objects.get(pk=self.client.get(next_url).data['results'][0]['id'])
+        on_page.recruiter_notes = 'Call back'
+        on_page.save()
+        self.assertEqual(self.client.get(next_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_my_applications(self):
+        self.client.force_authenticate(self.candidate.id)
+        self.assertQueryBudget(2, lambda: self.client.get(
+            '/api/v1/applications/my_applications/?page_size=100'
+        ), grow=self.add_applications)
+
+    def test_retrieve(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertQueryBudget(2, lambda: self.client.get(f'/api/v1/applications/{self.application.pk}/'))
+
+    def test_create(self):
+        self.client.force_authenticate(self.candidate.id)
+        job = make_job(self.recruiter)
+        self.assertQueryBudget(4, lambda: self.client.post(
+            '/api/v1/applications/', {'job_offer': str(job.pk), 'cover_letter': 'Hello'}, format='json'
+        ))
+
+    def test_update(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertQueryBudget(2, lambda: self.client.patch(
+            f'/api/v1/applications/{self.application.pk}/', {'recruiter_notes': 'Strong profile'}, format='json'
+        ))
+
+    def test_withdraw(self):
+        self.client.force_authenticate(self.candidate.id)
+        self.assertQueryBudget(2, lambda: self.client.post(f'/api/v1/applications/{self.application.pk}/withdraw/'))
+
+    def test_status_transitions(self):
+        self.client.force_authenticate(self.recruiter.id)
+        base = f'/api/v1/applications/{self.application.pk}'
+        self.assertQueryBudget(2, lambda: self.client.post(f'{base}/mark_viewed/'))
+        self.assertQueryBudget(2, lambda: self.client.post(f'{base}/shortlist/'))
+        self.assertQueryBudget(2, lambda: self.client.post(
+            f'{base}/schedule_interview/', {'interview_date': '2030-01-15T10:00:00Z'}, format='json'
+        ))
+        self.assertQueryBudget(2, lambda: self.client.post(f'{base}/accept/'))
+
+    def test_reject(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertQueryBudget(2, lambda: self.client.post(
+            f'/api/v1/applications/{self.application.pk}/reject/', {'reason': 'Position filled'}, format='json'
+        ))
+
+
+class ApplicationCounterTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.job = make_job(make_recruiter())
+
+    def counters(self):
+        return JobOffer.objects.values_list(
+            'applications_count', 'submitted_count', 'shortlisted_count',
+            'interview_count', 'accepted_count',
+        ).get(pk=self.job.pk)
+
+    def test_counters_follow_application_lifecycle(self):
+        first = make_application(make_candidate(), self.job)
+        second = make_application(make_candidate(), self.job)
+        self.assertEqual(self.counters(), (2, 2, 0, 0, 0))
+
+        first.shortlist()
+        self.assertEqual(self.counters(), (2, 1, 1, 0, 0))
+        first.accept()
+        self.assertEqual(self.counters(), (2, 1, 0, 0, 1))
+
+        second.withdraw()
+        self.assertEqual(self.counters(), (1, 0, 0, 0, 1))
+        first.delete()
+        self.assertEqual(self.counters(), (0, 0, 0, 0, 0))
+
+    def test_bulk_writes_are_counted(self):
+        Application.objects.bulk_create([
+            Application(candidate=make_candidate(), job_offer=self.job) for _ in range(3)
+        ])
+        Application.objects.filter(job_offer=self.job).update(status='INTERVIEW_SCHEDULED')
+        self.assertEqual(self.counters(), (3, 0, 0, 3, 0))
+        self.assertEqual(PublishedJobCard.objects.get(pk=self.job.pk).applications_count, 3)
+
+    def test_reconcile_fixes_drift(self):
+        make_application(make_candidate(), self.job)
+        JobOffer.objects.filter(pk=self.job.pk).update(applications_count=42, accepted_count=7)
+
+        self.assertEqual(reconcile_application_counters(), [self.job.pk])
+        self.assertEqual(self.counters(), (1, 1, 0, 0, 0))
+        call_command('reconcile_application_counters', stdout=StringIO())
+        self.assertEqual(reconcile_application_counters(), [])
+
+
+class ApplicationSparseFieldsetTests(QueryBudgetTestCase):
+
+    def test_detail_without_nested_info(self):
+        recruiter = make_recruiter()
+        application = make_application(make_candidate(), make_job(recruiter))
+        self.client.force_authenticate(recruiter.id)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/v1/applications/{application.pk}/?fields=id,status,match_score')
+        self.assertEqual(set(response.data), {'id', 'status', 'match_score'})
+        self.assertNotIn('"cover_letter"', queries[-1]['sql'])
+        self.assertNotIn('JOIN "users"', queries[-1]['sql'])
+
+
+class ApplicationMatchScoreTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.job = make_job(self.recruiter, skills_required=['Python', 'Django'], experience_level='JUNIOR')
+        self.candidate = make_candidate(skills=['Python', 'Django'], experience_years=1)
+
+    def test_scored_after_create(self):
+        self.client.force_authenticate(self.candidate.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/v1/applications/', {'job_offer': str(self.job.pk)})
+        self.assertEqual(response.status_code, 201, response.data)
+        score = Application.objects.get(pk=response.data['id']).match_score
+        self.assertGreaterEqual(score, Decimal('0.9'))
+
+    def test_job_update_rescores_its_applications(self):
+        applications = [make_application(self.candidate, self.job)] + [
+            make_application(make_candidate(skills=['Python']), self.job) for _ in range(3)
+        ]
+        score_applications(Application.objects.filter(job_offer=self.job))
+        self.client.force_authenticate(self.recruiter.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f'/api/v1/jobs/{self.job.pk}/', {'skills_required': ['Go', 'Kubernetes']}, format='json'
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+        for application in applications:
+            application.refresh_from_db()
+            self.assertLess(application.match_score, Decimal('0.7'))
+
+    def test_unscored_edit_does_not_rescore(self):
+        application = make_application(self.candidate, self.job)
+        self.client.force_authenticate(self.recruiter.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/v1/jobs/{self.job.pk}/', {'title': 'Backend developer'}, format='json')
+        application.refresh_from_db()
+        self.assertIsNone(application.match_score)
+
+    def test_one_bulk_update_per_chunk(self):
+        for _ in range(5):
+            make_application(make_candidate(), self.job)
+            make_application(self.candidate, make_job(self.recruiter))
+        with self.settings(APPLICATION_SCORING_CHUNK_SIZE=4):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(score_applications(Application.objects.all()), 10)
+        updates = [query for query in queries if query['sql'].startswith('UPDATE "applications"')]
+        # Applications, then jobs, candidates and one UPDATE per chunk of 4
+        self.assertEqual(len(updates), 3)
+        self.assertEqual(len(queries), 1 + 3 * 3)
+        self.assertFalse(Application.objects.filter(match_score__isnull=True).exists())
+
+
+class ApplicationPipelineTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.job = make_job(self.recruiter)
+        self.url = f'/api/v1/jobs/{self.job.pk}/pipeline/'
+        self.best = make_application(make_candidate(), self.job, match_score=Decimal('0.90'))
+        self.unscored = make_application(make_candidate(), self.job)
+        self.good = make_application(make_candidate(), self.job, match_score=Decimal('0.60'))
+        self.shortlisted = make_application(make_candidate(), self.job, status='SHORTLISTED')
+        make_application(make_candidate(), make_job(self.recruiter))
+        self.client.force_authenticate(self.recruiter.id)
+
+    def add_applications(self, n=5):
+        for _ in range(n):
+            make_application(make_candidate(), self.job, status='SHORTLISTED', match_score=Decimal('0.50'))
+
+    def columns(self, url=None):
+        response = self.client.get(url or self.url)
+        self.assertEqual(response.status_code, 200, response.data)
+        return {column['status']: column for column in response.data['columns']}
+
+    def test_columns(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 4)
+        self.assertEqual(
+            [column['status'] for column in response.data['columns']],
+            [status for status, _ in Application.STATUS_CHOICES]
+        )
+        columns = self.columns()
+        submitted = columns['SUBMITTED']
+        self.assertEqual(submitted['count'], 3)
+        # Best match first, unscored applications last
+        self.assertEqual(
+            [card['id'] for card in submitted['applications']],
+            [str(self.best.pk), str(self.good.pk), str(self.unscored.pk)]
+        )
+        self.assertEqual(columns['SHORTLISTED']['count'], 1)
+        self.assertEqual(columns['ACCEPTED'], {'status': 'ACCEPTED', 'label': 'Accepted', 'count': 0, 'applications': []})
+
+    def test_limit(self):
+        submitted = self.columns(f'{self.url}?limit=2')['SUBMITTED']
+        self.assertEqual(submitted['count'], 3)
+        self.assertEqual([card['id'] for card in submitted['applications']], [str(self.best.pk), str(self.good.pk)])
+        self.assertEqual(self.client.get(f'{self.url}?limit=many').status_code, 400)
+
+    def test_status_change_invalidates(self):
+        self.columns()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.best.shortlist()
+        columns = self.columns()
+        self.assertEqual(columns['SUBMITTED']['count'], 2)
+        self.assertEqual(columns['SHORTLISTED']['applications'][0]['id'], str(self.best.pk))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            score_applications(Application.objects.filter(pk=self.unscored.pk))
+        self.assertIsNotNone(self.columns()['SUBMITTED']['applications'][-1]['match_score'])
+
+    def test_only_the_owner(self):
+        self.client.force_authenticate(make_recruiter().id)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.force_authenticate(make_candidate().id)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_budget(self):
+        # Job, grouped counts and the windowed cards, then the job alone once cached
+        self.assertQueryBudget(3, lambda: self.client.get(self.url), grow=self.add_applications)
+        self.assertQueryBudget(1, lambda: self.client.get(self.url))
+
+    def test_candidate_identity_refreshes_board(self):
+        self.columns()
+        user = self.best.candidate.id
+        with self.captureOnCommitCallbacks(execute=True):
+            user.first_name, user.email = 'Renamed', 'renamed@example.com'
+            user.save()
+        card = self.columns()['SUBMITTED']['applications'][0]
+        self.assertEqual(card['id'], str(self.best.pk))
+        self.assertEqual(card['candidate_email'], 'renamed@example.com')
+        self.assertTrue(card['candidate_name'].startswith('Renamed '))
+
+    def test_login_keeps_boards(self):
+        self.columns()
+        generation = pipeline.get_generation(self.job.pk)
+        user = self.best.candidate.id
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save(update_fields=['last_login'])
+        self.assertEqual(pipeline.get_generation(self.job.pk), generation)
+
+
+class ApplicationBulkStatusTests(QueryBudgetTestCase):
+
+    url = '/api/v1/applications/bulk_status/'
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.job = make_job(self.recruiter)
+        self.submitted = make_application(make_candidate(), self.job)
+        self.viewed = make_application(make_candidate(), self.job, status='VIEWED')
+        self.withdrawn = make_application(make_candidate(), self.job, status='WITHDRAWN')
+        self.other_job = make_application(make_candidate(), make_job(self.recruiter), status='ACCEPTED')
+        self.client.force_authenticate(self.recruiter.id)
+
+    def post(self, applications, status, **extra):
+        payload = {'ids': [str(application.pk) for application in applications], 'status': status, **extra}
+        return self.client.post(self.url, payload, format='json')
+
+    def add_applications(self, n=5):
+        for _ in range(n):
+            make_application(make_candidate(), self.job)
+
+    def test_shortlist(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post([self.submitted, self.viewed, self.withdrawn, self.other_job], 'SHORTLISTED')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(set(response.data['updated']), {str(self.submitted.pk), str(self.viewed.pk)})
+        self.assertEqual(
+            sorted(item['status'] for item in response.data['skipped']), ['ACCEPTED', 'WITHDRAWN']
+        )
+
+        self.submitted.refresh_from_db()
+        self.assertEqual(self.submitted.status, 'SHORTLISTED')
+        self.assertIsNotNone(self.submitted.responded_at)
+        self.withdrawn.refresh_from_db()
+        self.assertEqual(self.withdrawn.status, 'WITHDRAWN')
+        # Counters follow through the trigger
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.submitted_count, self.job.shortlisted_count), (0, 2))
+
+        notifications = Notification.objects.filter(type='APPLICATION_STATUS_CHANGED')
+        self.assertEqual(
+            set(notifications.values_list('user_id', flat=True)),
+            {self.submitted.candidate_id, self.viewed.candidate_id}
+        )
+        self.assertEqual(notifications.first().data['status'], 'SHORTLISTED')
+
+    def test_mark_viewed_and_reject(self):
+        response = self.post([self.submitted, self.viewed], 'VIEWED')
+        self.assertEqual(response.data['updated'], [str(self.submitted.pk)])
+        self.submitted.refresh_from_db()
+        self.assertIsNotNone(self.submitted.viewed_at)
+        self.assertIsNone(self.submitted.responded_at)
+
+        self.post([self.submitted, self.other_job], 'REJECTED', reason='Position filled')
+        self.other_job.refresh_from_db()
+        self.assertEqual((self.other_job.status, self.other_job.recruiter_notes), ('REJECTED', 'Position filled'))
+
+    def test_pipeline_is_refreshed(self):
+        pipeline_url = f'/api/v1/jobs/{self.job.pk}/pipeline/'
+        self.client.get(pipeline_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post([self.submitted], 'ACCEPTED')
+        columns = {column['status']: column['count'] for column in self.client.get(pipeline_url).data['columns']}
+        self.assertEqual((columns['SUBMITTED'], columns['ACCEPTED']), (0, 1))
+
+    def test_foreign_applications_update_nothing(self):
+        foreign = make_application(make_candidate(), make_job(make_recruiter()))
+        response = self.post([self.submitted, foreign], 'REJECTED')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data['missing'], [str(foreign.pk)])
+        self.submitted.refresh_from_db()
+        self.assertEqual(self.submitted.status, 'SUBMITTED')
+
+    def test_validation(self):
+        self.assertEqual(self.post([self.submitted], 'WITHDRAWN').status_code, 400)
+        self.assertEqual(self.post([], 'REJECTED').status_code, 400)
+        with self.settings(APPLICATION_BULK_STATUS_MAX_IDS=1):
+            self.assertEqual(self.post([self.submitted, self.viewed], 'REJECTED').status_code, 400)
+        self.client.force_authenticate(self.submitted.candidate.id)
+        self.assertEqual(self.post([self.submitted], 'ACCEPTED').status_code, 403)
+
+    def test_budget(self):
+        applications = list(Application.objects.filter(job_offer=self.job))
+        post = lambda: self.post(applications, 'REJECTED')
+        # Locking SELECT and one UPDATE, inside a savepoint
+        self.assertQueryBudget(4, post)
+        Application.objects.update(status='SUBMITTED')
+        self.add_applications(20)
+        applications = list(Application.objects.filter(job_offer=self.job))
+        self.assertEqual(self.count_queries(post), 4)
+
+    def test_notifications_in_one_insert(self):
+        self.add_applications(4)
+        applications = list(Application.objects.filter(job_offer=self.job, status='SUBMITTED'))
+        Application.objects.filter(pk__in=[application.pk for application in applications]).update(status='REJECTED')
+        with self.settings(APPLICATION_NOTIFICATION_BATCH_SIZE=1000):
+            with CaptureQueriesContext(connection) as queries:
+                notified = notify_candidates([application.pk for application in applications], 'REJECTED')
+        self.assertEqual(notified, 5)
+        # Applications with their jobs, then one INSERT
+        self.assertEqual(len(queries), 2)
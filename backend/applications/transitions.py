@@ -0,0 +1,87 @@
+"""
+Bulk application status transitions for recruiters
+Ownership is checked with one locking SELECT, the transition applied with one UPDATE
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from notifications.models import Notification
+from . import pipeline
+from .models import Application
+
+
+STATUS_LABELS = dict(Application.STATUS_CHOICES)
+
+
+def apply_transition(recruiter_id, application_ids, target, reason=None):
+    """
+    Move applications to the recruiter's jobs to `target`, all owned or none
+    Returns (updated ids, skipped [{'id', 'status'}], missing ids). Rows are
+    locked while their status is read, so the UPDATE cannot act on a status
+    changed in between; applications already in `target` or not allowed to
+    reach it are skipped. Candidates are notified by one task once committed.
+    """
+    from .tasks import notify_status_changes
+    
+    application_ids = list(dict.fromkeys(str(pk) for pk in application_ids))
+    allowed_from = Application.BULK_TRANSITIONS[target]
+
+    with transaction.atomic():
+        rows = list(
+            Application.objects
+            .filter(pk__in=application_ids, job_offer__recruiter_id=recruiter_id)
+            .select_for_update(of=('self',))
+            .values_list('pk', 'status', 'job_offer_id')
+        )
+        found = {str(pk) for pk, _, _ in rows}
+        missing = [pk for pk in application_ids if pk not in found]
+        if missing:
+            return [], [], missing
+
+        moving = [(str(pk), job_offer_id) for pk, current, job_offer_id in rows if current in allowed_from]
+        skipped = [{'id': str(pk), 'status': current} for pk, current, _ in rows if current not in allowed_from]
+        updated = [pk for pk, _ in moving]
+        if not updated:
+            return [], skipped, []
+
+        now = timezone.now()
+        changes = {'status': target, 'updated_at': now}
+        changes['viewed_at' if target == 'VIEWED' else 'responded_at'] = now
+        if target == 'REJECTED' and reason:
+            changes['recruiter_notes'] = reason
+        # QuerySet.update() sends no post_save: the counters trigger still runs, boards are dropped here
+        Application.objects.filter(pk__in=updated).update(**changes)
+        for job_offer_id in {job_offer_id for _, job_offer_id in moving}:
+            transaction.on_commit(lambda job_offer_id=job_offer_id: pipeline.invalidate(job_offer_id))
+        transaction.on_commit(lambda: notify_status_changes.delay(updated, target))
+    return updated, skipped, []
+
+
+def notify_candidates(application_ids, status):
+    """
+    Create one APPLICATION_STATUS_CHANGED notification per application still in `status`
+    Written APPLICATION_NOTIFICATION_BATCH_SIZE per INSERT; returns the number created.
+    """
+    applications = (
+        Application.objects
+        .filter(pk__in=application_ids, status=status)
+        .values_list('pk', 'candidate_id', 'job_offer_id', 'job_offer__title', 'job_offer__recruiter__company_name')
+    )
+    label = STATUS_LABELS[status].lower()
+    notifications = Notification.objects.bulk_create(
+        [
+            Notification(
+                user_id=candidate_id,
+                type='APPLICATION_STATUS_CHANGED',
+                channel='IN_APP',
+                title='Application Update',
+                message=f'Your application for {title} at {company} is now {label}.',
+                data={'application_id': str(pk), 'job_offer_id': str(job_offer_id), 'status': status},
+            )
+            for pk, candidate_id, job_offer_id, title, company in applications
+        ],
+        batch_size=settings.APPLICATION_NOTIFICATION_BATCH_SIZE,
+    )
+    return len(notifications)
@@ -7,18 +7,22 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db import models
+from django.db import models, transaction
 
 from .models import Application
+from .tasks import score_application
+from .transitions import apply_transition
 from .serializers import (
     ApplicationSerializer, ApplicationListSerializer,
     ApplicationCreateSerializer, ApplicationUpdateSerializer,
-    ApplicationDetailSerializer
+    ApplicationDetailSerializer, ApplicationBulkStatusSerializer
 )
 from users.permissions import IsCandidate, IsRecruiter, IsCandidateOwner, IsRecruiterOwner
+from core.conditional import ConditionalGetMixin
+from core.projection import SparseFieldsetViewMixin
 
 
-class ApplicationViewSet(viewsets.ModelViewSet):
+class ApplicationViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for Application model
     Handles job applications
@@ -29,6 +33,10 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     filterset_fields = ['status', 'job_offer', 'candidate']
     ordering_fields = ['applied_at', 'match_score']
     ordering = ['-applied_at']
+    cursor_ordering = ['-applied_at', 'pk']
+    last_modified_fields = [
+        'updated_at', 'candidate__updated_at', 'candidate__id__updated_at', 'job_offer__updated_at',
+    ]
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -55,7 +63,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         elif user.role != 'ADMIN':
             return Application.objects.none()
         
-        return queryset.select_related('candidate', 'job_offer', 'job_offer__recruiter')
+        return queryset.select_related('candidate__id', 'job_offer__recruiter')
     
     def create(self, request, *args, **kwargs):
         """Create application (candidates only)"""
@@ -69,7 +77,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         application = serializer.save()
         
         # TODO: Trigger notification to recruiter
-        # TODO: Calculate AI match score
+        transaction.on_commit(lambda: score_application.delay(str(application.pk)))
         
         return Response(
             ApplicationDetailSerializer(application).data,
@@ -87,7 +95,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         
         # Verify recruiter owns the job
         if request.user.role == 'RECRUITER':
-            if instance.job_offer.recruiter.id != request.user:
+            if instance.job_offer.recruiter_id != request.user.pk:
                 return Response({
                     'error': 'You can only update applications to your own jobs'
                 }, status=status.HTTP_403_FORBIDDEN)
@@ -110,7 +118,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         
         application = self.get_object()
         
-        if application.candidate.id != request.user:
+        if application.candidate_id != request.user.pk:
             return Response({
                 'error': 'You can only withdraw your own applications'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -137,7 +145,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         
         application = self.get_object()
         
-        if application.job_offer.recruiter.id != request.user:
+        if application.job_offer.recruiter_id != request.user.pk:
             return Response({
                 'error': 'You can only view applications to your own jobs'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -159,7 +167,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         
         application = self.get_object()
         
-        if application.job_offer.recruiter.id != request.user:
+        if application.job_offer.recruiter_id != request.user.pk:
             return Response({
                 'error': 'You can only shortlist applications to your own jobs'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -181,7 +189,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         
         application = self.get_object()
         
-        if application.job_offer.recruiter.id != request.user:
+        if application.job_offer.recruiter_id != request.user.pk:
             return Response({
                 'error': 'You can only schedule interviews for your own jobs'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -211,7 +219,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         
         application = self.get_object()
         
-        if application.job_offer.recruiter.id != request.user:
+        if application.job_offer.recruiter_id != request.user.pk:
             return Response({
                 'error': 'You can only reject applications to your own jobs'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -236,7 +244,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         
         application = self.get_object()
         
-        if application.job_offer.recruiter.id != request.user:
+        if application.job_offer.recruiter_id != request.user.pk:
             return Response({
                 'error': 'You can only accept applications to your own jobs'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -250,6 +258,36 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             'application': ApplicationDetailSerializer(application).data
         })
     
+    @action(detail=False, methods=['post'])
+    def bulk_status(self, request):
+        """Move many applications to the recruiter's jobs to one status, all owned or none"""
+        if request.user.role != 'RECRUITER':
+            return Response({
+                'error': 'Only recruiters can update application status'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        serializer = ApplicationBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        target = serializer.validated_data['status']
+        
+        updated, skipped, missing = apply_transition(
+            request.user.pk,
+            serializer.validated_data['ids'],
+            target,
+            reason=serializer.validated_data.get('reason'),
+        )
+        if missing:
+            return Response({
+                'error': f'{len(missing)} applications are not applications to your jobs, none was updated',
+                'missing': missing
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response({
+            'status': target,
+            'updated': updated,
+            'skipped': skipped
+        })
+    
     @action(detail=False, methods=['get'])
     def my_applications(self, request):
         """Get applications by current candidate"""
@@ -258,7 +296,9 @@ class ApplicationViewSet(viewsets.ModelViewSet):
                 'error': 'Only candidates can access this endpoint'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        applications = Application.objects.filter(candidate=request.user.candidate_profile)
+        applications = Application.objects.filter(
+            candidate_id=request.user.pk
+        ).select_related('candidate__id', 'job_offer__recruiter')
         page = self.paginate_queryset(applications)
         
         if page is not None:
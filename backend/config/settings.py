@@ -6,6 +6,7 @@ Production-ready configuration with Django 5.2 LTS
 from pathlib import Path
 from decouple import config, Csv
 from datetime import timedelta
+from celery.schedules import crontab
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -30,6 +31,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third-party apps
     'rest_framework',
@@ -57,6 +59,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.QueryInstrumentationMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -136,14 +139,15 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.StandardResultsPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # orjson-backed when installed, same bytes as DRF's JSONRenderer/JSONParser
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
+        'core.renderers.FastJSONRenderer',
     ),
     'DEFAULT_PARSER_CLASSES': (
-        'rest_framework.parsers.JSONParser',
+        'core.parsers.FastJSONParser',
         'rest_framework.parsers.MultiPartParser',
         'rest_framework.parsers.FormParser',
     ),
@@ -229,6 +233,30 @@ CELERY_TIMEZONE = 'UTC'
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
 
+# Periodic tasks (run with `celery -A config beat`)
+CELERY_BEAT_SCHEDULE = {
+    'flush-job-views': {
+        'task': 'jobs.tasks.flush_job_views',
+        'schedule': config('JOB_VIEWS_FLUSH_INTERVAL', default=60, cast=int),  # seconds
+    },
+    'close-expired-jobs': {
+        'task': 'jobs.tasks.close_expired_jobs',
+        'schedule': config('JOB_EXPIRY_INTERVAL', default=300, cast=int),  # seconds
+    },
+    'refresh-job-recommendations': {
+        'task': 'jobs.tasks.refresh_job_recommendations',
+        'schedule': config('JOB_RECOMMENDATION_REFRESH_INTERVAL', default=3600, cast=int),  # seconds
+    },
+    'rebuild-similar-jobs': {
+        'task': 'jobs.tasks.rebuild_similar_jobs',
+        'schedule': crontab(hour=2, minute=30),
+    },
+    'reconcile-application-counters': {
+        'task': 'applications.tasks.reconcile_job_application_counters',
+        'schedule': crontab(hour=3, minute=0),
+    },
+}
+
 # ==============================================================================
 # INTERNATIONALIZATION
 # ==============================================================================
@@ -322,9 +350,25 @@ LOGGING = {
             'level': config('DJANGO_LOG_LEVEL', default='INFO'),
             'propagate': False,
         },
+        'core.queries': {
+            'handlers': ['console', 'file'],
+            'level': config('QUERY_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
     },
 }
 
+# ==============================================================================
+# SQL INSTRUMENTATION
+# ==============================================================================
+
+# Per-request query count, DB time and duplicate-query fingerprints
+QUERY_INSTRUMENTATION_ENABLED = config('QUERY_INSTRUMENTATION_ENABLED', default=True, cast=bool)
+# Expose the figures as X-DB-* response headers (non-production only)
+QUERY_INSTRUMENTATION_HEADERS = config('QUERY_INSTRUMENTATION_HEADERS', default=DEBUG, cast=bool)
+# Log requests issuing more queries than this
+QUERY_COUNT_WARNING_THRESHOLD = config('QUERY_COUNT_WARNING_THRESHOLD', default=30, cast=int)
+
 # ==============================================================================
 # FILE UPLOAD SETTINGS
 # ==============================================================================
@@ -350,5 +394,70 @@ APP_DESCRIPTION = 'Platform de Recrutement Intelligente'
 DEFAULT_PAGE_SIZE = 20
 MAX_PAGE_SIZE = 100
 
+# Job search autocomplete
+JOB_SUGGEST_CACHE_TIMEOUT = 60  # seconds
+JOB_SUGGEST_DEFAULT_LIMIT = 5
+JOB_SUGGEST_MAX_LIMIT = 20
+
+# Job view counter (buffered in Redis, flushed by jobs.tasks.flush_job_views)
+JOB_VIEWS_FLUSH_BATCH_SIZE = 1000  # rows per UPDATE statement
+JOB_VIEWS_FLUSH_LOCK_TIMEOUT = 300  # seconds
+JOB_VIEWS_FLUSH_RETENTION = 7  # days applied batch ids are kept
+
+# Cached anonymous job list and job detail payloads, dropped on every job write
+JOB_RESPONSE_CACHE_TIMEOUT = config('JOB_RESPONSE_CACHE_TIMEOUT', default=60, cast=int)  # seconds
+
+# Job board facets (served through the response cache above)
+JOB_FACET_MAX_VALUES = 20  # values returned per facet
+
+# Bulk job import (POST /api/v1/jobs/bulk/)
+JOB_BULK_IMPORT_MAX_ROWS = 1000  # jobs per request
+JOB_BULK_IMPORT_BATCH_SIZE = 500  # rows per INSERT statement
+
+# Job recommendations (jobs.recommendations, refreshed by jobs.tasks.refresh_job_recommendations)
+JOB_RECOMMENDATION_TOP_N = 50  # jobs cached per candidate
+JOB_RECOMMENDATION_DEFAULT_LIMIT = 20
+JOB_RECOMMENDATION_BATCH_SIZE = 500  # candidates scored per matrix product
+JOB_RECOMMENDATION_CACHE_TIMEOUT = 2 * config('JOB_RECOMMENDATION_REFRESH_INTERVAL', default=3600, cast=int)  # seconds
+JOB_RECOMMENDATION_WEIGHTS = {
+    'skills': 0.45,
+    'experience': 0.2,
+    'location': 0.15,
+    'salary': 0.1,
+    'education': 0.1,
+}
+
+# Similar jobs (jobs.similarity, MinHash/LSH neighbor lists updated on publish and edit)
+JOB_SIMILAR_MAX_NEIGHBORS = 20  # neighbors kept per job
+JOB_SIMILAR_MIN_SIMILARITY = 0.2  # estimated Jaccard similarity of the job texts
+
+# Job alerts (jobs.alerts, JOB_MATCH notifications queued by JobOffer.publish())
+JOB_ALERT_MAX_PER_CANDIDATE = 10
+JOB_ALERT_NOTIFICATION_CHUNK_SIZE = 1000  # notifications per INSERT
+
+# Near-duplicate job offers (jobs.duplicates, SimHash of title, description and skills)
+# 'warn' reports a recruiter's reposted offer when it is created, 'block' refuses it, 'off' skips the check
+JOB_DUPLICATE_POLICY = config('JOB_DUPLICATE_POLICY', default='warn')
+JOB_DUPLICATE_MAX_DISTANCE = 6  # differing bits out of 64, at most 7 (core.simhash.BANDS - 1)
+
+# Recruiter pipeline board (GET /api/v1/jobs/{id}/pipeline/, applications.pipeline)
+JOB_PIPELINE_DEFAULT_LIMIT = 10  # cards per status column
+JOB_PIPELINE_MAX_LIMIT = 50
+JOB_PIPELINE_CACHE_TIMEOUT = 300  # seconds; application writes drop it sooner
+
+# Application match scores (applications.scoring, computed by Celery tasks)
+APPLICATION_SCORING_CHUNK_SIZE = 1000  # applications per score matrix and bulk_update
+
+# Bulk application status changes (POST /api/v1/applications/bulk_status/)
+APPLICATION_BULK_STATUS_MAX_IDS = 1000  # applications per request
+APPLICATION_NOTIFICATION_BATCH_SIZE = 1000  # candidate notifications per INSERT
+
+# Radius search on locations resolved through the core/data gazetteer
+LOCATION_DEFAULT_RADIUS_KM = 50
+LOCATION_MAX_RADIUS_KM = 1000
+
+# Exchange rates behind the yearly XOF salary columns, cached per process
+SALARY_FX_RATES_CACHE_TIMEOUT = config('SALARY_FX_RATES_CACHE_TIMEOUT', default=300, cast=int)  # seconds
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
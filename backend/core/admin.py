@@ -0,0 +1,13 @@
+"""
+Admin configuration for Core app
+"""
+
+from django.contrib import admin
+from .models import ExchangeRate
+
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = ['currency', 'rate_to_xof', 'updated_at']
+    search_fields = ['currency']
+    readonly_fields = ['updated_at']
@@ -5,3 +5,6 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
     verbose_name = 'Core'
+
+    def ready(self):
+        from . import lookups, signals  # noqa: F401
@@ -0,0 +1,157 @@
+"""
+Conditional GET support for Recruitsss API
+ETag / Last-Modified validators computed from cheap timestamp queries
+"""
+
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, F, Max
+from django.db.models.functions import Greatest
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class NotModified(Exception):
+    """Raised from `initial` to answer a request before its handler runs"""
+
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    ETag and Last-Modified support for viewset list and retrieve actions
+
+    Validators are computed from `last_modified_fields`: the latest of those
+    timestamps on the object for retrieve, and their maximum plus the row
+    count of the filtered queryset for list. Matching If-None-Match or
+    If-Modified-Since headers are answered with 304 before the handler runs,
+    so neither the full queryset nor the serializer is evaluated.
+
+    Keyset (cursor) pages skip that aggregate, which would cost the COUNT
+    they exist to avoid: their validators come from the page's own rows,
+    checked before the page is serialized.
+    """
+    last_modified_fields = ['updated_at']
+    conditional_actions = ('list', 'retrieve')
+
+    etag = None
+    last_modified = None
+    # Row count of the filtered list, reused by the paginator
+    list_count = None
+
+    def get_last_modified_expression(self):
+        if len(self.last_modified_fields) == 1:
+            return F(self.last_modified_fields[0])
+        return Greatest(*self.last_modified_fields)
+
+    def make_etag(self, *parts):
+        """Weak ETag for this user, URL and representation"""
+        request = self.request
+        user = request.user.pk if request.user.is_authenticated else 'anonymous'
+        source = repr([
+            str(user), request.accepted_media_type, request.get_full_path(),
+            *[str(part) for part in parts],
+        ])
+        return 'W/' + quote_etag(hashlib.sha1(source.encode()).hexdigest())
+
+    def get_object_validators(self):
+        """(etag, last_modified) of the requested object, None if it is not found"""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.get_queryset().filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        try:
+            row = queryset.annotate(
+                last_modified=self.get_last_modified_expression()
+            ).values_list('pk', 'last_modified').first()
+        except (TypeError, ValueError, ValidationError):
+            return None
+        if row is None:
+            return None
+        return self.make_etag(*row), row[1]
+
+    def uses_keyset_pagination(self):
+        use_keyset = getattr(self.paginator, 'use_keyset', None)
+        return use_keyset is not None and use_keyset(self.request, self)
+
+    def get_list_validators(self):
+        """(etag, last_modified) from the latest timestamp and row count of the list"""
+        if self.uses_keyset_pagination():
+            # Validated from the page itself, see paginate_queryset
+            return None
+        stats = self.filter_queryset(self.get_queryset()).aggregate(
+            last_modified=Max(self.get_last_modified_expression()),
+            count=Count('pk'),
+        )
+        self.list_count = stats['count']
+        return self.make_etag(stats['count'], stats['last_modified']), stats['last_modified']
+
+    def get_validators(self):
+        if self.action == 'retrieve':
+            return self.get_object_validators()
+        return self.get_list_validators()
+
+    def on_not_modified(self, request):
+        """Hook called before a 304 is returned"""
+
+    def is_conditional(self, request):
+        return request.method in ('GET', 'HEAD') and self.action in self.conditional_actions
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if not self.is_conditional(request):
+            return
+
+        validators = self.get_validators()
+        if validators is None:
+            return
+        self.etag, self.last_modified = validators
+        self.check_not_modified(request)
+
+    def paginate_queryset(self, queryset):
+        """Fetch a cursor page with each row's latest timestamp and validate the request against it"""
+        if (
+            self.etag is not None or self.action != 'list' or
+            not self.is_conditional(self.request) or not self.uses_keyset_pagination()
+        ):
+            return super().paginate_queryset(queryset)
+
+        queryset = queryset.annotate(conditional_last_modified=self.get_last_modified_expression())
+        page = super().paginate_queryset(queryset)
+        if page is None:
+            return page
+        self.last_modified = max(
+            (row.conditional_last_modified for row in page if row.conditional_last_modified),
+            default=None,
+        )
+        has_next = self.paginator.keyset_paginator.has_next
+        self.etag = self.make_etag(has_next, self.last_modified, *[row.pk for row in page])
+        self.check_not_modified(self.request)
+        return page
+
+    def check_not_modified(self, request):
+        """Raise NotModified when the request's validators match `etag` / `last_modified`"""
+        response = get_conditional_response(
+            request,
+            etag=self.etag,
+            last_modified=int(self.last_modified.timestamp()) if self.last_modified else None,
+        )
+        if response is not None:
+            if response.status_code == 304:
+                self.on_not_modified(request)
+            raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.etag and response.status_code in (200, 304):
+            response['ETag'] = self.etag
+            if self.last_modified:
+                response['Last-Modified'] = http_date(self.last_modified.timestamp())
+        return response
@@ -0,0 +1,110 @@
+"""
+Shared django-filter filters for Recruitsss API
+Array filters on indexable PostgreSQL operators, gazetteer radius search
+and ordering on derived columns
+"""
+
+from django import forms
+from django.conf import settings
+from django.db.models import F
+from django_filters import rest_framework as filters
+from django_filters.widgets import CSVWidget
+from rest_framework.filters import OrderingFilter
+
+from . import geo
+
+
+class RepeatableCSVWidget(CSVWidget):
+    """Comma-separated values, repeated parameters accepted as well"""
+
+    def value_from_datadict(self, data, files, name):
+        if not hasattr(data, 'getlist') or name not in data:
+            return super().value_from_datadict(data, files, name)
+        values = [
+            value.strip()
+            for raw in data.getlist(name)
+            for value in raw.split(',')
+        ]
+        return [value for value in values if value]
+
+
+class ArrayFilter(filters.BaseCSVFilter, filters.CharFilter):
+    """
+    Match an ArrayField against a list of values
+    `?skills=python,django` and `?skills=python&skills=django` are equivalent.
+    Use lookup_expr='overlap' (&&) for any of the values, 'contains' (@>) for all.
+    """
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('widget', RepeatableCSVWidget)
+        super().__init__(*args, **kwargs)
+
+    def filter(self, qs, value):
+        if not value:
+            return qs
+        return super().filter(qs, value)
+
+
+class LocationField(forms.CharField):
+    """Place name resolved to a gazetteer City"""
+
+    def clean(self, value):
+        value = super().clean(value)
+        if not value:
+            return None
+        city = geo.lookup(value)
+        if city is None:
+            raise forms.ValidationError(f'Unknown location: {value}', code='invalid')
+        return city
+
+
+class NearFilter(filters.Filter):
+    """
+    Rows within `radius_km` (see RadiusFilter) of a known city
+    `?near=Dakar&radius_km=30`. Rows without coordinates never match.
+    """
+    field_class = LocationField
+
+    def __init__(self, *args, radius_param='radius_km', **kwargs):
+        self.radius_param = radius_param
+        super().__init__(*args, **kwargs)
+
+    def filter(self, qs, value):
+        if value is None:
+            return qs
+        radius_km = self.parent.form.cleaned_data.get(self.radius_param)
+        if radius_km is None:
+            radius_km = settings.LOCATION_DEFAULT_RADIUS_KM
+        return geo.within_radius(qs, value, float(radius_km))
+
+
+class RadiusFilter(filters.NumberFilter):
+    """Search radius in km, applied by NearFilter"""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('min_value', 0)
+        kwargs.setdefault('max_value', settings.LOCATION_MAX_RADIUS_KM)
+        super().__init__(*args, **kwargs)
+
+    def filter(self, qs, value):
+        return qs
+
+
+class AliasedOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter mapping public ordering names to other columns
+    The view's `ordering_aliases` maps a name listed in `ordering_fields` to
+    the column actually sorted on, with empty values last either way.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        aliases = getattr(view, 'ordering_aliases', {})
+        if not ordering or not aliases:
+            return ordering
+        return [self._resolve(term, aliases) for term in ordering]
+
+    def _resolve(self, term, aliases):
+        if not isinstance(term, str) or term.lstrip('-') not in aliases:
+            return term
+        column = F(aliases[term.lstrip('-')])
+        return column.desc(nulls_last=True) if term.startswith('-') else column.asc(nulls_last=True)
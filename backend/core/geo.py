@@ -0,0 +1,114 @@
+"""
+Offline gazetteer and radius queries for Recruitsss locations
+Free-text locations are resolved against a bundled list of West African cities
+"""
+
+import csv
+import math
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from django.db.models import F, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / 'data' / 'west_africa_cities.csv'
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+# "Dakar, Sénégal", "Hybride - Dakar", "Abidjan (Plateau)", "Lomé / Accra"
+LOCATION_SEPARATORS = re.compile(r'[,;/()|]|\s-\s')
+
+
+@dataclass(frozen=True)
+class City:
+    name: str
+    country: str
+    latitude: float
+    longitude: float
+
+    def __str__(self):
+        return f'{self.name}, {self.country}'
+
+
+def normalize_place(text):
+    """Lowercase ASCII form of a place name: 'Saint-Louis' and 'saint louis' match"""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r"[-'’.]", ' ', text.lower())
+    return ' '.join(text.split())
+
+
+@lru_cache(maxsize=1)
+def load_gazetteer():
+    """Normalized city name or alias -> City"""
+    cities = {}
+    with open(GAZETTEER_PATH, encoding='utf-8', newline='') as gazetteer:
+        for row in csv.DictReader(gazetteer):
+            city = City(row['name'], row['country'], float(row['latitude']), float(row['longitude']))
+            names = [row['name'], *filter(None, row['aliases'].split('|'))]
+            for name in names:
+                cities.setdefault(normalize_place(name), city)
+    return cities
+
+
+def lookup(location):
+    """City named in a free-text location, or None"""
+    if not location:
+        return None
+    cities = load_gazetteer()
+    city = cities.get(normalize_place(location))
+    if city is not None:
+        return city
+    for part in LOCATION_SEPARATORS.split(location):
+        city = cities.get(normalize_place(part))
+        if city is not None:
+            return city
+    return None
+
+
+def set_coordinates(instance, update_fields=None):
+    """
+    Store the coordinates of `instance.location` on `instance.latitude/longitude`
+    Returns the update_fields to save with, extended when location is saved.
+    """
+    if update_fields is not None and 'location' not in update_fields:
+        return update_fields
+    city = lookup(instance.location)
+    instance.latitude = city.latitude if city else None
+    instance.longitude = city.longitude if city else None
+    if update_fields is not None:
+        update_fields = {*update_fields, 'latitude', 'longitude'}
+    return update_fields
+
+
+def distance_km(latitude, longitude, latitude_field='latitude', longitude_field='longitude'):
+    """Haversine distance in km from a point to the row's coordinates, as an expression"""
+    delta_latitude = Radians(F(latitude_field) - Value(latitude))
+    delta_longitude = Radians(F(longitude_field) - Value(longitude))
+    a = (
+        Power(Sin(delta_latitude / 2), 2) +
+        math.cos(math.radians(latitude)) * Cos(Radians(F(latitude_field))) *
+        Power(Sin(delta_longitude / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * ASin(Sqrt(a))
+
+
+def within_radius(queryset, city, radius_km, latitude_field='latitude', longitude_field='longitude'):
+    """
+    Rows located within `radius_km` of `city`, annotated with `distance_km`
+    A bounding box on the (latitude, longitude) index narrows the rows before
+    the exact great-circle distance is checked.
+    """
+    latitude_delta = radius_km / KM_PER_DEGREE
+    longitude_delta = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(city.latitude)), 0.01))
+    return queryset.filter(**{
+        f'{latitude_field}__range': (city.latitude - latitude_delta, city.latitude + latitude_delta),
+        f'{longitude_field}__range': (city.longitude - longitude_delta, city.longitude + longitude_delta),
+    }).annotate(
+        distance_km=distance_km(city.latitude, city.longitude, latitude_field, longitude_field)
+    ).filter(distance_km__lte=radius_km)
@@ -0,0 +1,25 @@
+"""
+Custom lookups for Recruitsss models
+Case-insensitive prefix matching that pg_trgm GIN indexes can serve
+"""
+
+from django.db.models import CharField, Lookup
+
+
+@CharField.register_lookup
+class IPrefix(Lookup):
+    """
+    `column ILIKE 'prefix%'`, the prefix's wildcards escaped
+    Django's `istartswith` compiles to `UPPER(column::text) LIKE UPPER(...)`,
+    which a gin_trgm_ops index cannot serve; ILIKE on the column itself can.
+    """
+    lookup_name = 'iprefix'
+
+    def process_rhs(self, compiler, connection):
+        rhs, params = super().process_rhs(compiler, connection)
+        return rhs, [f'{connection.ops.prep_for_like_query(param)}%' for param in params]
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} ILIKE {rhs}', [*lhs_params, *rhs_params]
@@ -0,0 +1,91 @@
+"""
+Management command comparing the JSON renderers on real API payloads
+Renders serialized job and application pages with DRF's JSONRenderer and FastJSONRenderer
+"""
+
+import timeit
+from io import BytesIO
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from applications.models import Application
+from applications.serializers import ApplicationSerializer
+from core import renderers
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+from jobs.models import JobOffer
+from jobs.serializers import JobOfferDetailSerializer, JobOfferListSerializer
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks FastJSONRenderer/FastJSONParser against DRF JSON on job and application pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=100,
+            help='Rows per page (default: 100, rows are repeated if the database has fewer)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=200,
+            help='Renders per measurement (default: 200)',
+        )
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            raise CommandError('orjson is not installed: FastJSONRenderer falls back to JSONRenderer')
+
+        page_size, iterations = options['page_size'], options['iterations']
+        jobs = self.page(JobOffer.objects.select_related('recruiter__id'), page_size)
+        applications = self.page(
+            Application.objects.select_related('candidate__id', 'job_offer__recruiter'), page_size
+        )
+        payloads = {
+            'job list page': self.paginated(JobOfferListSerializer(jobs, many=True).data),
+            'job detail page': self.paginated(JobOfferDetailSerializer(jobs, many=True).data),
+            'application page': self.paginated(ApplicationSerializer(applications, many=True).data),
+        }
+
+        self.stdout.write(f'{page_size} rows per page, best of 5 x {iterations} runs\n')
+        self.stdout.write(f"{'payload':<20}{'size':>10}{'render':>26}{'parse':>26}  identical")
+        for name, data in payloads.items():
+            stock, fast = JSONRenderer().render(data), FastJSONRenderer().render(data)
+            identical = stock == fast and self.parse(FastJSONParser, stock) == self.parse(JSONParser, stock)
+
+            render = self.compare(
+                lambda: JSONRenderer().render(data),
+                lambda: FastJSONRenderer().render(data),
+                iterations,
+            )
+            parse = self.compare(
+                lambda: self.parse(JSONParser, stock),
+                lambda: self.parse(FastJSONParser, stock),
+                iterations,
+            )
+            style = self.style.SUCCESS if identical else self.style.ERROR
+            self.stdout.write(
+                f'{name:<20}{len(stock):>9}B{render:>26}{parse:>26}  ' + style('yes' if identical else 'NO')
+            )
+
+    def page(self, queryset, page_size):
+        rows = list(queryset[:page_size])
+        if not rows:
+            raise CommandError(f'No {queryset.model._meta.verbose_name} found: run seed_data first')
+        return (rows * (page_size // len(rows) + 1))[:page_size]
+
+    def parse(self, parser_class, body):
+        return parser_class().parse(BytesIO(body))
+
+    def paginated(self, results):
+        return {'count': len(results), 'next': None, 'previous': None, 'results': results}
+
+    def compare(self, stock, fast, iterations):
+        """'stock ms -> fast ms (speedup)' per call"""
+        stock_ms = min(timeit.repeat(stock, number=iterations, repeat=5)) / iterations * 1000
+        fast_ms = min(timeit.repeat(fast, number=iterations, repeat=5)) / iterations * 1000
+        return f'{stock_ms:.2f} -> {fast_ms:.2f} ms (x{stock_ms / fast_ms:.1f})'
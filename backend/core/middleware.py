@@ -0,0 +1,97 @@
+"""
+Middleware for Recruitsss
+Per-request SQL instrumentation: query count, DB time and duplicate queries
+"""
+
+import hashlib
+import logging
+import re
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+
+
+logger = logging.getLogger('core.queries')
+
+# Collapse IN (%s, %s, ...) lists so batched lookups share a fingerprint
+_PLACEHOLDER_LIST = re.compile(r'%s(?:\s*,\s*%s)+')
+
+
+def fingerprint(sql):
+    """Stable short identifier for a parameterized SQL statement"""
+    normalized = _PLACEHOLDER_LIST.sub('%s', sql)
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12]
+
+
+class QueryRecorder:
+    """Database execute wrapper recording every query of a request"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def duplicates(self):
+        """Fingerprints executed more than once, with their execution counts"""
+        return {fp: n for fp, n in self.fingerprints.items() if n > 1}
+
+    @property
+    def duplicate_count(self):
+        """Number of redundant executions (the N in N+1)"""
+        return sum(n - 1 for n in self.duplicates.values())
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Record query count, total DB time and duplicate-query fingerprints
+
+    With QUERY_INSTRUMENTATION_HEADERS (non-production) the figures are
+    returned as X-DB-* response headers; otherwise requests with duplicate
+    queries or above QUERY_COUNT_WARNING_THRESHOLD are logged.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERY_INSTRUMENTATION_ENABLED:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+
+        duration_ms = round(recorder.duration * 1000, 2)
+        if settings.QUERY_INSTRUMENTATION_HEADERS:
+            response['X-DB-Query-Count'] = str(recorder.count)
+            response['X-DB-Query-Time-Ms'] = str(duration_ms)
+            response['X-DB-Duplicate-Queries'] = str(recorder.duplicate_count)
+            if recorder.duplicates:
+                response['X-DB-Duplicate-Fingerprints'] = ','.join(
+                    f'{fp}:{n}' for fp, n in recorder.duplicates.items()
+                )
+        elif recorder.duplicates or recorder.count > settings.QUERY_COUNT_WARNING_THRESHOLD:
+            logger.warning(
+                'SQL budget: %s %s status=%s queries=%s db_ms=%s duplicates=%s fingerprints=%s',
+                request.method, request.path, response.status_code, recorder.count,
+                duration_ms, recorder.duplicate_count, dict(recorder.duplicates),
+            )
+        else:
+            logger.debug(
+                'SQL budget: %s %s queries=%s db_ms=%s',
+                request.method, request.path, recorder.count, duration_ms,
+            )
+
+        return response
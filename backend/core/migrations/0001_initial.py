@@ -0,0 +1,60 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:48
+
+import django.core.validators
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+# XOF per unit. EUR and XAF are fixed parities, the others are reference
+# rates to be kept current from the admin.
+INITIAL_RATES = {
+    'XOF': Decimal('1'),
+    'XAF': Decimal('1'),
+    'EUR': Decimal('655.957'),
+    'USD': Decimal('600'),
+    'GBP': Decimal('760'),
+    'CHF': Decimal('690'),
+    'CAD': Decimal('440'),
+    'MAD': Decimal('60'),
+    'GHS': Decimal('50'),
+    'NGN': Decimal('0.4'),
+    'GNF': Decimal('0.07'),
+    'MRU': Decimal('15'),
+    'GMD': Decimal('9'),
+    'SLE': Decimal('27'),
+    'LRD': Decimal('3'),
+    'CVE': Decimal('5.95'),
+}
+
+
+def seed_rates(apps, schema_editor):
+    ExchangeRate = apps.get_model('core', 'ExchangeRate')
+    ExchangeRate.objects.bulk_create(
+        [ExchangeRate(currency=currency, rate_to_xof=rate) for currency, rate in INITIAL_RATES.items()],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('currency', models.CharField(max_length=3, primary_key=True, serialize=False)),
+                ('rate_to_xof', models.DecimalField(decimal_places=6, max_digits=18, validators=[django.core.validators.MinValueValidator(0)])),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'exchange_rates',
+                'ordering': ['currency'],
+            },
+        ),
+        migrations.RunPython(seed_rates, migrations.RunPython.noop),
+    ]
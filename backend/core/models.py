@@ -0,0 +1,33 @@
+"""
+Shared models for the recruitment platform
+Reference data used across apps
+"""
+
+from django.core.validators import MinValueValidator
+from django.db import models
+
+
+class ExchangeRate(models.Model):
+    """
+    Value of one unit of a currency in XOF
+    Read through core.salaries, which caches the table in-process.
+    """
+    
+    currency = models.CharField(max_length=3, primary_key=True)
+    rate_to_xof = models.DecimalField(
+        max_digits=18,
+        decimal_places=6,
+        validators=[MinValueValidator(0)]
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'exchange_rates'
+        ordering = ['currency']
+    
+    def __str__(self):
+        return f"1 {self.currency} = {self.rate_to_xof} XOF"
+    
+    def save(self, *args, **kwargs):
+        self.currency = self.currency.upper()
+        super().save(*args, **kwargs)
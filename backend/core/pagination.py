@@ -0,0 +1,188 @@
+"""
+Pagination classes for Recruitsss API
+Page-number pagination by default, with an opt-in keyset (cursor) mode
+"""
+
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import Paginator
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only keyset pagination over a view's `cursor_ordering`
+
+    Each page is fetched with a `WHERE (ordering keys) > (last row keys)`
+    predicate instead of OFFSET, and no COUNT(*) is issued, so every page
+    costs the same no matter how deep the client scrolls. The last key of
+    `cursor_ordering` must be unique (use 'pk'). Any other ordering left on
+    the queryset (`?ordering=`, a search rank...) is rejected rather than
+    silently replaced: it must be a prefix of `cursor_ordering`.
+    """
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+    invalid_ordering_message = 'Cursor pagination only supports the {} ordering'
+
+    def __init__(self, page_size):
+        self.page_size = page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.check_ordering(queryset, view.cursor_ordering)
+        ordering = [
+            (name.lstrip('-'), name.startswith('-'))
+            for name in view.cursor_ordering
+        ]
+        fields = [self._get_field(queryset.model, name) for name, _ in ordering]
+
+        queryset = queryset.order_by(*[
+            F(name).desc(nulls_first=True) if descending else F(name).asc(nulls_last=True)
+            for name, descending in ordering
+        ])
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            position = self.decode_cursor(encoded, fields)
+            queryset = queryset.filter(self._after_position(ordering, fields, position))
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+
+        self.next_position = None
+        if self.has_next:
+            last = self.page[-1]
+            self.next_position = [getattr(last, field.attname) for field in fields]
+        return self.page
+
+    def check_ordering(self, queryset, cursor_ordering):
+        """400 unless the queryset is ordered by the start of `cursor_ordering`, or not at all"""
+        requested = list(queryset.query.order_by)
+        if requested != list(cursor_ordering[:len(requested)]):
+            raise ValidationError({
+                'ordering': self.invalid_ordering_message.format(','.join(cursor_ordering)),
+            })
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def encode_cursor(self, position):
+        payload = json.dumps(position, default=str, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, encoded, fields):
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if len(position) != len(fields):
+                raise ValueError
+            return [
+                None if value is None else field.to_python(value)
+                for field, value in zip(fields, position)
+            ]
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _get_field(model, name):
+        if name == 'pk':
+            return model._meta.pk
+        return model._meta.get_field(name)
+
+    def _after_position(self, ordering, fields, position):
+        """Build `(k1, k2, ...) > (v1, v2, ...)` honouring directions and NULLs"""
+        condition = Q(pk__in=[])
+        equal_prefix = Q()
+        for (name, descending), field, value in zip(ordering, fields, position):
+            after = self._after_value(name, descending, field.null, value)
+            if after is not None:
+                condition |= equal_prefix & after
+            if value is None:
+                equal_prefix &= Q(**{f'{name}__isnull': True})
+            else:
+                equal_prefix &= Q(**{name: value})
+        return condition
+
+    @staticmethod
+    def _after_value(name, descending, nullable, value):
+        # PostgreSQL sorts NULLs first in descending order and last in
+        # ascending order, which is what the order_by above makes explicit.
+        if descending:
+            if value is None:
+                return Q(**{f'{name}__isnull': False})
+            return Q(**{f'{name}__lt': value})
+        if value is None:
+            return None
+        after = Q(**{f'{name}__gt': value})
+        if nullable:
+            after |= Q(**{f'{name}__isnull': True})
+        return after
+
+
+class CountedPaginator(Paginator):
+    """Django paginator that can be given an already known total count"""
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            # Prime the cached property so no COUNT(*) is issued
+            self.__dict__['count'] = count
+
+
+class StandardResultsPagination(PageNumberPagination):
+    """
+    Default pagination for list endpoints
+
+    Page-number pagination (with a total count) unless the request asks for
+    keyset pagination with `?pagination=cursor` or carries a `cursor`,
+    and the view declares a `cursor_ordering`. A `list_count` already
+    computed by the view (see core.conditional) is reused for the total.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = settings.MAX_PAGE_SIZE
+    pagination_mode_query_param = 'pagination'
+
+    keyset_paginator = None
+    known_count = None
+
+    def django_paginator_class(self, queryset, page_size):
+        return CountedPaginator(queryset, page_size, count=self.known_count)
+
+    def use_keyset(self, request, view):
+        if not getattr(view, 'cursor_ordering', None):
+            return False
+        return (
+            request.query_params.get(self.pagination_mode_query_param) == 'cursor' or
+            KeysetPagination.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_keyset(request, view):
+            page_size = self.get_page_size(request)
+            if not page_size:
+                return None
+            self.keyset_paginator = KeysetPagination(page_size)
+            return self.keyset_paginator.paginate_queryset(queryset, request, view)
+        self.known_count = getattr(view, 'list_count', None)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset_paginator is not None:
+            return self.keyset_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,60 @@
+"""
+Parsers for Recruitsss API
+orjson-backed JSON with the same results and errors as DRF's JSONParser, and CSV
+"""
+
+import codecs
+import csv
+from io import BytesIO, StringIO
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+try:
+    import orjson
+except ImportError:  # optional dependency: everything goes through DRF's parser
+    orjson = None
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser decoding UTF-8 bodies with orjson when it is installed
+    Bodies orjson rejects are parsed again by DRF's parser, so what it
+    accepts (integers over 64 bits) and its error messages do not change.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(BytesIO(body), media_type, parser_context)
+
+
+class CSVParser(BaseParser):
+    """
+    Parses a CSV document with a header line into a list of dicts
+    Also used on uploaded files; a UTF-8 byte order mark is ignored.
+    """
+    media_type = 'text/csv'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if codecs.lookup(encoding).name == 'utf-8':
+            encoding = 'utf-8-sig'
+
+        try:
+            reader = csv.DictReader(StringIO(stream.read().decode(encoding), newline=''), restval='')
+            if not reader.fieldnames:
+                raise ParseError('CSV parse error - the header line is missing')
+            reader.fieldnames = [name.strip() for name in reader.fieldnames]
+            return list(reader)
+        except (csv.Error, UnicodeDecodeError) as exc:
+            raise ParseError(f'CSV parse error - {exc}')
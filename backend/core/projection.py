@@ -0,0 +1,169 @@
+"""
+Sparse fieldsets for Recruitsss API
+`?fields=` / `?omit=` trim serializer output and the columns fetched for it
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def _param_names(request, param):
+    names = set()
+    for raw in request.query_params.getlist(param):
+        names.update(name.strip() for name in raw.split(',') if name.strip())
+    return names
+
+
+def get_projection(request):
+    """(fields, omit) requested on a read request, fields is None when not restricted"""
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return None, set()
+    fields = _param_names(request, FIELDS_PARAM)
+    return fields or None, _param_names(request, OMIT_PARAM)
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin honouring `?fields=a,b` and `?omit=c`
+    Only the top-level serializer of a read request is trimmed; nested
+    serializers are kept whole or dropped as one field.
+    """
+
+    def _is_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self._is_root():
+            return fields
+
+        only, omit = get_projection(self.context.get('request'))
+        # Omitting a field the representation lacks is harmless, asking for one is not
+        unknown = (only or set()) - set(fields)
+        if unknown:
+            raise ValidationError({FIELDS_PARAM: [f"Unknown field(s): {', '.join(sorted(unknown))}"]})
+
+        for name in list(fields):
+            if (only is not None and name not in only) or name in omit:
+                del fields[name]
+        return fields
+
+
+def _concrete_paths(model, prefix):
+    return {prefix + field.name for field in model._meta.concrete_fields}
+
+
+def _field_paths(serializer, model, annotations, prefix=''):
+    """
+    Model paths the serializer reads, with the relations it traverses
+    Returns (paths, relations), or None when a field reads the whole object.
+    """
+    paths, relations = set(), set()
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*':
+            return None
+
+        current, path = model, prefix
+        for position, attr in enumerate(field.source_attrs):
+            if not prefix and attr in annotations:
+                break
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                # A property or method: it may read any column of this row
+                paths |= _concrete_paths(current, path)
+                break
+
+            if not model_field.is_relation:
+                paths.add(path + attr)
+                break
+            if model_field.one_to_one and not model_field.concrete:
+                # Reverse one-to-one: keep its join, the related row is loaded whole
+                relations.add(path + attr)
+                break
+            if not model_field.concrete or model_field.many_to_many:
+                # Reverse and many-to-many relations cost no column here
+                break
+
+            paths.add(path + attr)
+            last = position == len(field.source_attrs) - 1
+            if last and not isinstance(field, serializers.BaseSerializer):
+                break
+            relations.add(path + attr)
+            current, path = model_field.related_model, f'{path}{attr}__'
+            if last:
+                nested = _field_paths(field, current, annotations, path)
+                if nested is None:
+                    paths |= _concrete_paths(current, path)
+                else:
+                    paths |= nested[0]
+                    relations |= nested[1]
+    return paths, relations
+
+
+def _select_related_paths(tree, prefix=''):
+    for name, subtree in tree.items():
+        yield prefix + name
+        yield from _select_related_paths(subtree, f'{prefix}{name}__')
+
+
+def project_queryset(queryset, serializer, required=()):
+    """
+    Restrict the queryset to the columns and joins the serializer needs
+    `required` lists extra fields the view reads itself (pagination keys...).
+    """
+    projection = _field_paths(serializer, queryset.model, set(queryset.query.annotations))
+    if projection is None:
+        return queryset
+    paths, relations = projection
+    paths |= set(required)
+
+    selected = queryset.query.select_related
+    if isinstance(selected, dict):
+        kept = [path for path in _select_related_paths(selected) if path in relations]
+        queryset = queryset.select_related(None)
+        if kept:
+            queryset = queryset.select_related(*kept)
+        # Columns of relations no longer joined are loaded with the relation itself
+        paths = {
+            path for path in paths
+            if '__' not in path or path.rsplit('__', 1)[0] in kept
+        }
+    return queryset.only(*paths)
+
+
+class SparseFieldsetViewMixin:
+    """
+    Viewset mixin pushing `?fields=` / `?omit=` down into the queryset
+    Requires a serializer using SparseFieldsetMixin.
+    """
+    projected_actions = ('list', 'retrieve')
+
+    def get_projection_required_fields(self):
+        """Fields read by the view or its pagination, whatever the serializer shows"""
+        return [
+            name.lstrip('-') for name in getattr(self, 'cursor_ordering', [])
+            if name.lstrip('-') != 'pk'
+        ]
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action not in self.projected_actions:
+            return queryset
+        only, omit = get_projection(self.request)
+        if only is None and not omit:
+            return queryset
+        serializer = self.get_serializer()
+        if not isinstance(serializer, SparseFieldsetMixin):
+            return queryset
+        return project_queryset(queryset, serializer, self.get_projection_required_fields())
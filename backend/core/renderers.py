@@ -0,0 +1,84 @@
+"""
+JSON renderer for Recruitsss API
+orjson-backed, byte-identical to DRF's JSONRenderer, stdlib fallback
+"""
+
+import math
+import re
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional dependency: everything goes through DRF's renderer
+    orjson = None
+
+
+# orjson writes float exponents as 1e16 where the json module writes 1e+16.
+# Payloads that may contain one (false positives inside strings included)
+# are rendered by the stdlib so the bytes never change.
+FLOAT_EXPONENT = re.compile(rb'[0-9][eE][-+]?[0-9]')
+
+LINE_SEPARATOR = '\u2028'.encode()
+PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+
+def has_non_finite_float(data):
+    """Whether NaN or Infinity appears anywhere in nested dicts and lists"""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding with orjson when it is installed
+    UUIDs, dates and datetimes are encoded natively; other types go through
+    DRF's JSONEncoder.default. Indented or ASCII-only output, NaN and
+    Infinity, and anything orjson refuses (integers over 64 bits, non-string
+    keys...) are left to DRF's renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not self.can_render_fast(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_UTC_Z | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except (orjson.JSONEncodeError, TypeError, ValueError):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if FLOAT_EXPONENT.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # orjson writes NaN and Infinity as null where JSONRenderer refuses them
+        # (STRICT_JSON): only payloads with a null can hide one
+        if b'null' in ret and has_non_finite_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as JSONRenderer: these are valid JSON but not valid javascript
+        if LINE_SEPARATOR in ret or PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(LINE_SEPARATOR, b'\\u2028').replace(PARAGRAPH_SEPARATOR, b'\\u2029')
+        return ret
+
+    def can_render_fast(self, accepted_media_type, renderer_context):
+        """Whether orjson's output matches what JSONRenderer would produce"""
+        return (
+            self.compact and
+            not self.ensure_ascii and
+            self.encoder_class is JSONEncoder and
+            self.get_indent(accepted_media_type or '', renderer_context or {}) is None
+        )
@@ -0,0 +1,115 @@
+"""
+Salary normalization for Recruitsss
+Salaries in any currency and period as comparable yearly-equivalent XOF amounts
+"""
+
+import time
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import BigIntegerField, Case, DecimalField, F, Value, When
+from django.db.models.functions import Coalesce, Round
+
+
+PERIODS_PER_YEAR = {
+    'HOURLY': 2080,  # 40 hours x 52 weeks
+    'MONTHLY': 12,
+    'YEARLY': 1,
+}
+# Assumed when a salary has no period (candidate expectations never do)
+DEFAULT_SALARY_PERIOD = 'MONTHLY'
+
+_rates = None
+_rates_loaded_at = None
+
+
+def get_rates():
+    """Currency -> XOF rate, cached in-process for SALARY_FX_RATES_CACHE_TIMEOUT"""
+    global _rates, _rates_loaded_at
+    now = time.monotonic()
+    if _rates is None or now - _rates_loaded_at > settings.SALARY_FX_RATES_CACHE_TIMEOUT:
+        ExchangeRate = apps.get_model('core', 'ExchangeRate')
+        _rates = dict(ExchangeRate.objects.values_list('currency', 'rate_to_xof'))
+        _rates_loaded_at = now
+    return _rates
+
+
+def clear_rates_cache():
+    global _rates
+    _rates = None
+
+
+def to_yearly_xof(amount, currency, period=None):
+    """Yearly XOF equivalent of a salary, None if the amount or currency is unknown"""
+    if amount is None:
+        return None
+    rate = get_rates().get((currency or 'XOF').upper())
+    if rate is None:
+        return None
+    per_year = PERIODS_PER_YEAR.get(period or DEFAULT_SALARY_PERIOD, PERIODS_PER_YEAR[DEFAULT_SALARY_PERIOD])
+    return int((Decimal(amount) * rate * per_year).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+def _source_fields(model):
+    fields = [*model.yearly_salary_fields, 'salary_currency']
+    if model.salary_period_field:
+        fields.append(model.salary_period_field)
+    return fields
+
+
+def set_yearly_salaries(instance, update_fields=None):
+    """
+    Store the yearly XOF equivalents of the instance's salary bounds
+    A range with a single bound counts as that exact amount on both sides.
+    Returns the update_fields to save with, extended when a salary is saved.
+    """
+    model = type(instance)
+    if update_fields is not None and not set(update_fields) & set(_source_fields(model)):
+        return update_fields
+
+    (low_field, low_target), (high_field, high_target) = model.yearly_salary_fields.items()
+    low, high = getattr(instance, low_field), getattr(instance, high_field)
+    currency = instance.salary_currency
+    period = getattr(instance, model.salary_period_field) if model.salary_period_field else None
+    setattr(instance, low_target, to_yearly_xof(low if low is not None else high, currency, period))
+    setattr(instance, high_target, to_yearly_xof(high if high is not None else low, currency, period))
+
+    if update_fields is not None:
+        update_fields = {*update_fields, low_target, high_target}
+    return update_fields
+
+
+def normalized_models():
+    """Models declaring `yearly_salary_fields`"""
+    return [model for model in apps.get_models() if hasattr(model, 'yearly_salary_fields')]
+
+
+def renormalize_salaries(currency):
+    """Recompute the yearly XOF columns of every row in `currency`, one UPDATE per model"""
+    clear_rates_cache()
+    rate = get_rates().get(currency.upper())
+    updated = 0
+    for model in normalized_models():
+        (low_field, low_target), (high_field, high_target) = model.yearly_salary_fields.items()
+        if model.salary_period_field:
+            per_year = Case(
+                *[When(**{model.salary_period_field: period}, then=Value(n)) for period, n in PERIODS_PER_YEAR.items()],
+                default=Value(PERIODS_PER_YEAR[DEFAULT_SALARY_PERIOD]),
+            )
+        else:
+            per_year = Value(PERIODS_PER_YEAR[DEFAULT_SALARY_PERIOD])
+
+        def yearly(first, second):
+            if rate is None:
+                return Value(None, output_field=BigIntegerField())
+            return Round(
+                Coalesce(F(first), F(second)) * Value(rate) * per_year,
+                output_field=DecimalField(max_digits=24, decimal_places=0),
+            )
+
+        updated += model.objects.filter(salary_currency__iexact=currency).update(**{
+            low_target: yearly(low_field, high_field),
+            high_target: yearly(high_field, low_field),
+        })
+    return updated
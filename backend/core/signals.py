@@ -0,0 +1,16 @@
+"""
+Signal handlers for Core app
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ExchangeRate
+from .salaries import renormalize_salaries
+
+
+@receiver(post_save, sender=ExchangeRate)
+@receiver(post_delete, sender=ExchangeRate)
+def renormalize_on_rate_change(sender, instance, **kwargs):
+    """Reload the rates and recompute the salaries stored in the changed currency"""
+    renormalize_salaries(instance.currency)
@@ -0,0 +1,93 @@
+"""
+SimHash fingerprints for Recruitsss texts
+Near-identical texts get 64-bit fingerprints a few bits apart, found through exact band matches
+"""
+
+import hashlib
+import re
+from collections import Counter
+
+import numpy as np
+
+from core.geo import normalize_place
+
+
+BITS = 64
+# Fingerprints at most BANDS - 1 bits apart agree on at least one band (pigeonhole)
+BANDS = 8
+BAND_BITS = BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+WORD = re.compile(r'\w+')
+
+_SHIFTS = np.arange(BITS, dtype=np.uint64)
+
+
+def _hash64(token):
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'big')
+
+
+def text_tokens(*texts, tags=()):
+    """
+    Weighted features of some texts
+    Words counted as often as they occur, which keeps a few edited words from
+    moving many bits, and tags (skills...) as whole tokens.
+    """
+    tokens = Counter()
+    for text in texts:
+        tokens.update(WORD.findall(normalize_place(text or '')))
+    tokens.update(f'#{normalize_place(tag)}' for tag in tags if tag and tag.strip())
+    return tokens
+
+
+def simhash(tokens):
+    """Signed 64-bit SimHash of weighted tokens, None without tokens"""
+    if not tokens:
+        return None
+    hashes = np.array([_hash64(token) for token in tokens], dtype=np.uint64)
+    weights = np.array(list(tokens.values()), dtype=np.int64)
+    bits = ((hashes[:, None] >> _SHIFTS) & np.uint64(1)).astype(np.int64)
+    votes = (weights[:, None] * (2 * bits - 1)).sum(axis=0)
+    fingerprint = sum(1 << int(shift) for shift in np.flatnonzero(votes > 0))
+    # Stored in a BIGINT column
+    return fingerprint - (1 << BITS) if fingerprint >= 1 << (BITS - 1) else fingerprint
+
+
+def bands(fingerprint):
+    """BANDS keys of a fingerprint, each tagged with its band number"""
+    return [
+        (band << BAND_BITS) | ((fingerprint >> (band * BAND_BITS)) & BAND_MASK)
+        for band in range(BANDS)
+    ]
+
+
+def distance(first, second):
+    """Hamming distance between two fingerprints"""
+    return ((first ^ second) & ((1 << BITS) - 1)).bit_count()
+
+
+def fingerprint(instance):
+    """SimHash of the instance's fingerprint_fields, lists of strings counted as tags"""
+    texts, tags = [], []
+    for name in type(instance).fingerprint_fields:
+        value = getattr(instance, name)
+        if isinstance(value, (list, tuple)):
+            tags.extend(value)
+        else:
+            texts.append(value)
+    return simhash(text_tokens(*texts, tags=tags))
+
+
+def set_fingerprint(instance, update_fields=None):
+    """
+    Store the SimHash of the instance's text on `instance.simhash` and its bands
+    Returns the update_fields to save with, extended when a text field is saved.
+    """
+    model = type(instance)
+    if update_fields is not None and not set(update_fields) & set(model.fingerprint_fields):
+        return update_fields
+    instance.simhash = fingerprint(instance)
+    instance.simhash_bands = bands(instance.simhash) if instance.simhash is not None else []
+    if update_fields is not None:
+        update_fields = {*update_fields, 'simhash', 'simhash_bands'}
+    return update_fields
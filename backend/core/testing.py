@@ -0,0 +1,146 @@
+"""
+Test helpers for Recruitsss
+Fixture factories and the query budget assertion used by the API test suites
+"""
+
+import copy
+from datetime import timedelta
+from decimal import Decimal
+from itertools import count
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from config.celery import app as celery_app
+from users.models import User, Candidate, Recruiter, Admin
+
+
+_sequence = count(1)
+
+# Keep test cache entries apart from the development cache
+TEST_CACHES = copy.deepcopy(settings.CACHES)
+TEST_CACHES['default']['KEY_PREFIX'] = 'recruitsss-test'
+
+
+def make_user(role, **extra):
+    n = next(_sequence)
+    return User.objects.create_user(
+        email=f'{role.lower()}{n}@example.com',
+        password='Password123!',
+        first_name=f'First{n}',
+        last_name=f'Last{n}',
+        role=role,
+        status='ACTIVE',
+        **extra
+    )
+
+
+def make_candidate(**extra):
+    extra.setdefault('skills', ['Python', 'Django'])
+    extra.setdefault('location', 'Dakar, Sénégal')
+    return Candidate.objects.create(id=make_user('CANDIDATE'), **extra)
+
+
+def make_recruiter(**extra):
+    user = make_user('RECRUITER')
+    extra.setdefault('company_name', f'Company {user.last_name}')
+    extra.setdefault('payment_status', 'ACTIVE')
+    extra.setdefault('subscription_valid_until', timezone.now().date() + timedelta(days=30))
+    return Recruiter.objects.create(id=user, **extra)
+
+
+def make_admin(**extra):
+    user = make_user('ADMIN', is_staff=True)
+    extra.setdefault('can_manage_users', True)
+    extra.setdefault('can_manage_jobs', True)
+    extra.setdefault('can_manage_payments', True)
+    return Admin.objects.create(id=user, **extra)
+
+
+def make_job(recruiter, **extra):
+    from jobs.models import JobOffer
+
+    extra.setdefault('title', f'Développeur Python {next(_sequence)}')
+    extra.setdefault('description', 'Backend development with Django and PostgreSQL')
+    extra.setdefault('contract_type', 'CDI')
+    extra.setdefault('location', 'Dakar, Sénégal')
+    extra.setdefault('skills_required', ['Python', 'Django'])
+    extra.setdefault('salary_min', Decimal('500000'))
+    extra.setdefault('salary_max', Decimal('900000'))
+    extra.setdefault('salary_period', 'MONTHLY')
+    extra.setdefault('status', 'PUBLISHED')
+    if extra['status'] == 'PUBLISHED':
+        extra.setdefault('published_at', timezone.now())
+        extra.setdefault('expires_at', timezone.now() + timedelta(days=30))
+    return JobOffer.objects.create(recruiter=recruiter, **extra)
+
+
+def make_application(candidate, job_offer, **extra):
+    from applications.models import Application
+
+    return Application.objects.create(candidate=candidate, job_offer=job_offer, **extra)
+
+
+def make_notification(user, **extra):
+    from notifications.models import Notification
+
+    extra.setdefault('type', 'APPLICATION_STATUS_CHANGED')
+    extra.setdefault('channel', 'IN_APP')
+    extra.setdefault('title', 'Update')
+    extra.setdefault('message', 'Your application was updated')
+    return Notification.objects.create(user=user, **extra)
+
+
+def make_payment(recruiter, **extra):
+    from payments.models import Payment
+
+    extra.setdefault('amount', Decimal('25000'))
+    extra.setdefault('method', 'MOBILE_MONEY')
+    return Payment.objects.create(recruiter=recruiter, **extra)
+
+
+@override_settings(
+    CACHES=TEST_CACHES,
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class QueryBudgetTestCase(APITestCase):
+    """
+    API test case asserting a fixed SQL query budget per request
+
+    `assertQueryBudget` checks that a request stays within its budget and,
+    when given a `grow` callable adding more rows, that the number of queries
+    does not change with the size of the page (no N+1).
+    Celery tasks queued by on-commit callbacks run inline.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.delete_pattern('*')
+        celery_app.conf.task_always_eager = True
+        self.addCleanup(setattr, celery_app.conf, 'task_always_eager', False)
+
+    def count_queries(self, request):
+        with CaptureQueriesContext(connection) as queries:
+            response = request()
+        self.assertLess(response.status_code, 400, getattr(response, 'data', response))
+        return len(queries)
+
+    def assertQueryBudget(self, budget, request, grow=None):
+        executed = self.count_queries(request)
+        self.assertLessEqual(
+            executed, budget,
+            f'{executed} queries executed, budget is {budget}'
+        )
+        if grow is not None:
+            grow()
+            cache.delete_pattern('*')
+            self.assertEqual(
+                self.count_queries(request), executed,
+                'query count grows with the number of rows'
+            )
+        return executed
@@ -3,7 +3,7 @@ Admin configuration for Jobs app
 """
 
 from django.contrib import admin
-from .models import JobOffer, SavedJob
+from .models import JobOffer, SavedJob, JobAlert
 
 
 @admin.register(JobOffer)
@@ -91,3 +91,21 @@ class SavedJobAdmin(admin.ModelAdmin):
     def get_job_title(self, obj):
         return obj.job_offer.title
     get_job_title.short_description = 'Job Title'
+
+
+
+@admin.register(JobAlert)
+class JobAlertAdmin(admin.ModelAdmin):
+    list_display = ['name', 'get_candidate', 'criteria_count', 'is_active', 'created_at']
+    list_filter = ['is_active', 'created_at']
+    search_fields = [
+        'name',
+        'candidate__id__email',
+        'skills',
+        'locations'
+    ]
+    readonly_fields = ['criteria_count', 'created_at', 'updated_at']
+    
+    def get_candidate(self, obj):
+        return obj.candidate.id.full_name
+    get_candidate.short_description = 'Candidate'
@@ -0,0 +1,135 @@
+"""
+Job alerts matched through an inverted index
+Alert criteria are stored as tokens; a published job looks up its own tokens to find the alerts it matches
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+
+from core import geo
+from notifications.models import Notification
+from .models import JobAlert, JobAlertToken, JobOffer
+
+
+# Alert field -> token dimension
+DIMENSIONS = {
+    'skills': 'skill',
+    'locations': 'location',
+    'contract_types': 'contract',
+    'experience_levels': 'level',
+}
+
+REMOTE_LOCATIONS = {'remote', 'teletravail', 'a distance'}
+
+
+def location_token(location):
+    """Gazetteer city of a location, its normalized text otherwise"""
+    place = geo.normalize_place(location)
+    if place in REMOTE_LOCATIONS:
+        return 'remote'
+    city = geo.lookup(location)
+    return geo.normalize_place(city.name) if city else place
+
+
+def _token(dimension, value):
+    if dimension == 'skill':
+        value = geo.normalize_place(value)
+    elif dimension == 'location':
+        value = location_token(value)
+    return f'{dimension}:{value}'
+
+
+def alert_tokens(alert):
+    """{(dimension, token)} of an alert's criteria"""
+    return {
+        (dimension, _token(dimension, value))
+        for field, dimension in DIMENSIONS.items()
+        for value in getattr(alert, field)
+        if value and value.strip()
+    }
+
+
+def job_tokens(job):
+    """Tokens an alert criterion may hold to match this job"""
+    tokens = {_token('skill', skill) for skill in job.skills_required or ()}
+    if job.location:
+        tokens.add(_token('location', job.location))
+    if job.is_remote:
+        tokens.add('location:remote')
+    tokens.add(_token('contract', job.contract_type))
+    if job.experience_level:
+        tokens.add(_token('level', job.experience_level))
+    return tokens
+
+
+def index_alert(alert):
+    """Replace the alert's tokens, called from JobAlert.save()"""
+    tokens = alert_tokens(alert)
+    criteria_count = len({dimension for dimension, _ in tokens})
+    if alert.criteria_count != criteria_count:
+        alert.criteria_count = criteria_count
+        JobAlert.objects.filter(pk=alert.pk).update(criteria_count=criteria_count)
+
+    JobAlertToken.objects.filter(alert=alert).delete()
+    JobAlertToken.objects.bulk_create([
+        JobAlertToken(alert=alert, dimension=dimension, token=token) for dimension, token in tokens
+    ])
+
+
+def matching_alerts(job):
+    """
+    Active alerts matching a job, as (alert id, candidate id) rows
+    Only the index rows of the job's own tokens are read: an alert matches
+    when they cover every dimension it has criteria for.
+    """
+    return (
+        JobAlertToken.objects
+        .filter(token__in=job_tokens(job), alert__is_active=True)
+        .values('alert_id', 'alert__candidate_id', 'alert__criteria_count')
+        .annotate(matched=Count('dimension', distinct=True))
+        .filter(matched=F('alert__criteria_count'))
+        .values_list('alert_id', 'alert__candidate_id')
+    )
+
+
+def notify_matches(job_id):
+    """
+    Create one JOB_MATCH notification per candidate with an alert matching the job
+    Notifications are written JOB_ALERT_NOTIFICATION_CHUNK_SIZE at a time with
+    bulk_create; candidates already notified of this job are skipped, so a
+    retried task does not notify twice. Returns the number created.
+    """
+    job = JobOffer.objects.select_related('recruiter').filter(pk=job_id, status='PUBLISHED').first()
+    if job is None:
+        return 0
+
+    alert_by_candidate = {}
+    for alert_id, candidate_id in matching_alerts(job):
+        alert_by_candidate.setdefault(candidate_id, alert_id)
+    notified = set(
+        Notification.objects.filter(
+            type='JOB_MATCH', user_id__in=list(alert_by_candidate), data__job_offer_id=str(job.pk)
+        ).values_list('user_id', flat=True)
+    )
+    recipients = [
+        (candidate_id, alert_id) for candidate_id, alert_id in alert_by_candidate.items()
+        if candidate_id not in notified
+    ]
+
+    company = job.recruiter.company_name
+    chunk_size = settings.JOB_ALERT_NOTIFICATION_CHUNK_SIZE
+    for start in range(0, len(recipients), chunk_size):
+        with transaction.atomic():
+            Notification.objects.bulk_create([
+                Notification(
+                    user_id=candidate_id,
+                    type='JOB_MATCH',
+                    channel='IN_APP',
+                    title='New Job Match',
+                    message=f'{job.title} at {company} matches one of your job alerts.',
+                    data={'job_offer_id': str(job.pk), 'alert_id': str(alert_id)},
+                )
+                for candidate_id, alert_id in recipients[start:start + chunk_size]
+            ])
+    return len(recipients)
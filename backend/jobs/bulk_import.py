@@ -0,0 +1,122 @@
+"""
+Bulk job import for recruiters
+Rows are validated in one pass, then inserted with batched INSERTs in one transaction
+"""
+
+import re
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core import geo, salaries, simhash
+from . import duplicates, response_cache
+from .models import JobOffer
+from .serializers import JobOfferCreateSerializer
+from .tasks import index_similar_jobs, notify_job_alerts
+
+
+# CSV cells holding several skills, e.g. "Python|Django" or "Python, Django"
+SKILLS_SEPARATOR = re.compile(r'[|,;]')
+
+
+def normalize_csv_row(row):
+    """A parsed CSV row as the create serializer expects it: blank cells are left out"""
+    data = {}
+    for name, value in row.items():
+        if name is None:
+            # Values beyond the header, kept so validation reports them
+            data[None] = value
+            continue
+        value = value.strip()
+        if not value:
+            continue
+        if name == 'skills_required':
+            value = [skill.strip() for skill in SKILLS_SEPARATOR.split(value) if skill.strip()]
+        data[name] = value
+    return data
+
+
+def validate_rows(rows, context=None):
+    """
+    Validate every row with JobOfferCreateSerializer
+    Returns (validated rows, errors), errors being [{'row': n, 'errors': {...}}]
+    with rows numbered from 1.
+    """
+    known = set(JobOfferCreateSerializer.Meta.fields)
+    # Duplicates are looked up for all rows at once, see check_duplicates()
+    context = {**(context or {}), 'check_duplicates': False}
+    validated, errors = [], []
+    for number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            errors.append({'row': number, 'errors': {'non_field_errors': ['Expected an object.']}})
+            continue
+        if None in row:
+            errors.append({'row': number, 'errors': {'non_field_errors': ['More values than columns.']}})
+            continue
+        unknown = set(row) - known
+        if unknown:
+            errors.append({'row': number, 'errors': {
+                name: ['Unknown field.'] for name in sorted(unknown)
+            }})
+            continue
+
+        serializer = JobOfferCreateSerializer(data=row, context=context)
+        if serializer.is_valid():
+            validated.append(serializer.validated_data)
+        else:
+            errors.append({'row': number, 'errors': serializer.errors})
+    return validated, errors
+
+
+def check_duplicates(recruiter_id, validated_rows):
+    """
+    Rows nearly repeating a live offer of the recruiter or an earlier row
+    Returns (duplicates, errors) in the shape of validate_rows() errors: rows
+    are reported as duplicates under the 'warn' JOB_DUPLICATE_POLICY and as
+    errors under 'block'.
+    """
+    policy = duplicates.get_policy()
+    if policy == 'off':
+        return [], []
+    found = duplicates.find_batch_duplicates(recruiter_id, [JobOffer(**data) for data in validated_rows])
+    if policy == 'block':
+        return [], [
+            {'row': index + 1, 'errors': {
+                'duplicate_of': [match['id'] if 'id' in match else f"row {match['row']}" for match in matches]
+            }}
+            for index, matches in sorted(found.items())
+        ]
+    return [{'row': index + 1, 'duplicate_of': matches} for index, matches in sorted(found.items())], []
+
+
+def build_job(recruiter, data, publish=False, now=None):
+    """Unsaved job offer with what JobOffer.save() would compute"""
+    job = JobOffer(recruiter=recruiter, **data)
+    if publish:
+        job.status = 'PUBLISHED'
+        job.published_at = now or timezone.now()
+    geo.set_coordinates(job, None)
+    salaries.set_yearly_salaries(job, None)
+    simhash.set_fingerprint(job, None)
+    return job
+
+
+def import_jobs(recruiter, validated_rows, publish=False):
+    """
+    Insert validated rows as job offers of `recruiter`, return them
+    All rows are inserted in one transaction, JOB_BULK_IMPORT_BATCH_SIZE per
+    INSERT; bulk_create sends no post_save, so cached job payloads are
+    dropped and published jobs queued for the similar jobs index and job
+    alerts here once the transaction commits.
+    """
+    now = timezone.now()
+    jobs = [build_job(recruiter, data, publish, now) for data in validated_rows]
+    with transaction.atomic():
+        JobOffer.objects.bulk_create(jobs, batch_size=settings.JOB_BULK_IMPORT_BATCH_SIZE)
+        transaction.on_commit(response_cache.bump_generation)
+        if publish:
+            transaction.on_commit(lambda: index_similar_jobs.delay([str(job.pk) for job in jobs]))
+            for job in jobs:
+                transaction.on_commit(lambda job_id=str(job.pk): notify_job_alerts.delay(job_id))
+    return jobs
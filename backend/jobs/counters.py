@@ -0,0 +1,188 @@
+"""
+Write-behind view counter for job offers
+Views are buffered in Redis and flushed to job_offers in batched UPDATEs
+"""
+
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F
+from django_redis import get_redis_connection
+from redis.exceptions import LockError, RedisError, ResponseError
+
+from . import response_cache
+
+
+logger = logging.getLogger(__name__)
+
+# Redis hashes of job id -> views not yet written to the database.
+# New views go to the pending hash; a flush renames it to the flushing
+# hash so views recorded while the flush runs are not lost. The flushing
+# hash also holds the batch id under BATCH_FIELD, kept across retries.
+PENDING_KEY = 'jobs:views:pending'
+FLUSHING_KEY = 'jobs:views:flushing'
+FLUSH_LOCK_KEY = 'jobs:views:flush-lock'
+BATCH_FIELD = 'batch'
+
+# Applied batch ids are recorded with the UPDATEs: a batch seen again applies nothing
+RECORD_BATCH_SQL = """
+    INSERT INTO job_view_flushes (batch_id, flushed_at)
+    VALUES (%s, now())
+    ON CONFLICT (batch_id) DO NOTHING
+"""
+
+PRUNE_BATCHES_SQL = """
+    DELETE FROM job_view_flushes
+    WHERE flushed_at < now() - make_interval(days => %s)
+"""
+
+# Drop the flushing hash only while it still holds the given batch
+DROP_BATCH_SCRIPT = """
+if redis.call('HGET', KEYS[1], ARGV[1]) == ARGV[2] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+FLUSH_SQL = """
+    UPDATE job_offers AS j
+    SET views_count = j.views_count + v.delta, updated_at = now()
+    FROM (VALUES {values}) AS v(id, delta)
+    WHERE j.id = v.id
+"""
+
+
+def _redis():
+    return get_redis_connection('default')
+
+
+def _keys():
+    return cache.make_key(PENDING_KEY), cache.make_key(FLUSHING_KEY)
+
+
+def record_view(job_id):
+    """Buffer one view and return the job's views not yet flushed"""
+    pending_key, flushing_key = _keys()
+    field = str(job_id)
+    try:
+        pipe = _redis().pipeline(transaction=False)
+        pipe.hincrby(pending_key, field, 1)
+        pipe.hget(flushing_key, field)
+        pending, flushing = pipe.execute()
+    except RedisError:
+        # Never drop a view because the buffer is unavailable
+        logger.warning('View buffer unavailable, writing view of job %s directly', job_id)
+        from .models import JobOffer
+        JobOffer.objects.filter(pk=job_id).update(views_count=F('views_count') + 1)
+        return 1
+    return pending + int(flushing or 0)
+
+
+def get_pending_views(job_ids):
+    """Return {job id: views not yet flushed} for the given jobs"""
+    fields = [str(job_id) for job_id in job_ids]
+    if not fields:
+        return {}
+    pending_key, flushing_key = _keys()
+    try:
+        pipe = _redis().pipeline(transaction=False)
+        pipe.hmget(pending_key, fields)
+        pipe.hmget(flushing_key, fields)
+        pending, flushing = pipe.execute()
+    except RedisError:
+        return {}
+    return {
+        field: int(p or 0) + int(f or 0)
+        for field, p, f in zip(fields, pending, flushing)
+        if p or f
+    }
+
+
+def merge_pending_views(jobs):
+    """
+    Add buffered views to `views_count` of job offers or job cards
+    Done with a single Redis round trip for the whole page.
+    """
+    # Projected querysets (?fields=) may not have loaded the counter at all
+    jobs = [job for job in jobs if job is not None and 'views_count' not in job.get_deferred_fields()]
+    pending = get_pending_views(getattr(job, 'job_offer_id', job.pk) for job in jobs)
+    for job in jobs:
+        job.views_count += pending.get(str(getattr(job, 'job_offer_id', job.pk)), 0)
+    return jobs
+
+
+def _apply_deltas(batch_id, deltas):
+    """
+    Write {job id: delta} to job_offers, one UPDATE per chunk, and record the batch
+    Returns False, writing nothing, when the batch was applied already.
+    """
+    items = list(deltas.items())
+    batch_size = settings.JOB_VIEWS_FLUSH_BATCH_SIZE
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Waits for a worker applying the same batch, then finds its row
+        cursor.execute(RECORD_BATCH_SQL, [batch_id])
+        if cursor.rowcount == 0:
+            return False
+        cursor.execute(PRUNE_BATCHES_SQL, [settings.JOB_VIEWS_FLUSH_RETENTION])
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            values = ', '.join(['(%s::uuid, %s::integer)'] * len(batch))
+            params = [value for item in batch for value in item]
+            cursor.execute(FLUSH_SQL.format(values=values), params)
+    return True
+
+
+def _drop_batch(redis, flushing_key, batch_id):
+    redis.eval(DROP_BATCH_SCRIPT, 1, flushing_key, BATCH_FIELD, batch_id)
+
+
+def flush_pending_views():
+    """
+    Apply buffered views to the database and return the number flushed
+
+    A flush left unfinished by a crashed worker is retried before taking
+    the next batch, and a lock keeps two workers from flushing at once.
+    Each batch is applied exactly once: its id is recorded in the same
+    transaction as its UPDATEs, so a retry after the commit, or a second
+    worker taking over from a flush that outlived the lock, applies nothing.
+    Reads between the commit and the removal of the flushing hash may
+    briefly count a batch twice; that is corrected on the next read.
+    """
+    redis = _redis()
+    pending_key, flushing_key = _keys()
+    lock = redis.lock(cache.make_key(FLUSH_LOCK_KEY), timeout=settings.JOB_VIEWS_FLUSH_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return 0
+
+    try:
+        if not redis.exists(flushing_key):
+            try:
+                redis.rename(pending_key, flushing_key)
+            except ResponseError:
+                # No views recorded since the last flush
+                return 0
+
+        redis.hsetnx(flushing_key, BATCH_FIELD, uuid.uuid4().hex)
+        batch = redis.hgetall(flushing_key)
+        batch_id = batch.pop(BATCH_FIELD.encode(), None)
+        if batch_id is None:
+            # Dropped meanwhile by a worker whose lock had expired
+            return 0
+        batch_id = batch_id.decode()
+
+        deltas = {field.decode(): int(count) for field, count in batch.items()}
+        applied = bool(deltas) and _apply_deltas(batch_id, deltas)
+        if applied:
+            # Cached job payloads carry the old counts
+            response_cache.bump_generation()
+        _drop_batch(redis, flushing_key, batch_id)
+        return sum(deltas.values()) if applied else 0
+    finally:
+        try:
+            lock.release()
+        except LockError:
+            # Expired during a long flush: the batch ids still keep it exact
+            pass
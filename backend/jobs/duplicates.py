@@ -0,0 +1,87 @@
+"""
+Near-duplicate job offers of a recruiter
+Reposted offers are found through the SimHash band index, then checked on their exact distance
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+
+from core import simhash
+from .models import JobOffer
+
+
+# Offers a repost would compete with
+LIVE_STATUSES = ('DRAFT', 'PUBLISHED')
+
+POLICIES = ('off', 'warn', 'block')
+
+
+def get_policy():
+    policy = settings.JOB_DUPLICATE_POLICY
+    return policy if policy in POLICIES else 'warn'
+
+
+def _close(fingerprint, rows):
+    """[{'id', 'title', 'status', 'distance'}] of the rows close enough, closest first"""
+    max_distance = settings.JOB_DUPLICATE_MAX_DISTANCE
+    matches = []
+    for job_id, title, status, other in rows:
+        distance = simhash.distance(fingerprint, other)
+        if distance <= max_distance:
+            matches.append({'id': str(job_id), 'title': title, 'status': status, 'distance': distance})
+    matches.sort(key=lambda match: (match['distance'], match['id']))
+    return matches
+
+
+def _candidates(recruiter_id, band_keys):
+    """Live offers of the recruiter sharing a band with the fingerprints, in one index lookup"""
+    return list(
+        JobOffer.objects
+        .filter(recruiter_id=recruiter_id, status__in=LIVE_STATUSES, simhash_bands__overlap=band_keys)
+        .values_list('pk', 'title', 'status', 'simhash')
+    )
+
+
+def find_duplicates(recruiter_id, job):
+    """Live offers of the recruiter within JOB_DUPLICATE_MAX_DISTANCE bits of an unsaved job"""
+    fingerprint = simhash.fingerprint(job)
+    if fingerprint is None:
+        return []
+    rows = _candidates(recruiter_id, simhash.bands(fingerprint))
+    return _close(fingerprint, [row for row in rows if row[0] != job.pk])
+
+
+def find_batch_duplicates(recruiter_id, jobs):
+    """
+    {index: matches} of the unsaved jobs that duplicate a live offer or an earlier job of the list
+    Offers sharing a band with any job of the list come from a single query
+    and are bucketed by band in memory, like the jobs of the list; earlier
+    jobs are reported as {'row': n} with rows numbered from 1.
+    """
+    fingerprints = [simhash.fingerprint(job) for job in jobs]
+    band_keys = {key for fingerprint in fingerprints if fingerprint is not None for key in simhash.bands(fingerprint)}
+    rows_by_band = defaultdict(list)
+    for row in _candidates(recruiter_id, list(band_keys)) if band_keys else ():
+        for key in simhash.bands(row[3]):
+            rows_by_band[key].append(row)
+
+    max_distance = settings.JOB_DUPLICATE_MAX_DISTANCE
+    duplicates = {}
+    earlier_by_band = defaultdict(list)
+    for index, fingerprint in enumerate(fingerprints):
+        if fingerprint is None:
+            continue
+        keys = simhash.bands(fingerprint)
+        rows = {row[0]: row for key in keys for row in rows_by_band[key]}
+        matches = _close(fingerprint, rows.values())
+        earlier = sorted({other for key in keys for other in earlier_by_band[key]})
+        for other in earlier:
+            distance = simhash.distance(fingerprint, fingerprints[other])
+            if distance <= max_distance:
+                matches.append({'row': other + 1, 'title': jobs[other].title, 'distance': distance})
+        if matches:
+            duplicates[index] = matches
+        for key in keys:
+            earlier_by_band[key].append(index)
+    return duplicates
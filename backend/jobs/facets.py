@@ -0,0 +1,105 @@
+"""
+Facet counts for the job board sidebar
+Every facet is counted in a single GROUPING SETS query over the filtered jobs
+"""
+
+from django.conf import settings
+from django.db import connection
+from django_filters import utils
+from django_filters.rest_framework import DjangoFilterBackend
+
+
+FACET_FIELDS = ('contract_type', 'experience_level', 'is_remote', 'location')
+
+
+class FacetBaseFilterBackend(DjangoFilterBackend):
+    """DjangoFilterBackend ignoring the facet parameters"""
+
+    def get_filterset_kwargs(self, request, queryset, view):
+        kwargs = super().get_filterset_kwargs(request, queryset, view)
+        data = kwargs['data'].copy()
+        for name in FACET_FIELDS:
+            data.pop(name, None)
+        kwargs['data'] = data
+        return kwargs
+
+
+def _selected_facets(request, queryset, view):
+    """Validated facet values from the query string"""
+    filterset = DjangoFilterBackend().get_filterset(request, queryset, view)
+    if not filterset.is_valid():
+        raise utils.translate_validation(filterset.errors)
+    return {
+        name: filterset.form.cleaned_data[name]
+        for name in FACET_FIELDS
+        if filterset.form.cleaned_data.get(name) not in (None, '')
+    }
+
+
+def _base_queryset(request, queryset, view):
+    """The view's filters (search included) without the facet parameters"""
+    for backend in view.filter_backends:
+        if issubclass(backend, DjangoFilterBackend):
+            backend = FacetBaseFilterBackend
+        queryset = backend().filter_queryset(request, queryset, view)
+    return queryset.order_by()
+
+
+def _matching(selected, exclude=None):
+    """SQL predicate and params for the selected facets, except `exclude`"""
+    clauses, params = [], []
+    for name, value in selected.items():
+        if name != exclude:
+            clauses.append(f'{connection.ops.quote_name(name)} = %s')
+            params.append(value)
+    return ' AND '.join(clauses) or 'TRUE', params
+
+
+def get_facet_counts(request, queryset, view):
+    """
+    Return {'total': n, 'facets': {field: [{'value', 'count'}, ...]}}
+
+    Facets are disjunctive: the counts of a facet apply every current filter
+    except that facet's own value, so the sidebar can show what switching
+    to another value would return.
+    """
+    selected = _selected_facets(request, queryset, view)
+    base_sql, base_params = _base_queryset(request, queryset, view).values(*FACET_FIELDS).query.sql_with_params()
+
+    quote = connection.ops.quote_name
+    select, params = [], []
+    for name in FACET_FIELDS:
+        select.append(f'{quote(name)}, GROUPING({quote(name)}) AS {quote("grouping_" + name)}')
+    for name in (None,) + FACET_FIELDS:
+        predicate, predicate_params = _matching(selected, exclude=name)
+        alias = quote('count_' + (name or 'total'))
+        select.append(f'count(*) FILTER (WHERE {predicate}) AS {alias}')
+        params.extend(predicate_params)
+
+    grouping_sets = ', '.join(f'({quote(name)})' for name in FACET_FIELDS)
+    sql = (
+        f'SELECT {", ".join(select)} FROM ({base_sql}) AS facet_jobs '
+        f'GROUP BY GROUPING SETS ({grouping_sets}, ())'
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + list(base_params))
+        columns = [column.name for column in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    total = 0
+    facets = {name: [] for name in FACET_FIELDS}
+    for row in rows:
+        grouped = [name for name in FACET_FIELDS if row['grouping_' + name] == 0]
+        if not grouped:
+            total = row['count_total']
+            continue
+        name = grouped[0]
+        count = row['count_' + name]
+        if row[name] is not None and count:
+            facets[name].append({'value': row[name], 'count': count})
+
+    for name, values in facets.items():
+        values.sort(key=lambda item: (-item['count'], str(item['value'])))
+        del values[settings.JOB_FACET_MAX_VALUES:]
+    return {'total': total, 'facets': facets}
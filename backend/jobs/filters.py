@@ -0,0 +1,43 @@
+"""
+Filter sets for the Jobs API
+"""
+
+from django_filters import rest_framework as filters
+
+from core.filters import ArrayFilter, NearFilter, RadiusFilter
+from .models import JobOffer, PublishedJobCard, unexpired
+
+
+JOB_FILTER_FIELDS = ['status', 'contract_type', 'experience_level', 'is_remote', 'location']
+
+
+class JobOfferFilter(filters.FilterSet):
+    """Job offer filters: skills through the GIN index, `near` through the coordinates index"""
+    skills_any = ArrayFilter(field_name='skills_required', lookup_expr='overlap')
+    skills_all = ArrayFilter(field_name='skills_required', lookup_expr='contains')
+    near = NearFilter()
+    radius_km = RadiusFilter()
+    # Yearly XOF amounts: jobs whose salary range reaches the bound
+    salary_gte = filters.NumberFilter(field_name='salary_max_yearly_xof', lookup_expr='gte')
+    salary_lte = filters.NumberFilter(field_name='salary_min_yearly_xof', lookup_expr='lte')
+    is_active = filters.BooleanFilter(method='filter_is_active')
+
+    class Meta:
+        model = JobOffer
+        fields = JOB_FILTER_FIELDS
+
+    def filter_is_active(self, queryset, name, value):
+        return queryset.active() if value else queryset.inactive()
+
+
+class PublishedJobCardFilter(filters.FilterSet):
+    """Filters available on the public job cards"""
+    is_active = filters.BooleanFilter(method='filter_is_active')
+
+    class Meta:
+        model = PublishedJobCard
+        fields = JOB_FILTER_FIELDS
+
+    def filter_is_active(self, queryset, name, value):
+        # Every card is a published job: only the expiry date matters
+        return queryset.filter(unexpired()) if value else queryset.exclude(unexpired())
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:24
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# Weighted search document: title (A) > skills (B) > description and
+# requirements (C), indexed with both the French and English configurations
+# so queries in either of the platform languages hit the same document.
+SEARCH_DOCUMENT_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION job_offers_search_document_update() RETURNS trigger AS $$
+DECLARE
+    skills text := coalesce(array_to_string(NEW.skills_required, ' '), '');
+    body text := coalesce(NEW.description, '') || ' ' || coalesce(NEW.requirements, '');
+BEGIN
+    NEW.search_document :=
+        setweight(to_tsvector('french', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('french', skills), 'B') ||
+        setweight(to_tsvector('english', skills), 'B') ||
+        setweight(to_tsvector('french', body), 'C') ||
+        setweight(to_tsvector('english', body), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER job_offers_search_document_trigger
+    BEFORE INSERT OR UPDATE OF title, description, requirements, skills_required
+    ON job_offers
+    FOR EACH ROW EXECUTE FUNCTION job_offers_search_document_update();
+
+UPDATE job_offers SET title = title;
+"""
+
+DROP_SEARCH_DOCUMENT_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS job_offers_search_document_trigger ON job_offers;
+DROP FUNCTION IF EXISTS job_offers_search_document_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_initial'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joboffer',
+            name='search_document',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_document'], name='job_offers_search_gin'),
+        ),
+        migrations.RunSQL(
+            SEARCH_DOCUMENT_TRIGGER_SQL,
+            reverse_sql=DROP_SEARCH_DOCUMENT_TRIGGER_SQL,
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:25
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_joboffer_search_document'),
+        ('users', '0002_trigram_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='job_offers_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['location'], name='job_offers_location_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_trigram_indexes'),
+        ('users', '0002_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=models.Index(fields=['-published_at', '-created_at', 'id'], name='job_offers_publish_367a01_idx'),
+        ),
+    ]
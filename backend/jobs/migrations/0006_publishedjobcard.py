@@ -0,0 +1,132 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+CARD_COLUMNS = """
+    job_offer_id, title, company_name, company_logo, contract_type, location,
+    is_remote, salary_min, salary_max, salary_currency, experience_level,
+    status, published_at, expires_at, views_count, applications_count,
+    created_at, updated_at
+"""
+
+CARD_VALUES = """
+    j.id, j.title, r.company_name, r.company_logo_url, j.contract_type, j.location,
+    j.is_remote, j.salary_min, j.salary_max, j.salary_currency, j.experience_level,
+    j.status, j.published_at, j.expires_at, j.views_count, j.applications_count,
+    j.created_at, j.updated_at
+"""
+
+# Keep one card per published job: upsert on every write to a published job,
+# drop the card as soon as the job leaves PUBLISHED or is deleted, and follow
+# company name/logo changes on the recruiter.
+CARD_TRIGGERS_SQL = f"""
+CREATE OR REPLACE FUNCTION published_job_cards_sync() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' OR NEW.status <> 'PUBLISHED' THEN
+        DELETE FROM published_job_cards
+        WHERE job_offer_id = CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END;
+        RETURN NULL;
+    END IF;
+
+    INSERT INTO published_job_cards ({CARD_COLUMNS})
+    SELECT {CARD_VALUES}
+    FROM (SELECT NEW.*) AS j
+    JOIN recruiters r ON r.id_id = j.recruiter_id
+    ON CONFLICT (job_offer_id) DO UPDATE SET
+        title = EXCLUDED.title,
+        company_name = EXCLUDED.company_name,
+        company_logo = EXCLUDED.company_logo,
+        contract_type = EXCLUDED.contract_type,
+        location = EXCLUDED.location,
+        is_remote = EXCLUDED.is_remote,
+        salary_min = EXCLUDED.salary_min,
+        salary_max = EXCLUDED.salary_max,
+        salary_currency = EXCLUDED.salary_currency,
+        experience_level = EXCLUDED.experience_level,
+        status = EXCLUDED.status,
+        published_at = EXCLUDED.published_at,
+        expires_at = EXCLUDED.expires_at,
+        views_count = EXCLUDED.views_count,
+        applications_count = EXCLUDED.applications_count,
+        created_at = EXCLUDED.created_at,
+        updated_at = EXCLUDED.updated_at;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER published_job_cards_sync_trigger
+    AFTER INSERT OR UPDATE OR DELETE ON job_offers
+    FOR EACH ROW EXECUTE FUNCTION published_job_cards_sync();
+
+CREATE OR REPLACE FUNCTION published_job_cards_sync_company() RETURNS trigger AS $$
+BEGIN
+    UPDATE published_job_cards AS c
+    SET company_name = NEW.company_name, company_logo = NEW.company_logo_url
+    FROM job_offers AS j
+    WHERE j.id = c.job_offer_id AND j.recruiter_id = NEW.id_id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER published_job_cards_sync_company_trigger
+    AFTER UPDATE OF company_name, company_logo_url ON recruiters
+    FOR EACH ROW
+    WHEN (OLD.company_name IS DISTINCT FROM NEW.company_name
+          OR OLD.company_logo_url IS DISTINCT FROM NEW.company_logo_url)
+    EXECUTE FUNCTION published_job_cards_sync_company();
+
+INSERT INTO published_job_cards ({CARD_COLUMNS})
+SELECT {CARD_VALUES}
+FROM job_offers AS j
+JOIN recruiters r ON r.id_id = j.recruiter_id
+WHERE j.status = 'PUBLISHED';
+"""
+
+DROP_CARD_TRIGGERS_SQL = """
+DROP TRIGGER IF EXISTS published_job_cards_sync_company_trigger ON recruiters;
+DROP FUNCTION IF EXISTS published_job_cards_sync_company();
+DROP TRIGGER IF EXISTS published_job_cards_sync_trigger ON job_offers;
+DROP FUNCTION IF EXISTS published_job_cards_sync();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_keyset_pagination_indexes'),
+        ('users', '0002_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublishedJobCard',
+            fields=[
+                ('job_offer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='jobs.joboffer')),
+                ('title', models.CharField(max_length=255)),
+                ('company_name', models.CharField(max_length=255)),
+                ('company_logo', models.CharField(blank=True, max_length=500, null=True)),
+                ('contract_type', models.CharField(choices=[('CDI', 'CDI - Permanent Contract'), ('CDD', 'CDD - Fixed-term Contract'), ('FREELANCE', 'Freelance'), ('INTERNSHIP', 'Internship'), ('APPRENTICESHIP', 'Apprenticeship')], max_length=50)),
+                ('location', models.CharField(blank=True, max_length=255, null=True)),
+                ('is_remote', models.BooleanField(default=False)),
+                ('salary_min', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('salary_max', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('salary_currency', models.CharField(default='XOF', max_length=3)),
+                ('experience_level', models.CharField(blank=True, choices=[('JUNIOR', 'Junior (0-2 years)'), ('INTERMEDIATE', 'Intermediate (2-5 years)'), ('SENIOR', 'Senior (5-10 years)'), ('EXPERT', 'Expert (10+ years)')], max_length=50, null=True)),
+                ('status', models.CharField(choices=[('DRAFT', 'Draft'), ('PUBLISHED', 'Published'), ('CLOSED', 'Closed'), ('ARCHIVED', 'Archived'), ('REJECTED', 'Rejected')], max_length=20)),
+                ('published_at', models.DateTimeField(blank=True, null=True)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('views_count', models.IntegerField(default=0)),
+                ('applications_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'published_job_cards',
+                'ordering': ['-published_at', '-created_at'],
+                'indexes': [models.Index(fields=['-published_at', '-created_at', 'job_offer'], name='published_j_publish_8b1740_idx')],
+            },
+        ),
+        migrations.RunSQL(CARD_TRIGGERS_SQL, reverse_sql=DROP_CARD_TRIGGERS_SQL),
+    ]
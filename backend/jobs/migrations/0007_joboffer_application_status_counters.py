@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_publishedjobcard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joboffer',
+            name='accepted_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='joboffer',
+            name='interview_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='joboffer',
+            name='shortlisted_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='joboffer',
+            name='submitted_count',
+            field=models.IntegerField(default=0),
+        ),
+    ]
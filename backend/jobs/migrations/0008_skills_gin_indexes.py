@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:43
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_joboffer_application_status_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['skills_required'], name='job_offers_skills_gin'),
+        ),
+    ]
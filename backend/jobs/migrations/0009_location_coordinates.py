@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:46
+
+from django.db import migrations, models
+
+from core import geo
+
+
+APP_LABEL = 'jobs'
+MODELS = ['JobOffer']
+
+
+def backfill_coordinates(apps, schema_editor):
+    """Resolve existing locations through the gazetteer"""
+    for model_name in MODELS:
+        model = apps.get_model(APP_LABEL, model_name)
+        rows = []
+        for row in model.objects.exclude(location__isnull=True).exclude(location='').only('pk', 'location'):
+            city = geo.lookup(row.location)
+            if city is not None:
+                row.latitude, row.longitude = city.latitude, city.longitude
+                rows.append(row)
+        model.objects.bulk_update(rows, ['latitude', 'longitude'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_skills_gin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joboffer',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='joboffer',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=models.Index(fields=['latitude', 'longitude'], name='job_offers_latitud_b64bce_idx'),
+        ),
+        migrations.RunPython(backfill_coordinates, migrations.RunPython.noop),
+    ]
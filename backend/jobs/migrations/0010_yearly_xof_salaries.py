@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:48
+
+from django.db import migrations, models
+
+
+# Same conversion as core.salaries.set_yearly_salaries, for existing rows
+BACKFILL_SQL = """
+UPDATE job_offers AS t SET
+    salary_min_yearly_xof = round(coalesce(t.salary_min, t.salary_max) * r.rate_to_xof * CASE t.salary_period WHEN 'HOURLY' THEN 2080 WHEN 'YEARLY' THEN 1 ELSE 12 END),
+    salary_max_yearly_xof = round(coalesce(t.salary_max, t.salary_min) * r.rate_to_xof * CASE t.salary_period WHEN 'HOURLY' THEN 2080 WHEN 'YEARLY' THEN 1 ELSE 12 END)
+FROM exchange_rates AS r
+WHERE r.currency = upper(t.salary_currency);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('jobs', '0009_location_coordinates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joboffer',
+            name='salary_max_yearly_xof',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='joboffer',
+            name='salary_min_yearly_xof',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=models.Index(fields=['salary_min_yearly_xof'], name='job_offers_salary__5d0603_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=models.Index(fields=['salary_max_yearly_xof'], name='job_offers_salary__af1681_idx'),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_yearly_xof_salaries'),
+        ('users', '0005_yearly_xof_salaries'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=models.Index(condition=models.Q(('status', 'PUBLISHED')), fields=['expires_at'], name='job_offers_published_expiry'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:03
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_published_expiry_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSignature',
+            fields=[
+                ('job_offer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='jobs.joboffer')),
+                ('signature', django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), size=None)),
+                ('bands', django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), size=None)),
+                ('neighbors', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'job_signatures',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['bands'], name='job_signatures_bands_gin')],
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:06
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_job_signatures'),
+        ('users', '0005_yearly_xof_salaries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobAlert',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('skills', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, size=None)),
+                ('locations', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=255), blank=True, default=list, size=None)),
+                ('contract_types', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(choices=[('CDI', 'CDI - Permanent Contract'), ('CDD', 'CDD - Fixed-term Contract'), ('FREELANCE', 'Freelance'), ('INTERNSHIP', 'Internship'), ('APPRENTICESHIP', 'Apprenticeship')], max_length=50), blank=True, default=list, size=None)),
+                ('experience_levels', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(choices=[('JUNIOR', 'Junior (0-2 years)'), ('INTERMEDIATE', 'Intermediate (2-5 years)'), ('SENIOR', 'Senior (5-10 years)'), ('EXPERT', 'Expert (10+ years)')], max_length=50), blank=True, default=list, size=None)),
+                ('criteria_count', models.PositiveSmallIntegerField(default=0, editable=False)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_alerts', to='users.candidate')),
+            ],
+            options={
+                'db_table': 'job_alerts',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobAlertToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(max_length=20)),
+                ('token', models.CharField(max_length=255)),
+                ('alert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens', to='jobs.jobalert')),
+            ],
+            options={
+                'db_table': 'job_alert_tokens',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='jobalert',
+            index=models.Index(fields=['candidate'], name='job_alerts_candida_929043_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobalerttoken',
+            index=models.Index(fields=['token', 'alert', 'dimension'], name='job_alert_t_token_f5656e_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobalerttoken',
+            unique_together={('alert', 'dimension', 'token')},
+        ),
+    ]
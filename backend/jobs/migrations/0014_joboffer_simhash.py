@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:12
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+from core import simhash
+
+
+def backfill_fingerprints(apps, schema_editor):
+    """Fingerprint existing job offers as JobOffer.save() would"""
+    JobOffer = apps.get_model('jobs', 'JobOffer')
+    rows = []
+    for row in JobOffer.objects.only('pk', 'title', 'description', 'skills_required').iterator(chunk_size=1000):
+        row.simhash = simhash.simhash(simhash.text_tokens(row.title, row.description, tags=row.skills_required))
+        row.simhash_bands = simhash.bands(row.simhash) if row.simhash is not None else []
+        rows.append(row)
+    JobOffer.objects.bulk_update(rows, ['simhash', 'simhash_bands'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_job_alerts'),
+        ('users', '0005_yearly_xof_salaries'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joboffer',
+            name='simhash',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='joboffer',
+            name='simhash_bands',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddIndex(
+            model_name='joboffer',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['simhash_bands'], name='job_offers_simhash_bands_gin'),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+    ]
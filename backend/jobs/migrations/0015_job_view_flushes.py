@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0014_joboffer_simhash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobViewFlush',
+            fields=[
+                ('batch_id', models.UUIDField(primary_key=True, serialize=False)),
+                ('flushed_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'db_table': 'job_view_flushes',
+            },
+        ),
+    ]
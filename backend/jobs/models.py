@@ -1,15 +1,110 @@
 """
 Job-related models for the recruitment platform
-Includes JobOffer and SavedJobs models
+Includes JobOffer, SavedJobs and JobAlert models
 """
 
 import uuid
+from datetime import timedelta
+
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Extract, Greatest, Now
 from django.utils import timezone
 
+from core import geo, salaries, simhash
 from users.models import Recruiter, Candidate
+from .counters import record_view
+
+
+def unexpired():
+    """Jobs without an expiry date or expiring in the future, evaluated by the database"""
+    return models.Q(expires_at__isnull=True) | models.Q(expires_at__gte=Now())
+
+
+def activity_changed_at(days_remaining=False):
+    """
+    When time alone last changed a job's activity, evaluated by the database
+    That is its expiry once passed and, with `days_remaining`, the last
+    decrement of the days left before an expiry still to come.
+    """
+    expired = models.When(expires_at__lt=Now(), then=models.F('expires_at'))
+    if not days_remaining:
+        return models.Case(expired, output_field=models.DateTimeField())
+    days_left = Extract(
+        models.ExpressionWrapper(models.F('expires_at') - Now(), output_field=models.DurationField()),
+        'day'
+    )
+    return models.Case(
+        expired,
+        default=models.ExpressionWrapper(
+            models.F('expires_at') - (days_left + 1) * models.Value(timedelta(days=1)),
+            output_field=models.DateTimeField()
+        ),
+        output_field=models.DateTimeField()
+    )
+
+
+def candidate_flags(candidate_id, job_field='pk'):
+    """
+    `is_saved` and `has_applied` annotations of a candidate for job rows
+    EXISTS subqueries served by the (candidate, job_offer) unique indexes.
+    """
+    from applications.models import Application
+    
+    return {
+        'is_saved': models.Exists(
+            SavedJob.objects.filter(candidate_id=candidate_id, job_offer_id=models.OuterRef(job_field))
+        ),
+        'has_applied': models.Exists(
+            Application.objects.filter(candidate_id=candidate_id, job_offer_id=models.OuterRef(job_field))
+        ),
+    }
+
+
+class JobOfferQuerySet(models.QuerySet):
+    """Job offer queries with activity computed in SQL"""
+    
+    def active(self):
+        """Published and not expired, served by the partial index on published jobs"""
+        return self.filter(unexpired(), status='PUBLISHED')
+    
+    def inactive(self):
+        return self.exclude(unexpired(), status='PUBLISHED')
+    
+    def with_activity(self):
+        """Annotate `is_active` and `days_remaining` instead of computing them per row"""
+        return self.annotate(
+            is_active=models.ExpressionWrapper(
+                models.Q(unexpired(), status='PUBLISHED'),
+                output_field=models.BooleanField()
+            ),
+            days_remaining=models.Case(
+                models.When(expires_at__isnull=True, then=None),
+                default=Greatest(
+                    Extract(
+                        models.ExpressionWrapper(
+                            models.F('expires_at') - Now(),
+                            output_field=models.DurationField()
+                        ),
+                        'day'
+                    ),
+                    0
+                ),
+                output_field=models.IntegerField()
+            ),
+        )
+    
+    def close_expired(self):
+        """Close every published job past its expiry date with one UPDATE, return the count"""
+        now = timezone.now()
+        return self.filter(status='PUBLISHED', expires_at__lt=now).update(
+            status='CLOSED',
+            closed_at=now,
+            updated_at=now,
+        )
 
 
 class JobOffer(models.Model):
@@ -46,6 +141,21 @@ class JobOffer(models.Model):
         ('YEARLY', 'Per Year'),
     ]
     
+    # Salary bound -> yearly XOF column, maintained by core.salaries
+    yearly_salary_fields = {
+        'salary_min': 'salary_min_yearly_xof',
+        'salary_max': 'salary_max_yearly_xof',
+    }
+    salary_period_field = 'salary_period'
+    # Text fingerprinted by core.simhash to catch reposted offers
+    fingerprint_fields = ('title', 'description', 'skills_required')
+    # Counters written outside the ORM (jobs.counters, applications triggers):
+    # saves of an existing row leave them alone instead of writing back stale values
+    counter_fields = (
+        'views_count', 'applications_count', 'submitted_count', 'shortlisted_count',
+        'interview_count', 'accepted_count',
+    )
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     recruiter = models.ForeignKey(
         Recruiter,
@@ -79,10 +189,15 @@ class JobOffer(models.Model):
         null=True,
         blank=True
     )
+    # Yearly XOF equivalents of salary_min/salary_max, see core.salaries
+    salary_min_yearly_xof = models.BigIntegerField(null=True, blank=True, editable=False)
+    salary_max_yearly_xof = models.BigIntegerField(null=True, blank=True, editable=False)
     
     # Job characteristics
     contract_type = models.CharField(max_length=50, choices=CONTRACT_TYPE_CHOICES)
     location = models.CharField(max_length=255, blank=True, null=True, db_index=True)
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
     is_remote = models.BooleanField(default=False)
     skills_required = ArrayField(
         models.CharField(max_length=100),
@@ -113,12 +228,28 @@ class JobOffer(models.Model):
     
     # Metrics
     views_count = models.IntegerField(default=0)
+    # Application counters, maintained by a database trigger on applications
+    # (see applications migration 0004_application_counters)
     applications_count = models.IntegerField(default=0)
+    submitted_count = models.IntegerField(default=0)
+    shortlisted_count = models.IntegerField(default=0)
+    interview_count = models.IntegerField(default=0)
+    accepted_count = models.IntegerField(default=0)
+    
+    # Full-text search document, maintained by a database trigger
+    # (see migration 0003_joboffer_search_document)
+    search_document = SearchVectorField(null=True, editable=False)
+    
+    # SimHash of the title, description and skills, and its band keys (see jobs.duplicates)
+    simhash = models.BigIntegerField(null=True, blank=True, editable=False)
+    simhash_bands = ArrayField(models.IntegerField(), default=list, blank=True, editable=False)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = JobOfferQuerySet.as_manager()
+    
     class Meta:
         db_table = 'job_offers'
         ordering = ['-published_at', '-created_at']
@@ -128,33 +259,82 @@ class JobOffer(models.Model):
             models.Index(fields=['location']),
             models.Index(fields=['contract_type']),
             models.Index(fields=['published_at']),
+            models.Index(fields=['-published_at', '-created_at', 'id']),
+            models.Index(fields=['latitude', 'longitude']),
+            models.Index(fields=['salary_min_yearly_xof']),
+            models.Index(fields=['salary_max_yearly_xof']),
+            # Expired jobs are closed in bulk, so published rows are the active ones
+            models.Index(
+                fields=['expires_at'],
+                condition=models.Q(status='PUBLISHED'),
+                name='job_offers_published_expiry',
+            ),
+            GinIndex(fields=['search_document'], name='job_offers_search_gin'),
+            GinIndex(fields=['skills_required'], name='job_offers_skills_gin'),
+            GinIndex(fields=['title'], name='job_offers_title_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['location'], name='job_offers_location_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['simhash_bands'], name='job_offers_simhash_bands_gin'),
         ]
     
     def __str__(self):
         return f"{self.title} - {self.recruiter.company_name}"
     
+    def save(self, *args, **kwargs):
+        """Resolve the location, normalize the salary and fingerprint the text before saving"""
+        if not self._state.adding and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = self.get_saved_fields(kwargs.get('update_fields'))
+        kwargs['update_fields'] = geo.set_coordinates(self, kwargs.get('update_fields'))
+        kwargs['update_fields'] = salaries.set_yearly_salaries(self, kwargs['update_fields'])
+        kwargs['update_fields'] = simhash.set_fingerprint(self, kwargs['update_fields'])
+        super().save(*args, **kwargs)
+    
+    def get_saved_fields(self, update_fields=None):
+        """Fields an update of this row writes: `update_fields` or every loaded field, counters excepted"""
+        if update_fields is None:
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in deferred
+            ]
+        return [name for name in update_fields if name not in self.counter_fields]
+    
     @property
     def is_active(self):
-        """Check if job offer is currently active"""
+        """Check if job offer is currently active, annotated by `with_activity()`"""
+        if 'is_active' in self.__dict__:
+            return self.__dict__['is_active']
         if self.status != 'PUBLISHED':
             return False
         if self.expires_at and self.expires_at < timezone.now():
             return False
         return True
     
+    @is_active.setter
+    def is_active(self, value):
+        self.__dict__['is_active'] = value
+    
     @property
     def days_remaining(self):
-        """Calculate days remaining until expiration"""
+        """Calculate days remaining until expiration, annotated by `with_activity()`"""
+        if 'days_remaining' in self.__dict__:
+            return self.__dict__['days_remaining']
         if not self.expires_at:
             return None
         delta = self.expires_at - timezone.now()
         return max(0, delta.days)
     
+    @days_remaining.setter
+    def days_remaining(self, value):
+        self.__dict__['days_remaining'] = value
+    
     def publish(self):
-        """Publish the job offer"""
+        """Publish the job offer and notify the candidates whose alerts it matches"""
+        from .tasks import notify_job_alerts
+        
         self.status = 'PUBLISHED'
         self.published_at = timezone.now()
         self.save()
+        transaction.on_commit(lambda: notify_job_alerts.delay(str(self.pk)))
     
     def close(self):
         """Close the job offer"""
@@ -163,9 +343,8 @@ class JobOffer(models.Model):
         self.save()
     
     def increment_views(self):
-        """Increment view count"""
-        self.views_count += 1
-        self.save(update_fields=['views_count'])
+        """Record a view in the write-behind buffer (see jobs.counters)"""
+        self.views_count += record_view(self.pk)
 
 
 class SavedJob(models.Model):
@@ -197,3 +376,205 @@ class SavedJob(models.Model):
     
     def __str__(self):
         return f"{self.candidate} saved {self.job_offer.title}"
+
+
+class PublishedJobCardQuerySet(models.QuerySet):
+    """Job card queries with activity computed in SQL"""
+    
+    def with_activity(self):
+        """
+        Annotate `is_active` when the cards are read
+        Every card is a published job: only the expiry date matters, and it
+        passes without any write that would let the triggers refresh the card.
+        """
+        return self.annotate(
+            is_active=models.ExpressionWrapper(unexpired(), output_field=models.BooleanField())
+        )
+
+
+class PublishedJobCard(models.Model):
+    """
+    Denormalized read model for the public job feed
+    One row per published job offer holding exactly what a job card shows,
+    company name and logo included. Rows are maintained by database triggers
+    on job_offers and recruiters (see migration 0006_publishedjobcard).
+    """
+    
+    job_offer = models.OneToOneField(
+        JobOffer,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='card'
+    )
+    title = models.CharField(max_length=255)
+    company_name = models.CharField(max_length=255)
+    company_logo = models.CharField(max_length=500, blank=True, null=True)
+    contract_type = models.CharField(max_length=50, choices=JobOffer.CONTRACT_TYPE_CHOICES)
+    location = models.CharField(max_length=255, blank=True, null=True)
+    is_remote = models.BooleanField(default=False)
+    salary_min = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    salary_max = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    salary_currency = models.CharField(max_length=3, default='XOF')
+    experience_level = models.CharField(
+        max_length=50,
+        choices=JobOffer.EXPERIENCE_LEVEL_CHOICES,
+        null=True,
+        blank=True
+    )
+    status = models.CharField(max_length=20, choices=JobOffer.STATUS_CHOICES)
+    published_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+    views_count = models.IntegerField(default=0)
+    applications_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    
+    objects = PublishedJobCardQuerySet.as_manager()
+    
+    class Meta:
+        db_table = 'published_job_cards'
+        ordering = ['-published_at', '-created_at']
+        indexes = [
+            models.Index(fields=['-published_at', '-created_at', 'job_offer']),
+        ]
+    
+    def __str__(self):
+        return f"{self.title} - {self.company_name}"
+    
+    @property
+    def is_active(self):
+        """Check if the card's job has not expired yet, annotated by `with_activity()`"""
+        if 'is_active' in self.__dict__:
+            return self.__dict__['is_active']
+        return not self.expires_at or self.expires_at >= timezone.now()
+    
+    @is_active.setter
+    def is_active(self, value):
+        self.__dict__['is_active'] = value
+
+
+class JobViewFlush(models.Model):
+    """
+    Batch of buffered views already added to job_offers (see jobs.counters)
+    Recorded in the transaction that applies the batch, so a batch retried
+    after a crash or picked up by a second worker is never counted twice.
+    """
+    
+    batch_id = models.UUIDField(primary_key=True)
+    flushed_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        db_table = 'job_view_flushes'
+    
+    def __str__(self):
+        return f"View flush {self.batch_id}"
+
+
+class JobSignature(models.Model):
+    """
+    MinHash signature of a published job offer's text, with its similar jobs
+    Maintained by jobs.similarity: `bands` holds the LSH band hashes looked up
+    through a GIN index, `neighbors` the precomputed [[job id, similarity], ...].
+    """
+    
+    job_offer = models.OneToOneField(
+        JobOffer,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='signature'
+    )
+    signature = ArrayField(models.BigIntegerField())
+    bands = ArrayField(models.BigIntegerField())
+    neighbors = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'job_signatures'
+        indexes = [
+            GinIndex(fields=['bands'], name='job_signatures_bands_gin'),
+        ]
+    
+    def __str__(self):
+        return f"Signature of {self.job_offer_id}"
+
+
+class JobAlert(models.Model):
+    """
+    Saved search of a candidate, notified of every published job it matches
+    A job matches when every criterion given matches one of its values.
+    Criteria are indexed as JobAlertToken rows, see jobs.alerts.
+    """
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    candidate = models.ForeignKey(
+        Candidate,
+        on_delete=models.CASCADE,
+        related_name='job_alerts'
+    )
+    name = models.CharField(max_length=100)
+    
+    # Criteria, an empty list matches anything
+    skills = ArrayField(models.CharField(max_length=100), default=list, blank=True)
+    locations = ArrayField(models.CharField(max_length=255), default=list, blank=True)
+    contract_types = ArrayField(
+        models.CharField(max_length=50, choices=JobOffer.CONTRACT_TYPE_CHOICES),
+        default=list,
+        blank=True
+    )
+    experience_levels = ArrayField(
+        models.CharField(max_length=50, choices=JobOffer.EXPERIENCE_LEVEL_CHOICES),
+        default=list,
+        blank=True
+    )
+    # Number of criteria given, each must be matched (maintained by jobs.alerts)
+    criteria_count = models.PositiveSmallIntegerField(default=0, editable=False)
+    
+    is_active = models.BooleanField(default=True)
+    
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'job_alerts'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['candidate']),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.candidate})"
+    
+    def save(self, *args, **kwargs):
+        """Save the alert and re-index its criteria"""
+        from .alerts import index_alert
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            index_alert(self)
+
+
+class JobAlertToken(models.Model):
+    """
+    Inverted index of job alerts: one row per criterion value of an alert
+    Looking up a job's tokens finds the alerts it matches, see jobs.alerts.
+    """
+    
+    alert = models.ForeignKey(
+        JobAlert,
+        on_delete=models.CASCADE,
+        related_name='tokens'
+    )
+    # 'skill', 'location', 'contract' or 'level'
+    dimension = models.CharField(max_length=20)
+    token = models.CharField(max_length=255)
+    
+    class Meta:
+        db_table = 'job_alert_tokens'
+        unique_together = ['alert', 'dimension', 'token']
+        indexes = [
+            models.Index(fields=['token', 'alert', 'dimension']),
+        ]
+    
+    def __str__(self):
+        return f"{self.dimension}:{self.token} -> {self.alert_id}"
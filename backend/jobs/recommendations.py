@@ -0,0 +1,300 @@
+"""
+Candidate-to-job recommendations
+Candidates and published jobs become feature matrices scored in batches with NumPy
+"""
+
+import re
+from dataclasses import dataclass
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from core import geo
+from users.models import Candidate
+from .models import JobOffer
+
+
+CACHE_KEY = 'jobs:recommended:{}'
+
+# Score of a criterion one side leaves blank: neither a match nor a mismatch
+NEUTRAL = 0.5
+
+# Years of experience expected per level, (min, max)
+EXPERIENCE_YEARS = {
+    'JUNIOR': (0, 2),
+    'INTERMEDIATE': (2, 5),
+    'SENIOR': (5, 10),
+    'EXPERT': (10, np.inf),
+}
+# Internships and apprenticeships are meant for people starting out
+TRAINEE_CONTRACTS = ('INTERNSHIP', 'APPRENTICESHIP')
+TRAINEE_MAX_YEARS = 2
+
+# Free-text diplomas ranked from the highest, matched on normalize_place() text
+EDUCATION_LEVELS = [
+    (re.compile(r'\b(doctorat|doctorate|phd)\b'), 5),
+    (re.compile(r'\b(master|msc|mba|ingenieur|engineer)'), 4),
+    (re.compile(r'\b(licence|bachelor|bsc)\b'), 3),
+    (re.compile(r'\b(bts|dut|deug|hnd)\b'), 2),
+    (re.compile(r'\b(bac|baccalaureat|high school)\b'), 1),
+]
+
+JOB_COLUMNS = (
+    'id', 'skills_required', 'experience_level', 'contract_type', 'education_required',
+    'latitude', 'longitude', 'is_remote', 'salary_max_yearly_xof',
+)
+CANDIDATE_COLUMNS = (
+    'id', 'skills', 'experience_years', 'education', 'latitude', 'longitude',
+    'desired_salary_min_yearly_xof',
+)
+
+
+def normalize_skill(skill):
+    return ' '.join(skill.lower().split())
+
+
+def education_rank(text):
+    """1 (bac) to 5 (doctorate), 0 when the text names no known diploma"""
+    if not text:
+        return 0
+    text = geo.normalize_place(text)
+    for pattern, rank in EDUCATION_LEVELS:
+        if pattern.search(text):
+            return rank
+    return 0
+
+
+def _floats(values):
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float32)
+
+
+def _unit_vectors(latitude, longitude):
+    """(rows x 3) points on the unit sphere, NaN where a coordinate is missing"""
+    latitude, longitude = np.radians(latitude.astype(np.float64)), np.radians(longitude.astype(np.float64))
+    return np.stack([
+        np.cos(latitude) * np.cos(longitude),
+        np.cos(latitude) * np.sin(longitude),
+        np.sin(latitude),
+    ], axis=1)
+
+
+@dataclass
+class JobFeatures:
+    """One row per job offer, skills one-hot encoded over `vocabulary`"""
+    ids: list
+    vocabulary: dict
+    skills: np.ndarray
+    min_years: np.ndarray
+    max_years: np.ndarray
+    education: np.ndarray
+    points: np.ndarray
+    remote: np.ndarray
+    salary_max: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from JOB_COLUMNS value rows"""
+        vocabulary = {}
+        for row in rows:
+            for skill in row[1] or ():
+                vocabulary.setdefault(normalize_skill(skill), len(vocabulary))
+
+        skills = np.zeros((len(rows), len(vocabulary)), dtype=np.float32)
+        min_years, max_years = [], []
+        for index, (_, required, level, contract, *_rest) in enumerate(rows):
+            for skill in required or ():
+                skills[index, vocabulary[normalize_skill(skill)]] = 1
+            low, high = EXPERIENCE_YEARS.get(level, (np.nan, np.inf))
+            if contract in TRAINEE_CONTRACTS:
+                high = min(high, TRAINEE_MAX_YEARS)
+            min_years.append(low)
+            max_years.append(high)
+
+        columns = list(zip(*rows)) if rows else [()] * len(JOB_COLUMNS)
+        return cls(
+            ids=list(columns[0]),
+            vocabulary=vocabulary,
+            skills=skills,
+            min_years=np.array(min_years, dtype=np.float32),
+            max_years=np.array(max_years, dtype=np.float32),
+            education=np.array([education_rank(text) for text in columns[4]], dtype=np.float32),
+            points=_unit_vectors(_floats(columns[5]), _floats(columns[6])),
+            remote=np.array(columns[7], dtype=bool),
+            salary_max=_floats(columns[8]),
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+
+@dataclass
+class CandidateFeatures:
+    """One row per candidate, skills encoded over the jobs' vocabulary"""
+    ids: list
+    skills: np.ndarray
+    years: np.ndarray
+    education: np.ndarray
+    points: np.ndarray
+    salary_min: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows, vocabulary):
+        """Build from CANDIDATE_COLUMNS value rows; skills no job asks for are dropped"""
+        skills = np.zeros((len(rows), len(vocabulary)), dtype=np.float32)
+        for index, row in enumerate(rows):
+            for skill in row[1] or ():
+                column = vocabulary.get(normalize_skill(skill))
+                if column is not None:
+                    skills[index, column] = 1
+
+        columns = list(zip(*rows)) if rows else [()] * len(CANDIDATE_COLUMNS)
+        return cls(
+            ids=list(columns[0]),
+            skills=skills,
+            years=_floats(columns[2]),
+            education=np.array([education_rank(text) for text in columns[3]], dtype=np.float32),
+            points=_unit_vectors(_floats(columns[4]), _floats(columns[5])),
+            salary_min=_floats(columns[6]),
+        )
+
+
+def _skills_score(candidates, jobs):
+    """Share of each job's required skills the candidate has"""
+    required = jobs.skills.sum(axis=1)
+    overlap = candidates.skills @ jobs.skills.T
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(required > 0, overlap / required, NEUTRAL)
+
+
+def _experience_score(candidates, jobs):
+    """1 inside the level's range, minus 0.2 per missing year and 0.1 per extra year"""
+    years = candidates.years[:, None]
+    missing = np.clip(jobs.min_years - years, 0, None)
+    extra = np.clip(years - jobs.max_years, 0, None)
+    score = np.clip(1 - 0.2 * missing - 0.1 * extra, 0, 1)
+    return np.where(np.isnan(score), NEUTRAL, score)
+
+
+def _education_score(candidates, jobs):
+    """1 when the candidate holds the diploma asked for, minus 0.25 per level below"""
+    held = candidates.education[:, None]
+    score = np.clip(1 - 0.25 * (jobs.education - held), 0, 1)
+    score = np.where(held == 0, NEUTRAL, score)
+    return np.where(jobs.education == 0, 1, score)
+
+
+def _location_score(candidates, jobs):
+    """1 for remote jobs and within the default radius, down to 0 five radii away"""
+    # Great-circle distances from one matrix product of unit vectors
+    cosine = np.clip(candidates.points @ jobs.points.T, -1, 1)
+    distance = (geo.EARTH_RADIUS_KM * np.arccos(cosine)).astype(np.float32)
+
+    radius = settings.LOCATION_DEFAULT_RADIUS_KM
+    score = np.clip(1 - (distance - radius) / (4 * radius), 0, 1)
+    score = np.where(np.isnan(score), NEUTRAL, score)
+    return np.where(jobs.remote, 1, score)
+
+
+def _salary_score(candidates, jobs):
+    """How much of the candidate's minimum the job's maximum covers, yearly XOF"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        score = np.clip(jobs.salary_max / candidates.salary_min[:, None], 0, 1)
+    return np.where(np.isnan(score), NEUTRAL, score)
+
+
+CRITERIA = {
+    'skills': _skills_score,
+    'experience': _experience_score,
+    'education': _education_score,
+    'location': _location_score,
+    'salary': _salary_score,
+}
+
+
+def score_matrix(candidates, jobs):
+    """(candidates x jobs) match scores between 0 and 1, weighted by JOB_RECOMMENDATION_WEIGHTS"""
+    weights = settings.JOB_RECOMMENDATION_WEIGHTS
+    total = np.zeros((len(candidates.ids), len(jobs)), dtype=np.float32)
+    for name, weight in weights.items():
+        total += weight * CRITERIA[name](candidates, jobs)
+    return total / sum(weights.values())
+
+
+def load_jobs():
+    """Features of every active job offer"""
+    return JobFeatures.from_rows(list(JobOffer.objects.active().values_list(*JOB_COLUMNS)))
+
+
+def load_candidates(queryset, vocabulary):
+    return CandidateFeatures.from_rows(list(queryset.values_list(*CANDIDATE_COLUMNS)), vocabulary)
+
+
+def applied_pairs(candidate_ids):
+    """{(candidate id, job id)} the candidates already applied to"""
+    from applications.models import Application
+
+    return set(
+        Application.objects.filter(candidate_id__in=candidate_ids).values_list('candidate_id', 'job_offer_id')
+    )
+
+
+def top_matches(candidates, jobs, limit):
+    """{candidate id: [[job id, score], ...]} best first, jobs already applied to left out"""
+    if not len(jobs):
+        return {candidate_id: [] for candidate_id in candidates.ids}
+
+    scores = score_matrix(candidates, jobs)
+    job_index = {job_id: index for index, job_id in enumerate(jobs.ids)}
+    candidate_index = {candidate_id: index for index, candidate_id in enumerate(candidates.ids)}
+    for candidate_id, job_id in applied_pairs(candidates.ids):
+        if job_id in job_index:
+            scores[candidate_index[candidate_id], job_index[job_id]] = -1
+
+    limit = min(limit, len(jobs))
+    # argpartition finds the best `limit` jobs without sorting every score
+    best = np.argpartition(-scores, limit - 1, axis=1)[:, :limit]
+    matches = {}
+    for row, candidate_id in enumerate(candidates.ids):
+        ranked = best[row][np.argsort(-scores[row, best[row]], kind='stable')]
+        matches[candidate_id] = [
+            [str(jobs.ids[column]), round(float(scores[row, column]), 4)]
+            for column in ranked if scores[row, column] >= 0
+        ]
+    return matches
+
+
+def refresh_recommendations(jobs=None):
+    """
+    Score every available candidate against the active jobs and cache their top N
+    Candidates are scored JOB_RECOMMENDATION_BATCH_SIZE at a time; returns the count.
+    """
+    jobs = jobs if jobs is not None else load_jobs()
+    batch_size = settings.JOB_RECOMMENDATION_BATCH_SIZE
+    candidate_ids = list(Candidate.objects.filter(is_available=True).order_by('pk').values_list('pk', flat=True))
+
+    for start in range(0, len(candidate_ids), batch_size):
+        batch = Candidate.objects.filter(pk__in=candidate_ids[start:start + batch_size])
+        matches = top_matches(load_candidates(batch, jobs.vocabulary), jobs, settings.JOB_RECOMMENDATION_TOP_N)
+        cache.set_many(
+            {CACHE_KEY.format(candidate_id): ranked for candidate_id, ranked in matches.items()},
+            settings.JOB_RECOMMENDATION_CACHE_TIMEOUT,
+        )
+    return len(candidate_ids)
+
+
+def get_recommendations(candidate_id):
+    """Cached [[job id, score], ...] of a candidate, computed on a cache miss"""
+    key = CACHE_KEY.format(candidate_id)
+    ranked = cache.get(key)
+    if ranked is None:
+        jobs = load_jobs()
+        candidates = load_candidates(Candidate.objects.filter(pk=candidate_id), jobs.vocabulary)
+        ranked = top_matches(candidates, jobs, settings.JOB_RECOMMENDATION_TOP_N).get(candidate_id, [])
+        cache.set(key, ranked, settings.JOB_RECOMMENDATION_CACHE_TIMEOUT)
+    return ranked
+
+
+def invalidate(candidate_id):
+    """Forget a candidate's recommendations, recomputed on their next request"""
+    cache.delete(CACHE_KEY.format(candidate_id))
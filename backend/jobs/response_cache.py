@@ -0,0 +1,83 @@
+"""
+Response cache for the public job endpoints
+Payloads are keyed on a generation number that every job offer write bumps
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+GENERATION_KEY = 'jobs:response-cache:generation'
+
+
+def get_generation():
+    """Current cache generation, created on first use"""
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, 1, timeout=None)
+        generation = cache.get(GENERATION_KEY, 1)
+    return generation
+
+
+def bump_generation():
+    """
+    Invalidate every cached job payload at once
+    Old entries are never read again and simply expire.
+    """
+    try:
+        return cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, 1, timeout=None)
+        return cache.incr(GENERATION_KEY)
+
+
+def user_generation_key(user_id):
+    return f'jobs:response-cache:user:{user_id}'
+
+
+def get_user_generation(user_id):
+    """Version of a user's own job badges (saved, applied), 0 until they change"""
+    return cache.get(user_generation_key(user_id), 0)
+
+
+def bump_user_generation(user_id):
+    """Invalidate validators of payloads carrying the user's job badges"""
+    key = user_generation_key(user_id)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+        return cache.incr(key)
+
+
+def normalize_params(query_params):
+    """Sorted (name, values) pairs without blank values"""
+    normalized = []
+    for name, values in query_params.lists():
+        values = sorted(value for value in values if value != '')
+        if values:
+            normalized.append((name, values))
+    return sorted(normalized)
+
+
+def make_key(name, request, *parts):
+    """Cache key for a request, independent of query parameter order"""
+    # The host is part of the key because paginated payloads carry absolute links
+    payload = json.dumps(
+        [request.get_host(), [str(part) for part in parts], normalize_params(request.query_params)],
+        separators=(',', ':'),
+    )
+    digest = hashlib.sha1(payload.encode()).hexdigest()
+    return f'jobs:response:{get_generation()}:{name}:{digest}'
+
+
+def load(key):
+    """Cached response data, or None"""
+    return cache.get(key)
+
+
+def store(key, data):
+    cache.set(key, data, settings.JOB_RESPONSE_CACHE_TIMEOUT)
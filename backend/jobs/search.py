@@ -0,0 +1,55 @@
+"""
+Full-text search for job offers
+Backed by the weighted `search_document` tsvector maintained on JobOffer
+"""
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+from rest_framework.filters import BaseFilterBackend
+
+
+# Must match the configurations used by the search document trigger
+SEARCH_CONFIGS = ('french', 'english')
+
+
+def build_search_query(text):
+    """
+    Parse a user query into a tsquery matching either language configuration
+
+    Uses PostgreSQL's websearch syntax:
+        developpeur python       -> both terms
+        "chef de projet"         -> exact phrase
+        python -django           -> negation
+        react or vue             -> alternatives
+    """
+    query = None
+    for config in SEARCH_CONFIGS:
+        language_query = SearchQuery(text, config=config, search_type='websearch')
+        query = language_query if query is None else query | language_query
+    return query
+
+
+class JobOfferFullTextFilter(BaseFilterBackend):
+    """
+    Full-text search exposed as `?q=`
+    Results are ordered by relevance unless an explicit `ordering` is given.
+    Must run after OrderingFilter so the relevance ordering is not overridden.
+    """
+    search_param = 'q'
+
+    def get_search_text(self, request):
+        return request.query_params.get(self.search_param, '').strip()
+
+    def filter_queryset(self, request, queryset, view):
+        text = self.get_search_text(request)
+        if not text:
+            return queryset
+
+        query = build_search_query(text)
+        queryset = queryset.filter(search_document=query).annotate(
+            search_rank=SearchRank(F('search_document'), query)
+        )
+
+        if not request.query_params.get('ordering'):
+            queryset = queryset.order_by('-search_rank', '-published_at')
+        return queryset
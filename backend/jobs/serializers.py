@@ -1,14 +1,51 @@
 """
 Serializers for Jobs app
-Handles serialization of JobOffer and SavedJob models
+Handles serialization of JobOffer, SavedJob and JobAlert models
 """
 
+from django.conf import settings
 from rest_framework import serializers
-from .models import JobOffer, SavedJob
+from . import duplicates
+from .models import JobOffer, SavedJob, PublishedJobCard, JobAlert
 from users.serializers import RecruiterListSerializer
+from core.projection import SparseFieldsetMixin
 
 
-class JobOfferSerializer(serializers.ModelSerializer):
+class CandidateFlagsMixin:
+    """
+    `is_saved` / `has_applied` badges, annotated by the view for candidates
+    Left out of other users' payloads, and of rows not annotated.
+    """
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        if not (user and user.is_authenticated and user.role == 'CANDIDATE'):
+            fields.pop('is_saved', None)
+            fields.pop('has_applied', None)
+        return fields
+
+
+class PipelineCountsMixin:
+    """
+    Per-status application counters, shown to the recruiter owning the job only
+    Kept when there is no instance yet, so `?fields=` projections still load them.
+    """
+    pipeline_count_fields = ('submitted_count', 'shortlisted_count', 'interview_count', 'accepted_count')
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        is_recruiter = user and user.is_authenticated and user.role == 'RECRUITER'
+        if not is_recruiter or (self.instance is not None and self.instance.recruiter_id != user.pk):
+            for name in self.pipeline_count_fields:
+                fields.pop(name, None)
+        return fields
+
+
+class JobOfferSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for JobOffer model"""
     
     recruiter_info = RecruiterListSerializer(source='recruiter', read_only=True)
@@ -45,12 +82,14 @@ class JobOfferSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class JobOfferListSerializer(serializers.ModelSerializer):
+class JobOfferListSerializer(SparseFieldsetMixin, CandidateFlagsMixin, serializers.ModelSerializer):
     """Lightweight serializer for listing job offers"""
     
     company_name = serializers.CharField(source='recruiter.company_name', read_only=True)
     company_logo = serializers.CharField(source='recruiter.company_logo_url', read_only=True)
     is_active = serializers.BooleanField(read_only=True)
+    is_saved = serializers.BooleanField(read_only=True)
+    has_applied = serializers.BooleanField(read_only=True)
     
     class Meta:
         model = JobOffer
@@ -58,29 +97,62 @@ class JobOfferListSerializer(serializers.ModelSerializer):
             'id', 'title', 'company_name', 'company_logo', 'contract_type',
             'location', 'is_remote', 'salary_min', 'salary_max', 'salary_currency',
             'experience_level', 'status', 'published_at', 'expires_at',
-            'views_count', 'applications_count', 'is_active', 'created_at'
+            'views_count', 'applications_count', 'is_active', 'created_at',
+            'is_saved', 'has_applied'
         ]
 
 
-class JobOfferDetailSerializer(serializers.ModelSerializer):
+class RecruiterJobOfferListSerializer(JobOfferListSerializer):
+    """Job list for the owning recruiter, with per-status application counters"""
+    
+    class Meta(JobOfferListSerializer.Meta):
+        fields = JobOfferListSerializer.Meta.fields + [
+            'submitted_count', 'shortlisted_count', 'interview_count', 'accepted_count'
+        ]
+
+
+class PublishedJobCardSerializer(SparseFieldsetMixin, CandidateFlagsMixin, serializers.ModelSerializer):
+    """Serializer for the denormalized public feed, same shape as JobOfferListSerializer"""
+    
+    id = serializers.UUIDField(source='job_offer_id', read_only=True)
+    is_active = serializers.BooleanField(read_only=True)
+    is_saved = serializers.BooleanField(read_only=True)
+    has_applied = serializers.BooleanField(read_only=True)
+    
+    class Meta:
+        model = PublishedJobCard
+        fields = JobOfferListSerializer.Meta.fields
+
+
+class JobOfferDetailSerializer(SparseFieldsetMixin, CandidateFlagsMixin, PipelineCountsMixin, serializers.ModelSerializer):
     """Detailed serializer for JobOffer with full information"""
     
     recruiter_info = RecruiterListSerializer(source='recruiter', read_only=True)
     is_active = serializers.BooleanField(read_only=True)
     days_remaining = serializers.IntegerField(read_only=True)
+    is_saved = serializers.BooleanField(read_only=True)
+    has_applied = serializers.BooleanField(read_only=True)
     
     class Meta:
         model = JobOffer
-        fields = '__all__'
+        exclude = ['search_document', 'simhash', 'simhash_bands']
         read_only_fields = [
             'id', 'recruiter', 'recruiter_info', 'views_count', 'applications_count',
+            'submitted_count', 'shortlisted_count', 'interview_count', 'accepted_count',
             'is_active', 'days_remaining', 'created_at', 'updated_at',
             'published_at', 'closed_at'
         ]
 
 
-class JobOfferCreateSerializer(serializers.ModelSerializer):
-    """Serializer for creating job offers"""
+class JobOfferCreateSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Serializer for creating job offers
+    Near-duplicates of the recruiter's live offers are refused or listed in
+    `duplicates`, per JOB_DUPLICATE_POLICY; pass `check_duplicates: False` in
+    the context to check a batch at once instead.
+    """
+    
+    duplicates = ()
     
     class Meta:
         model = JobOffer
@@ -101,15 +173,33 @@ class JobOfferCreateSerializer(serializers.ModelSerializer):
                 "salary_max": "Maximum salary must be greater than or equal to minimum salary."
             })
         
+        if self.context.get('check_duplicates', True):
+            self.duplicates = self.find_duplicates(attrs)
+        
         return attrs
     
+    def find_duplicates(self, attrs):
+        """Live offers of the requesting recruiter the new one nearly repeats"""
+        request = self.context.get('request')
+        policy = duplicates.get_policy()
+        if policy == 'off' or request is None or request.user.role != 'RECRUITER':
+            return []
+        
+        matches = duplicates.find_duplicates(request.user.pk, JobOffer(**attrs))
+        if matches and policy == 'block':
+            raise serializers.ValidationError({
+                'non_field_errors': ['This job offer nearly repeats one of your current offers.'],
+                'duplicate_of': [match['id'] for match in matches],
+            })
+        return matches
+    
     def create(self, validated_data):
         """Create job offer with recruiter from request"""
         # The recruiter will be set in the view from request.user
         return super().create(validated_data)
 
 
-class SavedJobSerializer(serializers.ModelSerializer):
+class SavedJobSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for SavedJob model"""
     
     job_details = JobOfferListSerializer(source='job_offer', read_only=True)
@@ -128,3 +218,33 @@ class SavedJobSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("You have already saved this job.")
         
         return attrs
+
+
+class JobAlertSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Serializer for JobAlert model"""
+    
+    class Meta:
+        model = JobAlert
+        fields = [
+            'id', 'name', 'skills', 'locations', 'contract_types', 'experience_levels',
+            'criteria_count', 'is_active', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'criteria_count', 'created_at', 'updated_at']
+    
+    def validate(self, attrs):
+        """Require at least one criterion and cap the alerts per candidate"""
+        criteria = ['skills', 'locations', 'contract_types', 'experience_levels']
+        values = {name: attrs.get(name, getattr(self.instance, name, [])) for name in criteria}
+        if not any(value.strip() for values_list in values.values() for value in values_list):
+            raise serializers.ValidationError(
+                "Give at least one skill, location, contract type or experience level."
+            )
+        
+        if self.instance is None:
+            candidate = self.context['request'].user.candidate_profile
+            if JobAlert.objects.filter(candidate=candidate).count() >= settings.JOB_ALERT_MAX_PER_CANDIDATE:
+                raise serializers.ValidationError(
+                    f"You can have at most {settings.JOB_ALERT_MAX_PER_CANDIDATE} job alerts."
+                )
+        
+        return attrs
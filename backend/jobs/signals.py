@@ -0,0 +1,49 @@
+"""
+Signal handlers for Jobs app
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from applications.models import Application
+from core.models import ExchangeRate
+from users.models import Candidate, Recruiter
+from . import recommendations, response_cache, similarity
+from .models import JobOffer, SavedJob
+from .tasks import index_similar_jobs
+
+
+@receiver(post_save, sender=JobOffer)
+@receiver(post_delete, sender=JobOffer)
+@receiver(post_save, sender=Recruiter)
+@receiver(post_save, sender=ExchangeRate)
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_job_responses(sender, **kwargs):
+    """Drop cached job payloads once a job offer, its company, its applications or a salary rate change"""
+    # After commit, so a concurrent request cannot re-cache the old rows
+    transaction.on_commit(response_cache.bump_generation)
+
+
+@receiver(post_save, sender=Candidate)
+def invalidate_recommendations(sender, instance, **kwargs):
+    """A candidate's recommendations are recomputed once their profile changes"""
+    transaction.on_commit(lambda: recommendations.invalidate(instance.pk))
+
+
+@receiver(post_save, sender=JobOffer)
+def queue_similar_jobs_index(sender, instance, update_fields=None, **kwargs):
+    """Queue the similar jobs index update once a job's text or status is saved"""
+    if update_fields is not None and not set(update_fields) & {'status', *similarity.TEXT_COLUMNS}:
+        return
+    transaction.on_commit(lambda: index_similar_jobs.delay([str(instance.pk)]))
+
+
+@receiver(post_save, sender=SavedJob)
+@receiver(post_delete, sender=SavedJob)
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_candidate_badges(sender, instance, **kwargs):
+    """Job payloads showing a candidate's saved and applied badges change with them"""
+    transaction.on_commit(lambda: response_cache.bump_user_generation(instance.candidate_id))
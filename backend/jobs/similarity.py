@@ -0,0 +1,226 @@
+"""
+Similar job offers through MinHash signatures and locality-sensitive hashing
+Neighbor lists are precomputed when jobs are published or edited, never at request time
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from core.geo import normalize_place
+from .models import JobOffer, JobSignature
+
+
+TEXT_COLUMNS = ('title', 'description', 'requirements', 'skills_required')
+
+# The hash family is fixed: signatures stored in the database must stay comparable
+SEED = 20240601
+NUM_PERMUTATIONS = 128
+# 32 bands of 4 rows: pairs above ~0.42 Jaccard similarity very likely share a band
+BAND_ROWS = 4
+
+_random = np.random.default_rng(SEED)
+# Multiply-shift hashing: ((a * x + b) mod 2**64) >> 32 with odd multipliers
+MULTIPLIERS = _random.integers(1, 2 ** 63, NUM_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+INCREMENTS = _random.integers(0, 2 ** 63, NUM_PERMUTATIONS, dtype=np.uint64)
+
+WORD = re.compile(r'\w+')
+
+REBUILD_BATCH_SIZE = 1000  # rows per INSERT
+
+
+def _hash64(data):
+    """Stable signed 64-bit hash of bytes (Python's hash() changes between processes)"""
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big', signed=True)
+
+
+def job_tokens(title, description, requirements, skills):
+    """
+    Shingles of a job's text
+    Word pairs of the title, description and requirements, title words and skills.
+    """
+    tokens = set()
+    title_words = WORD.findall(normalize_place(title or ''))
+    tokens.update(f't:{word}' for word in title_words)
+    for text in (title, description, requirements):
+        words = WORD.findall(normalize_place(text or ''))
+        tokens.update(f'w:{first} {second}' for first, second in zip(words, words[1:]))
+    tokens.update(f's:{normalize_place(skill)}' for skill in skills or ())
+    return tokens
+
+
+def minhash(tokens):
+    """NUM_PERMUTATIONS minimum hash values of the tokens, None without tokens"""
+    if not tokens:
+        return None
+    values = np.array(
+        [int.from_bytes(hashlib.blake2b(token.encode(), digest_size=4).digest(), 'big') for token in tokens],
+        dtype=np.uint64,
+    )
+    with np.errstate(over='ignore'):
+        hashed = (MULTIPLIERS[:, None] * values[None, :] + INCREMENTS[:, None]) >> np.uint64(32)
+    return hashed.min(axis=1).astype(np.int64)
+
+
+def band_hashes(signature):
+    """One hash per LSH band of BAND_ROWS signature values"""
+    bands = signature.reshape(-1, BAND_ROWS)
+    return [_hash64(index.to_bytes(2, 'big') + band.tobytes()) for index, band in enumerate(bands)]
+
+
+def estimated_similarity(signature, signatures):
+    """Estimated Jaccard similarity of one signature with each row of a matrix"""
+    return (signatures == signature).mean(axis=1)
+
+
+def _ranked(pairs):
+    """[[job id, similarity], ...] best first, over the threshold, JOB_SIMILAR_MAX_NEIGHBORS long"""
+    pairs = [
+        [str(job_id), round(float(score), 3)] for job_id, score in pairs
+        if score >= settings.JOB_SIMILAR_MIN_SIMILARITY
+    ]
+    pairs.sort(key=lambda pair: (-pair[1], pair[0]))
+    return pairs[:settings.JOB_SIMILAR_MAX_NEIGHBORS]
+
+
+def _published_signatures(job_ids):
+    """{job id: signature} of the published jobs among job_ids, jobs without text left out"""
+    rows = JobOffer.objects.filter(pk__in=job_ids, status='PUBLISHED').values_list('pk', *TEXT_COLUMNS)
+    signatures = {}
+    for job_id, *text in rows:
+        signature = minhash(job_tokens(*text))
+        if signature is not None:
+            signatures[job_id] = signature
+    return signatures
+
+
+def index_jobs(job_ids):
+    """
+    Bring the similarity index up to date for some job offers, return how many changed
+    Jobs no longer published leave the index and the lists naming them. For
+    each new or changed signature, LSH candidates come from one GIN lookup on
+    the band hashes, the job's neighbor list is rebuilt and the job is added
+    to, moved in or dropped from the lists of the jobs it shares a band with
+    or used to be close to.
+    """
+    job_ids = list(job_ids)
+    signatures = _published_signatures(job_ids)
+    existing = JobSignature.objects.in_bulk(job_ids)
+
+    changed = 0
+    with transaction.atomic():
+        removed = [existing[job_id] for job_id in set(existing) - set(signatures)]
+        if removed:
+            _remove_jobs(removed)
+            changed += len(removed)
+        for job_id, signature in signatures.items():
+            current = existing.get(job_id)
+            if current is not None and current.signature == signature.tolist():
+                continue
+            _index_job(job_id, signature, current)
+            changed += 1
+    return changed
+
+
+def _remove_jobs(removed):
+    """Drop signatures from the index and from the neighbor lists naming them"""
+    removed_keys = {str(row.pk) for row in removed}
+    listed = {neighbor_id for row in removed for neighbor_id, _ in row.neighbors} - removed_keys
+    JobSignature.objects.filter(pk__in=[row.pk for row in removed]).delete()
+
+    rows = list(JobSignature.objects.filter(pk__in=listed))
+    for row in rows:
+        row.neighbors = [pair for pair in row.neighbors if pair[0] not in removed_keys]
+    JobSignature.objects.bulk_update(rows, ['neighbors'])
+
+
+def _index_job(job_id, signature, current):
+    bands = band_hashes(signature)
+    previous = {neighbor_id for neighbor_id, _ in current.neighbors} if current else set()
+    candidates = list(
+        JobSignature.objects.filter(Q(bands__overlap=bands) | Q(pk__in=previous)).exclude(pk=job_id)
+    )
+    if not candidates:
+        JobSignature.objects.update_or_create(
+            job_offer_id=job_id,
+            defaults={'signature': signature.tolist(), 'bands': bands, 'neighbors': []},
+        )
+        return
+
+    matrix = np.array([candidate.signature for candidate in candidates], dtype=np.int64)
+    scores = estimated_similarity(signature, matrix)
+    shares_band = [not set(bands).isdisjoint(candidate.bands) for candidate in candidates]
+
+    JobSignature.objects.update_or_create(
+        job_offer_id=job_id,
+        defaults={
+            'signature': signature.tolist(),
+            'bands': bands,
+            'neighbors': _ranked(
+                (candidate.pk, score) for candidate, score, near in zip(candidates, scores, shares_band) if near
+            ),
+        },
+    )
+
+    job_key = str(job_id)
+    for candidate, score, near in zip(candidates, scores, shares_band):
+        others = [pair for pair in candidate.neighbors if pair[0] != job_key]
+        candidate.neighbors = _ranked(others + ([[job_key, score]] if near else []))
+    JobSignature.objects.bulk_update(candidates, ['neighbors'])
+
+
+def rebuild_index():
+    """
+    Recompute every signature and neighbor list from the published jobs, return the count
+    Candidate pairs come from in-memory LSH buckets and are scored in one pass.
+    """
+    job_ids = list(JobOffer.objects.filter(status='PUBLISHED').values_list('pk', flat=True))
+    signatures = _published_signatures(job_ids)
+    ids = list(signatures)
+    if not ids:
+        JobSignature.objects.all().delete()
+        return 0
+
+    matrix = np.array([signatures[job_id] for job_id in ids], dtype=np.int64)
+    bands = [band_hashes(row) for row in matrix]
+    buckets = defaultdict(list)
+    for index, row_bands in enumerate(bands):
+        for band in row_bands:
+            buckets[band].append(index)
+
+    neighbors = defaultdict(set)
+    for members in buckets.values():
+        for index in members:
+            neighbors[index].update(members)
+
+    rows = []
+    for index, job_id in enumerate(ids):
+        others = sorted(neighbors[index] - {index})
+        scores = estimated_similarity(matrix[index], matrix[others]) if others else []
+        rows.append(JobSignature(
+            job_offer_id=job_id,
+            signature=matrix[index].tolist(),
+            bands=bands[index],
+            neighbors=_ranked((ids[other], score) for other, score in zip(others, scores)),
+        ))
+
+    with transaction.atomic():
+        JobSignature.objects.exclude(pk__in=ids).delete()
+        JobSignature.objects.bulk_create(
+            rows,
+            batch_size=REBUILD_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['job_offer'],
+            update_fields=['signature', 'bands', 'neighbors', 'updated_at'],
+        )
+    return len(rows)
+
+
+def get_neighbors(job_id):
+    """Precomputed [[job id, similarity], ...] of a job, None when it is not indexed"""
+    return JobSignature.objects.filter(pk=job_id).values_list('neighbors', flat=True).first()
@@ -0,0 +1,101 @@
+"""
+Autocomplete and "did you mean" suggestions for the job board
+Backed by pg_trgm GIN indexes on job titles, locations and company names
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.core.cache import cache
+from django.db.models import Case, Exists, F, IntegerField, Max, OuterRef, Q, Value, When
+
+from users.models import Recruiter
+from .models import JobOffer
+
+
+SUGGEST_FIELDS = ('title', 'location', 'company')
+
+
+def normalize_prefix(text):
+    """Normalize user input so equivalent prefixes share a cache entry"""
+    return ' '.join(text.split()).casefold()
+
+
+def _suggest_source(field):
+    """Return (queryset, column) for a suggestion field"""
+    published_jobs = JobOffer.objects.filter(status='PUBLISHED')
+    if field == 'company':
+        queryset = Recruiter.objects.filter(
+            Exists(published_jobs.filter(recruiter=OuterRef('pk')))
+        )
+        return queryset, 'company_name'
+    return published_jobs, field
+
+
+def _complete(field, prefix, limit):
+    """
+    Prefix matches first, then fuzzy matches ranked by word similarity
+    Both predicates (ILIKE through `iprefix`, and %>) use the trigram indexes.
+    """
+    queryset, column = _suggest_source(field)
+    matches = queryset.filter(
+        Q(**{f'{column}__iprefix': prefix}) |
+        Q(**{f'{column}__trigram_word_similar': prefix})
+    )
+    rows = (
+        matches.order_by()
+        .values(value=F(column))
+        .annotate(
+            is_prefix=Max(Case(
+                When(**{f'{column}__iprefix': prefix}, then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )),
+            similarity=Max(TrigramWordSimilarity(prefix, column)),
+        )
+        .order_by('-is_prefix', '-similarity', 'value')[:limit]
+    )
+    return [row['value'] for row in rows if row['value']]
+
+
+def get_suggestions(prefix, fields=SUGGEST_FIELDS, limit=None):
+    """
+    Return top-N completions per field for a prefix
+    Results are cached briefly so hot prefixes never reach the database.
+    """
+    limit = limit or settings.JOB_SUGGEST_DEFAULT_LIMIT
+    prefix = normalize_prefix(prefix)
+    digest = hashlib.sha1(prefix.encode()).hexdigest()
+
+    suggestions = {}
+    for field in fields:
+        key = f'jobs:suggest:{field}:{limit}:{digest}'
+        values = cache.get(key)
+        if values is None:
+            values = _complete(field, prefix, limit)
+            cache.set(key, values, settings.JOB_SUGGEST_CACHE_TIMEOUT)
+        suggestions[field] = values
+    return suggestions
+
+
+def did_you_mean(text):
+    """Closest published job title to a search that returned no hits"""
+    text = normalize_prefix(text)
+    if not text:
+        return None
+
+    key = 'jobs:did-you-mean:' + hashlib.sha1(text.encode()).hexdigest()
+    suggestion = cache.get(key)
+    if suggestion is None:
+        match = (
+            JobOffer.objects.filter(status='PUBLISHED', title__trigram_similar=text)
+            .annotate(similarity=TrigramWordSimilarity(text, 'title'))
+            .order_by('-similarity')
+            .values_list('title', flat=True)
+            .first()
+        )
+        # Cache misses too, as an empty string
+        suggestion = match or ''
+        cache.set(key, suggestion, settings.JOB_SUGGEST_CACHE_TIMEOUT)
+    return suggestion or None
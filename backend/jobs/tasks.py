@@ -0,0 +1,54 @@
+"""
+Celery tasks for Jobs app
+"""
+
+from celery import shared_task
+
+from . import alerts, recommendations, response_cache, similarity
+from .counters import flush_pending_views
+from .models import JobOffer
+
+
+@shared_task
+def flush_job_views():
+    """Write job views buffered in Redis to the database"""
+    flushed = flush_pending_views()
+    return f"Flushed {flushed} job views"
+
+
+@shared_task
+def close_expired_jobs():
+    """Close every published job past its expiry date"""
+    closed = JobOffer.objects.close_expired()
+    if closed:
+        # QuerySet.update() sends no post_save: drop cached job payloads here
+        response_cache.bump_generation()
+    return f"Closed {closed} expired job offers"
+
+
+@shared_task
+def refresh_job_recommendations():
+    """Score every available candidate against the active jobs and cache their best matches"""
+    refreshed = recommendations.refresh_recommendations()
+    return f"Refreshed job recommendations of {refreshed} candidates"
+
+
+@shared_task
+def index_similar_jobs(job_offer_ids):
+    """Update the similar jobs index for job offers just published, edited or closed"""
+    changed = similarity.index_jobs(job_offer_ids)
+    return f"Reindexed {changed} job offers"
+
+
+@shared_task
+def rebuild_similar_jobs():
+    """Recompute every job signature and neighbor list"""
+    indexed = similarity.rebuild_index()
+    return f"Indexed {indexed} job offers"
+
+
+@shared_task
+def notify_job_alerts(job_offer_id):
+    """Notify the candidates whose job alerts match a newly published job"""
+    notified = alerts.notify_matches(job_offer_id)
+    return f"Notified {notified} candidates"
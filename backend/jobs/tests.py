@@ -1,3 +1,1304 @@
-from django.test import TestCase
+"""
+Query budget tests for the Jobs API
+"""
 
-# Create your tests here.
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from redis.exceptions import RedisError
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.testing import (
+    QueryBudgetTestCase, make_candidate, make_recruiter, make_admin, make_job, make_application,
+)
+from core import simhash
+from core.models import ExchangeRate
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+from core.salaries import clear_rates_cache
+from jobs.counters import flush_pending_views, get_pending_views
+from jobs import alerts, recommendations, similarity
+from jobs.models import JobAlert, JobOffer, JobViewFlush, PublishedJobCard, SavedJob
+from jobs.tasks import close_expired_jobs
+from notifications.models import Notification
+from users.models import Recruiter
+
+
+class JobOfferQueryBudgetTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.candidate = make_candidate()
+        self.job = make_job(self.recruiter)
+        self.draft = make_job(self.recruiter, status='DRAFT')
+
+    def add_jobs(self, n=5):
+        for _ in range(n):
+            make_job(make_recruiter())
+            make_job(self.recruiter)
+
+    def test_anonymous_list(self):
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/jobs/?page_size=100'), grow=self.add_jobs)
+
+    def test_anonymous_list_cursor(self):
+        self.assertQueryBudget(1, lambda: self.client.get('/api/v1/jobs/?pagination=cursor'), grow=self.add_jobs)
+
+    def test_candidate_list(self):
+        self.client.force_authenticate(self.candidate.id)
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/jobs/?page_size=100'), grow=self.add_jobs)
+
+    def test_candidate_search(self):
+        self.client.force_authenticate(self.candidate.id)
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/jobs/?q=python&page_size=100'), grow=self.add_jobs)
+
+    def test_recruiter_list(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/jobs/?page_size=100'), grow=self.add_jobs)
+
+    def test_admin_list(self):
+        self.client.force_authenticate(make_admin().id)
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/jobs/?page_size=100'), grow=self.add_jobs)
+
+    def test_retrieve(self):
+        self.client.force_authenticate(self.candidate.id)
+        self.assertQueryBudget(2, lambda: self.client.get(f'/api/v1/jobs/{self.job.pk}/'))
+
+    def test_create(self):
+        self.client.force_authenticate(self.recruiter.id)
+        payload = {
+            'title': 'Data Engineer',
+            'description': 'Pipelines',
+            'contract_type': 'CDI',
+            'skills_required': ['Python', 'SQL'],
+        }
+        # INSERT, plus the near-duplicate lookup
+        self.assertQueryBudget(2, lambda: self.client.post('/api/v1/jobs/', payload, format='json'))
+
+    def test_partial_update(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertQueryBudget(2, lambda: self.client.patch(
+            f'/api/v1/jobs/{self.job.pk}/', {'title': 'Senior Python Developer'}, format='json'
+        ))
+
+    def test_publish(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertQueryBudget(2, lambda: self.client.post(f'/api/v1/jobs/{self.draft.pk}/publish/'))
+
+    def test_close(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertQueryBudget(2, lambda: self.client.post(f'/api/v1/jobs/{self.job.pk}/close/'))
+
+    def test_destroy(self):
+        self.client.force_authenticate(self.recruiter.id)
+        # The cascade reaches saved jobs, applications, the job card and the similarity signature
+        self.assertQueryBudget(6, lambda: self.client.delete(f'/api/v1/jobs/{self.job.pk}/'))
+
+    def test_my_jobs(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/jobs/my_jobs/?page_size=100'), grow=self.add_jobs)
+
+    def test_suggest(self):
+        self.assertQueryBudget(3, lambda: self.client.get('/api/v1/jobs/suggest/?q=Dév'), grow=self.add_jobs)
+
+
+class JobSuggestTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        recruiter = make_recruiter(company_name='Dakar Digital')
+        make_job(recruiter, title='Python Developer', location='Dakar, Sénégal')
+        make_job(recruiter, title='Data Engineer', location='Abidjan, Côte d\'Ivoire')
+        make_job(recruiter, title='Developer Advocate', location='Dakar, Sénégal')
+        make_job(recruiter, title='Devops Engineer', status='DRAFT')
+
+    def suggest(self, query):
+        response = self.client.get(f'/api/v1/jobs/suggest/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_prefix_matches_of_published_jobs(self):
+        data = self.suggest('q=DEV')
+        self.assertEqual(data['query'], 'DEV')
+        # The prefix match ranks before the fuzzy one, drafts are left out
+        self.assertEqual(data['suggestions'], {
+            'title': ['Developer Advocate', 'Python Developer'], 'location': [], 'company': [],
+        })
+        self.assertNotIn('did_you_mean', data)
+
+    def test_fields(self):
+        self.assertEqual(self.suggest('q=dak&field=location')['suggestions'], {'location': ['Dakar, Sénégal']})
+        self.assertEqual(self.suggest('q=dakar d&field=company')['suggestions'], {'company': ['Dakar Digital']})
+
+    def test_like_wildcards_are_literal(self):
+        self.assertEqual(self.suggest('q=%25%25&field=title')['suggestions'], {'title': []})
+        self.assertEqual(self.suggest('q=d_ta&field=title')['suggestions'], {'title': []})
+
+    def test_did_you_mean(self):
+        data = self.suggest('q=pyhton develper&field=location')
+        self.assertEqual(data['did_you_mean'], 'Python Developer')
+        self.assertIsNone(self.suggest('q=zzzz')['did_you_mean'])
+
+        response = self.client.get('/api/v1/jobs/?q=pyhton develper')
+        self.assertEqual(response.data['results'], [])
+        self.assertEqual(response.data['did_you_mean'], 'Python Developer')
+
+
+class SavedJobQueryBudgetTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.candidate = make_candidate()
+        self.recruiter = make_recruiter()
+        self.client.force_authenticate(self.candidate.id)
+
+    def save_jobs(self, n=5):
+        for _ in range(n):
+            SavedJob.objects.create(candidate=self.candidate, job_offer=make_job(make_recruiter()))
+
+    def test_list(self):
+        self.save_jobs(1)
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/saved-jobs/?page_size=100'), grow=self.save_jobs)
+
+    def test_create(self):
+        job = make_job(self.recruiter)
+        self.assertQueryBudget(4, lambda: self.client.post(
+            '/api/v1/saved-jobs/', {'job_offer': str(job.pk)}, format='json'
+        ))
+
+    def test_destroy(self):
+        saved = SavedJob.objects.create(candidate=self.candidate, job_offer=make_job(self.recruiter))
+        self.assertQueryBudget(2, lambda: self.client.delete(f'/api/v1/saved-jobs/{saved.pk}/'))
+
+
+class JobViewCounterTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.job = make_job(self.recruiter, views_count=10)
+        self.client.force_authenticate(make_candidate().id)
+
+    def test_views_are_buffered_until_flushed(self):
+        for _ in range(2):
+            self.client.get(f'/api/v1/jobs/{self.job.pk}/')
+
+        self.assertEqual(get_pending_views([self.job.pk]), {str(self.job.pk): 2})
+        self.assertEqual(JobOffer.objects.get(pk=self.job.pk).views_count, 10)
+        response = self.client.get('/api/v1/jobs/')
+        self.assertEqual(response.data['results'][0]['views_count'], 12)
+
+        self.assertEqual(flush_pending_views(), 2)
+        self.assertEqual(JobOffer.objects.get(pk=self.job.pk).views_count, 12)
+        self.assertEqual(PublishedJobCard.objects.get(pk=self.job.pk).views_count, 12)
+        self.assertEqual(get_pending_views([self.job.pk]), {})
+        self.assertEqual(flush_pending_views(), 0)
+
+    def test_flush_retried_after_commit_counts_once(self):
+        for _ in range(3):
+            self.client.get(f'/api/v1/jobs/{self.job.pk}/')
+
+        # The worker dies after committing, before dropping the flushing hash
+        with patch('jobs.counters._drop_batch', side_effect=RedisError):
+            with self.assertRaises(RedisError):
+                flush_pending_views()
+        self.assertEqual(JobOffer.objects.get(pk=self.job.pk).views_count, 13)
+
+        self.client.get(f'/api/v1/jobs/{self.job.pk}/')
+        self.assertEqual(flush_pending_views(), 0)
+        self.assertEqual(JobOffer.objects.get(pk=self.job.pk).views_count, 13)
+        self.assertEqual(flush_pending_views(), 1)
+        self.assertEqual(JobOffer.objects.get(pk=self.job.pk).views_count, 14)
+        self.assertEqual(JobViewFlush.objects.count(), 2)
+
+    def test_saves_keep_counters_written_meanwhile(self):
+        job = JobOffer.objects.get(pk=self.job.pk)
+        draft = JobOffer.objects.get(pk=make_job(self.recruiter, status='DRAFT').pk)
+        self.client.get(f'/api/v1/jobs/{self.job.pk}/')
+        flush_pending_views()
+        make_application(make_candidate(), self.job)
+        JobOffer.objects.filter(pk=draft.pk).update(views_count=5)
+
+        job.title = 'Lead Developer'
+        job.save()
+        job.close()
+        draft.publish()
+
+        job.refresh_from_db()
+        self.assertEqual((job.title, job.status), ('Lead Developer', 'CLOSED'))
+        self.assertEqual((job.views_count, job.applications_count, job.submitted_count), (11, 1, 1))
+        self.assertEqual(JobOffer.objects.get(pk=draft.pk).views_count, 5)
+
+    def test_owner_views_are_not_counted(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.client.get(f'/api/v1/jobs/{self.job.pk}/')
+        self.assertEqual(get_pending_views([self.job.pk]), {})
+
+
+class JobResponseCacheTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.job = make_job(self.recruiter)
+        self.draft = make_job(self.recruiter, status='DRAFT')
+
+    def list_titles(self):
+        response = self.client.get('/api/v1/jobs/')
+        return {job['title'] for job in response.data['results']}
+
+    def test_anonymous_list_is_cached(self):
+        url = '/api/v1/jobs/?contract_type=CDI&ordering=-published_at'
+        self.assertQueryBudget(2, lambda: self.client.get(url))
+        self.assertQueryBudget(0, lambda: self.client.get(url))
+        # Same parameters in another order hit the same entry
+        self.assertQueryBudget(0, lambda: self.client.get('/api/v1/jobs/?ordering=-published_at&contract_type=CDI'))
+
+    def test_authenticated_list_is_not_cached(self):
+        self.client.force_authenticate(make_candidate().id)
+        self.client.get('/api/v1/jobs/')
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/jobs/'))
+
+    def test_retrieve_is_cached_and_still_counts_views(self):
+        self.client.force_authenticate(make_candidate().id)
+        url = f'/api/v1/jobs/{self.job.pk}/'
+        self.assertQueryBudget(2, lambda: self.client.get(url))
+        self.assertQueryBudget(1, lambda: self.client.get(url))
+        self.assertEqual(get_pending_views([self.job.pk]), {str(self.job.pk): 2})
+
+    def test_drafts_are_not_cached(self):
+        self.client.force_authenticate(self.recruiter.id)
+        url = f'/api/v1/jobs/{self.draft.pk}/'
+        self.client.get(url)
+        self.assertQueryBudget(2, lambda: self.client.get(url))
+
+    def test_writes_invalidate_cached_responses(self):
+        self.assertNotIn(self.draft.title, self.list_titles())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.draft.publish()
+        self.assertIn(self.draft.title, self.list_titles())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.draft.close()
+        self.assertNotIn(self.draft.title, self.list_titles())
+
+    def test_updates_invalidate_cached_detail(self):
+        url = f'/api/v1/jobs/{self.job.pk}/'
+        candidate = make_candidate()
+        self.client.force_authenticate(candidate.id)
+        self.client.get(url)
+
+        self.client.force_authenticate(self.recruiter.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url, {'title': 'Lead Developer'}, format='json')
+
+        self.client.force_authenticate(candidate.id)
+        self.assertEqual(self.client.get(url).data['title'], 'Lead Developer')
+
+    def test_pipeline_counts_are_for_the_owner_only(self):
+        url = f'/api/v1/jobs/{self.job.pk}/'
+        make_application(make_candidate(), self.job)
+        counts = ('submitted_count', 'shortlisted_count', 'interview_count', 'accepted_count')
+
+        self.client.force_authenticate(self.recruiter.id)
+        data = self.client.get(url).data
+        self.assertEqual(data['submitted_count'], 1)
+        self.assertEqual(self.client.get(url).data['submitted_count'], 1)
+
+        for user in (make_candidate().id, make_recruiter().id, make_admin().id):
+            self.client.force_authenticate(user)
+            data = self.client.get(url).data
+            self.assertEqual(data['id'], str(self.job.pk))
+            for name in counts:
+                self.assertNotIn(name, data)
+
+        # The owner's payload is never cached: new applications show up at once
+        make_application(make_candidate(), self.job)
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertEqual(self.client.get(url).data['submitted_count'], 2)
+
+
+class JobConditionalGetTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.job = make_job(self.recruiter)
+        self.candidate = make_candidate()
+
+    def test_retrieve_not_modified(self):
+        self.client.force_authenticate(self.candidate.id)
+        url = f'/api/v1/jobs/{self.job.pk}/'
+        response = self.client.get(url)
+        self.assertIn('Last-Modified', response)
+
+        self.assertQueryBudget(1, lambda: self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304)
+        # Revalidations are still views
+        self.assertEqual(get_pending_views([self.job.pk]), {str(self.job.pk): 4})
+
+        self.job.title = 'Lead Developer'
+        self.job.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_list_not_modified(self):
+        self.client.force_authenticate(self.recruiter.id)
+        url = '/api/v1/jobs/?status=PUBLISHED'
+        etag = self.client.get(url)['ETag']
+        self.assertQueryBudget(1, lambda: self.client.get(url, HTTP_IF_NONE_MATCH=etag))
+
+        make_job(self.recruiter)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_anonymous_list_validator_needs_no_query(self):
+        etag = self.client.get('/api/v1/jobs/')['ETag']
+        self.assertQueryBudget(0, lambda: self.client.get('/api/v1/jobs/', HTTP_IF_NONE_MATCH=etag))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_job(self.recruiter)
+        self.assertEqual(self.client.get('/api/v1/jobs/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_flushed_views_change_validators(self):
+        self.client.force_authenticate(self.candidate.id)
+        url = f'/api/v1/jobs/{self.job.pk}/'
+        etag = self.client.get(url)['ETag']
+        flush_pending_views()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['views_count'], 1)
+
+    def test_application_counters_change_validators(self):
+        self.client.force_authenticate(self.recruiter.id)
+        url = f'/api/v1/jobs/{self.job.pk}/'
+        list_url = '/api/v1/jobs/?status=PUBLISHED'
+        etag, list_etag = self.client.get(url)['ETag'], self.client.get(list_url)['ETag']
+        make_application(self.candidate, self.job)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['submitted_count'], 1)
+        self.assertEqual(self.client.get(list_url, HTTP_IF_NONE_MATCH=list_etag).status_code, 200)
+
+    def age(self, **changes):
+        """Move the job and its recruiter's timestamps back, as if the clock had moved on"""
+        long_ago = timezone.now() - timedelta(days=10)
+        Recruiter.objects.filter(pk=self.recruiter.pk).update(updated_at=long_ago)
+        JobOffer.objects.filter(pk=self.job.pk).update(updated_at=long_ago, **changes)
+
+    def test_expiry_changes_validators(self):
+        self.age(expires_at=timezone.now() + timedelta(days=1))
+        self.client.force_authenticate(self.recruiter.id)
+        url = '/api/v1/jobs/?status=PUBLISHED'
+        etag = self.client.get(url)['ETag']
+        # No write to the job, only its expiry date passing
+        JobOffer.objects.filter(pk=self.job.pk).update(expires_at=timezone.now() - timedelta(hours=1))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data['results'][0]['is_active'])
+
+    def test_closing_expired_jobs_changes_card_validators(self):
+        url = '/api/v1/jobs/'
+        etag = self.client.get(url)['ETag']
+        JobOffer.objects.filter(pk=self.job.pk).update(expires_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # Cards are revalidated from the generation, bumped when the expired jobs get closed
+        close_expired_jobs()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_days_remaining_moves_last_modified(self):
+        expires_at = timezone.now() + timedelta(days=2, hours=5)
+        self.age(expires_at=expires_at)
+        self.client.force_authenticate(self.candidate.id)
+        response = self.client.get(f'/api/v1/jobs/{self.job.pk}/')
+        self.assertEqual(response.data['days_remaining'], 2)
+        # The detail last changed when its days left went down to 2
+        self.assertEqual(response['Last-Modified'], http_date((expires_at - timedelta(days=3)).timestamp()))
+
+    def test_etag_is_per_user(self):
+        url = f'/api/v1/jobs/{self.job.pk}/'
+        self.client.force_authenticate(self.candidate.id)
+        etag = self.client.get(url)['ETag']
+        self.client.force_authenticate(make_candidate().id)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class JobKeysetPaginationTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        for _ in range(3):
+            make_job(self.recruiter)
+        # Jobs published in the same instant are only told apart by their pk
+        timestamp = timezone.now()
+        for _ in range(4):
+            make_job(self.recruiter, published_at=timestamp)
+        JobOffer.objects.filter(published_at=timestamp).update(created_at=timestamp)
+
+    def follow(self, url):
+        ids = []
+        pages = 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [job['id'] for job in response.data['results']]
+            url = response.data['next']
+            pages += 1
+        return ids, pages
+
+    def expected_ids(self):
+        jobs = JobOffer.objects.filter(status='PUBLISHED').order_by('-published_at', '-created_at', 'pk')
+        return [str(pk) for pk in jobs.values_list('pk', flat=True)]
+
+    def test_next_chain_visits_every_job_once(self):
+        for user in (None, self.recruiter.id, make_candidate().id):
+            self.client.force_authenticate(user)
+            ids, pages = self.follow('/api/v1/jobs/?pagination=cursor&page_size=2&status=PUBLISHED')
+            self.assertEqual(pages, 4)
+            self.assertEqual(ids, self.expected_ids())
+
+    def test_cursor_ordering_is_accepted(self):
+        ids, _ = self.follow('/api/v1/jobs/?pagination=cursor&page_size=2&ordering=-published_at')
+        self.assertEqual(ids, self.expected_ids())
+
+    def test_other_orderings_are_rejected(self):
+        self.client.force_authenticate(self.recruiter.id)
+        for query in ('ordering=salary_min', 'ordering=published_at', 'q=python'):
+            response = self.client.get(f'/api/v1/jobs/?pagination=cursor&{query}')
+            self.assertEqual(response.status_code, 400, query)
+            self.assertIn('ordering', response.data)
+        self.assertEqual(self.client.get('/api/v1/jobs/?ordering=salary_min').status_code, 200)
+
+
+class JobFacetTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        recruiter = make_recruiter()
+        make_job(recruiter, contract_type='CDI', is_remote=True, location='Dakar, Sénégal')
+        make_job(recruiter, contract_type='CDI', is_remote=False, location='Abidjan, Côte d\'Ivoire')
+        make_job(recruiter, contract_type='CDD', is_remote=True, location='Dakar, Sénégal')
+        make_job(recruiter, contract_type='CDD', status='DRAFT')
+
+    def facet(self, data, name):
+        return {item['value']: item['count'] for item in data['facets'][name]}
+
+    def test_counts_every_facet_in_one_query(self):
+        self.client.force_authenticate(make_candidate().id)
+        self.assertQueryBudget(1, lambda: self.client.get('/api/v1/jobs/facets/'))
+        data = self.client.get('/api/v1/jobs/facets/').data
+
+        self.assertEqual(data['total'], 3)
+        self.assertEqual(self.facet(data, 'contract_type'), {'CDI': 2, 'CDD': 1})
+        self.assertEqual(self.facet(data, 'is_remote'), {True: 2, False: 1})
+        self.assertEqual(self.facet(data, 'location'), {'Dakar, Sénégal': 2, 'Abidjan, Côte d\'Ivoire': 1})
+
+    def test_facets_exclude_their_own_filter(self):
+        data = self.client.get('/api/v1/jobs/facets/?contract_type=CDI&is_remote=true').data
+
+        self.assertEqual(data['total'], 1)
+        # Switching contract type keeps is_remote=true, and the other way round
+        self.assertEqual(self.facet(data, 'contract_type'), {'CDI': 1, 'CDD': 1})
+        self.assertEqual(self.facet(data, 'is_remote'), {True: 1, False: 1})
+        self.assertEqual(self.facet(data, 'location'), {'Dakar, Sénégal': 1})
+
+    def test_facets_follow_search(self):
+        data = self.client.get('/api/v1/jobs/facets/?q=python&location=Dakar, Sénégal').data
+        self.assertEqual(data['total'], 2)
+        self.assertEqual(self.client.get('/api/v1/jobs/facets/?q=cobol').data['total'], 0)
+
+    def test_facets_are_cached(self):
+        self.client.get('/api/v1/jobs/facets/?contract_type=CDI')
+        self.assertQueryBudget(0, lambda: self.client.get('/api/v1/jobs/facets/?contract_type=CDI'))
+
+
+class JobSkillsFilterTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        recruiter = make_recruiter()
+        self.python = make_job(recruiter, skills_required=['Python', 'Django'])
+        self.react = make_job(recruiter, skills_required=['React', 'TypeScript'])
+        self.fullstack = make_job(recruiter, skills_required=['Python', 'React'])
+
+    def ids(self, response):
+        return {item['id'] for item in response.data['results']}
+
+    def test_skills_any(self):
+        response = self.client.get('/api/v1/jobs/?skills_any=Django,TypeScript')
+        self.assertEqual(self.ids(response), {str(self.python.pk), str(self.react.pk)})
+
+    def test_skills_all(self):
+        response = self.client.get('/api/v1/jobs/?skills_all=Python,React')
+        self.assertEqual(self.ids(response), {str(self.fullstack.pk)})
+
+    def test_repeated_parameters(self):
+        response = self.client.get('/api/v1/jobs/?skills_all=Python&skills_all=React')
+        self.assertEqual(self.ids(response), {str(self.fullstack.pk)})
+
+    def test_skills_facets(self):
+        data = self.client.get('/api/v1/jobs/facets/?skills_any=Python').data
+        self.assertEqual(data['total'], 2)
+
+    def test_list_budget(self):
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/jobs/?skills_any=Python'))
+
+
+class JobRadiusSearchTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        recruiter = make_recruiter()
+        self.dakar = make_job(recruiter, location='Dakar, Sénégal')
+        self.rufisque = make_job(recruiter, location='Hybride - Rufisque')
+        self.thies = make_job(recruiter, location='Thies')
+        self.abidjan = make_job(recruiter, location="Abidjan (Cocody), Côte d'Ivoire")
+        self.remote = make_job(recruiter, location='Remote')
+
+    def ids(self, response):
+        return {item['id'] for item in response.data['results']}
+
+    def test_locations_resolved_on_save(self):
+        self.assertAlmostEqual(self.thies.latitude, 14.791)
+        self.assertAlmostEqual(self.abidjan.longitude, -4.0083)
+        self.assertIsNone(self.remote.latitude)
+
+        self.remote.location = 'Lomé, Togo'
+        self.remote.save(update_fields=['location'])
+        self.remote.refresh_from_db()
+        self.assertAlmostEqual(self.remote.latitude, 6.1375)
+
+    def test_near(self):
+        response = self.client.get('/api/v1/jobs/?near=Dakar&radius_km=30')
+        self.assertEqual(self.ids(response), {str(self.dakar.pk), str(self.rufisque.pk)})
+
+        response = self.client.get('/api/v1/jobs/?near=dakar&radius_km=100')
+        self.assertEqual(self.ids(response), {str(self.dakar.pk), str(self.rufisque.pk), str(self.thies.pk)})
+
+    def test_unknown_location(self):
+        response = self.client.get('/api/v1/jobs/?near=Atlantis')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('near', response.data)
+
+    def test_list_budget(self):
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/jobs/?near=Dakar'))
+
+
+class JobSalaryFilterTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        recruiter = make_recruiter()
+        # 600k XOF a month, 12k EUR a year, 2.5k XOF an hour
+        self.monthly = make_job(recruiter, salary_min=Decimal('600000'), salary_max=None)
+        self.euros = make_job(
+            recruiter, salary_min=Decimal('12000'), salary_max=Decimal('15000'),
+            salary_currency='EUR', salary_period='YEARLY',
+        )
+        self.hourly = make_job(
+            recruiter, salary_min=Decimal('2500'), salary_max=Decimal('3000'), salary_period='HOURLY',
+        )
+
+    def ids(self, response):
+        return [item['id'] for item in response.data['results']]
+
+    def test_yearly_xof_columns(self):
+        self.assertEqual((self.monthly.salary_min_yearly_xof, self.monthly.salary_max_yearly_xof), (7200000, 7200000))
+        self.assertEqual(self.euros.salary_min_yearly_xof, 7871484)
+        self.assertEqual(self.hourly.salary_max_yearly_xof, 6240000)
+
+    def test_salary_bounds(self):
+        response = self.client.get('/api/v1/jobs/?salary_gte=7000000')
+        self.assertCountEqual(self.ids(response), [str(self.monthly.pk), str(self.euros.pk)])
+
+        response = self.client.get('/api/v1/jobs/?salary_gte=7000000&salary_lte=7500000')
+        self.assertEqual(self.ids(response), [str(self.monthly.pk)])
+
+    def test_salary_ordering(self):
+        response = self.client.get('/api/v1/jobs/?ordering=-salary_min')
+        self.assertEqual(self.ids(response), [str(self.euros.pk), str(self.monthly.pk), str(self.hourly.pk)])
+
+    def test_rate_change_renormalizes(self):
+        # The rolled back rate must not stay in this process's cache
+        self.addCleanup(clear_rates_cache)
+        rate = ExchangeRate.objects.get(currency='EUR')
+        rate.rate_to_xof = Decimal('700')
+        rate.save()
+        self.euros.refresh_from_db()
+        self.assertEqual(self.euros.salary_max_yearly_xof, 10500000)
+
+
+class JobExpiryTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.open = make_job(self.recruiter)
+        self.forever = make_job(self.recruiter, expires_at=None)
+        self.expired = make_job(self.recruiter, expires_at=timezone.now() - timedelta(days=2))
+        self.client.force_authenticate(make_candidate().id)
+
+    def test_activity_annotations(self):
+        jobs = {job.pk: job for job in JobOffer.objects.with_activity()}
+        self.assertEqual(jobs[self.open.pk].days_remaining, 29)
+        self.assertIsNone(jobs[self.forever.pk].days_remaining)
+        self.assertEqual(jobs[self.expired.pk].days_remaining, 0)
+        self.assertFalse(jobs[self.expired.pk].is_active)
+        self.assertCountEqual(JobOffer.objects.active(), [self.open, self.forever])
+
+    def test_is_active_filter(self):
+        response = self.client.get('/api/v1/jobs/?is_active=true&q=python')
+        self.assertCountEqual(
+            [item['id'] for item in response.data['results']], [str(self.open.pk), str(self.forever.pk)]
+        )
+        self.assertTrue(all(item['is_active'] for item in response.data['results']))
+
+        response = self.client.get('/api/v1/jobs/?is_active=false')
+        self.assertEqual([item['id'] for item in response.data['results']], [str(self.expired.pk)])
+
+    def test_close_expired_jobs(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(JobOffer.objects.close_expired(), 1)
+
+        self.expired.refresh_from_db()
+        self.assertEqual(self.expired.status, 'CLOSED')
+        self.assertIsNotNone(self.expired.closed_at)
+        self.assertFalse(PublishedJobCard.objects.filter(pk=self.expired.pk).exists())
+        self.assertEqual(JobOffer.objects.filter(status='CLOSED').count(), 1)
+
+    def test_card_activity_is_read_time(self):
+        # As if expires_at had just passed, with no write to the job since
+        PublishedJobCard.objects.filter(pk=self.open.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+        cards = {card.pk: card for card in PublishedJobCard.objects.with_activity()}
+        self.assertFalse(cards[self.open.pk].is_active)
+        self.assertTrue(cards[self.forever.pk].is_active)
+        self.assertFalse(PublishedJobCard.objects.get(pk=self.expired.pk).is_active)
+
+        response = self.client.get('/api/v1/jobs/')
+        activity = {item['id']: item['is_active'] for item in response.data['results']}
+        self.assertEqual(activity, {
+            str(self.open.pk): False, str(self.forever.pk): True, str(self.expired.pk): False,
+        })
+
+
+class PublishedJobCardTriggerTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter(company_name='Dakar Digital', company_logo_url='https://example.com/a.png')
+
+    def card(self, job):
+        return PublishedJobCard.objects.filter(pk=job.pk).first()
+
+    def test_insert(self):
+        job = make_job(self.recruiter, title='Python Developer', views_count=3)
+        card = self.card(job)
+        self.assertEqual(card.title, 'Python Developer')
+        self.assertEqual(card.company_name, 'Dakar Digital')
+        self.assertEqual(card.company_logo, 'https://example.com/a.png')
+        self.assertEqual(card.views_count, 3)
+        self.assertEqual(card.published_at, job.published_at)
+        self.assertIsNone(self.card(make_job(self.recruiter, status='DRAFT')))
+
+    def test_update(self):
+        job = make_job(self.recruiter)
+        job.title = 'Lead Developer'
+        job.salary_max = Decimal('1200000')
+        job.save()
+        card = self.card(job)
+        self.assertEqual(card.title, 'Lead Developer')
+        self.assertEqual(card.salary_max, Decimal('1200000'))
+
+        draft = make_job(self.recruiter, status='DRAFT')
+        draft.publish()
+        self.assertEqual(self.card(draft).title, draft.title)
+
+    def test_unpublish_and_delete(self):
+        closed, deleted = make_job(self.recruiter), make_job(self.recruiter)
+        closed.close()
+        self.assertIsNone(self.card(closed))
+        JobOffer.objects.filter(pk=deleted.pk).delete()
+        self.assertIsNone(self.card(deleted))
+
+    def test_recruiter_rename(self):
+        jobs = [make_job(self.recruiter), make_job(self.recruiter)]
+        other = make_job(make_recruiter())
+        self.recruiter.company_name = 'Sahel Digital'
+        self.recruiter.company_logo_url = None
+        self.recruiter.save()
+        for job in jobs:
+            card = self.card(job)
+            self.assertEqual(card.company_name, 'Sahel Digital')
+            self.assertIsNone(card.company_logo)
+        self.assertNotEqual(self.card(other).company_name, 'Sahel Digital')
+
+
+class JobSparseFieldsetTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.job = make_job(self.recruiter)
+        self.client.force_authenticate(self.recruiter.id)
+
+    def select(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        return response, queries[-1]['sql']
+
+    def test_fields_trim_output_and_columns(self):
+        response, sql = self.select('/api/v1/jobs/?fields=id,title')
+        self.assertEqual(list(response.data['results'][0]), ['id', 'title'])
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('JOIN "recruiters"', sql)
+
+    def test_omit_skips_nested_join(self):
+        response, sql = self.select(f'/api/v1/jobs/{self.job.pk}/?omit=description,recruiter_info')
+        self.assertNotIn('description', response.data)
+        self.assertNotIn('recruiter_info', response.data)
+        self.assertIn('title', response.data)
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('JOIN "users"', sql)
+
+    def test_nested_relation_keeps_its_join(self):
+        response, sql = self.select('/api/v1/jobs/?fields=title,company_name')
+        self.assertEqual(response.data['results'][0]['company_name'], self.recruiter.company_name)
+        self.assertIn('JOIN "recruiters"', sql)
+        self.assertNotIn('"company_description"', sql)
+
+    def test_unknown_field(self):
+        response = self.client.get('/api/v1/jobs/?fields=id,salary')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('fields', response.data)
+
+    def test_budget(self):
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/jobs/?fields=id,title,company_name'))
+
+
+class JobJSONRenderingTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.job = make_job(self.recruiter, description='Line\u2028break, caf\u00e9')
+        self.client.force_authenticate(self.recruiter.id)
+
+    def assertSameBytes(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_api_payloads_match_stock_renderer(self):
+        for url in ('/api/v1/jobs/', f'/api/v1/jobs/{self.job.pk}/', '/api/v1/jobs/facets/'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertSameBytes(response.data)
+            self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_edge_values_match_stock_renderer(self):
+        self.assertSameBytes({
+            'decimal': Decimal('1250.50'),
+            'uuid': uuid.uuid4(),
+            'datetime': timezone.now(),
+            'date': timezone.now().date(),
+            'exponent': 1e16,
+            'big': 2 ** 70,
+            'separators': '\u2028\u2029',
+            'nested': [{'unicode': '\u00e9\u4e2d'}, None, True, 0.1],
+        })
+
+    def test_non_finite_floats_match_stock_renderer(self):
+        for value in (float('nan'), float('inf'), -float('inf')):
+            data = {'nested': [{'score': value}], 'empty': None}
+            with self.assertRaises(ValueError):
+                JSONRenderer().render(data)
+            with self.assertRaises(ValueError):
+                FastJSONRenderer().render(data)
+        # Left to the stock renderer when not strict
+        with patch.object(JSONRenderer, 'strict', False):
+            self.assertSameBytes({'score': float('nan'), 'empty': None})
+
+    def test_parser_fallbacks(self):
+        parse = lambda body: FastJSONParser().parse(BytesIO(body))
+        self.assertEqual(parse(b'{"n": 1180591620717411303424}'), {'n': 2 ** 70})
+        body = '{"a": [1.5, "\u00e9", null]}'.encode()
+        self.assertEqual(parse(body), JSONParser().parse(BytesIO(body)))
+        with self.assertRaises(ParseError):
+            parse(b'{"a": ')
+
+
+class JobBulkImportTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.client.force_authenticate(self.recruiter.id)
+
+    def rows(self, count):
+        return [
+            {
+                'title': f'Data engineer {number}', 'description': 'Pipelines', 'contract_type': 'CDI',
+                'location': 'Abidjan', 'salary_min': '400000', 'salary_max': '600000',
+                'salary_period': 'MONTHLY', 'skills_required': ['Python', 'SQL'],
+            }
+            for number in range(count)
+        ]
+
+    def test_json_import_as_drafts(self):
+        response = self.client.post('/api/v1/jobs/bulk/', self.rows(3), format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created'], 3)
+        jobs = JobOffer.objects.filter(recruiter=self.recruiter)
+        self.assertEqual(jobs.count(), 3)
+        job = jobs.first()
+        self.assertEqual(job.status, 'DRAFT')
+        self.assertIsNotNone(job.latitude)
+        self.assertEqual(job.salary_max_yearly_xof, 7200000)
+
+    def test_csv_upload_published(self):
+        csv = (
+            'title,description,contract_type,location,skills_required,is_remote\n'
+            'Designer,UI work,FREELANCE,Lomé,Figma|Sketch,true\n'
+            'Comptable,Tenue des comptes,CDD,,,\n'
+        )
+        response = self.client.post(
+            '/api/v1/jobs/bulk/?publish=true', csv.encode(), content_type='text/csv'
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        designer = JobOffer.objects.get(title='Designer')
+        self.assertEqual(designer.skills_required, ['Figma', 'Sketch'])
+        self.assertTrue(designer.is_remote)
+        self.assertEqual(designer.status, 'PUBLISHED')
+        self.assertIsNotNone(designer.published_at)
+        self.assertIsNone(JobOffer.objects.get(title='Comptable').location)
+        self.assertTrue(PublishedJobCard.objects.filter(job_offer=designer).exists())
+
+    def test_csv_file_upload(self):
+        upload = SimpleUploadedFile('jobs.csv', b'\xef\xbb\xbftitle,description,contract_type\nStagiaire,Support,INTERNSHIP\n')
+        response = self.client.post('/api/v1/jobs/bulk/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['jobs'][0]['title'], 'Stagiaire')
+
+    def test_invalid_rows_import_nothing(self):
+        rows = self.rows(3)
+        rows[1]['contract_type'] = 'GIG'
+        rows[2]['salary_min'] = '900000'
+        rows[2]['salary'] = '1'
+        response = self.client.post('/api/v1/jobs/bulk/', rows, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['row'] for error in response.data['errors']], [2, 3])
+        self.assertIn('contract_type', response.data['errors'][0]['errors'])
+        self.assertIn('salary', response.data['errors'][1]['errors'])
+        self.assertFalse(JobOffer.objects.exists())
+
+    def test_candidates_cannot_import(self):
+        self.client.force_authenticate(make_candidate().id)
+        response = self.client.post('/api/v1/jobs/bulk/', self.rows(1), format='json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_budget(self):
+        post = lambda count: lambda: self.client.post('/api/v1/jobs/bulk/', self.rows(count), format='json')
+        clear_rates_cache()
+        self.addCleanup(clear_rates_cache)
+        with self.settings(JOB_BULK_IMPORT_BATCH_SIZE=100):
+            # Exchange rates are read once, then cached for the process; duplicates take one lookup
+            executed = self.assertQueryBudget(5, post(5))
+            self.assertEqual(self.count_queries(post(50)), executed - 1)
+
+
+class JobRecommendationTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        recruiter = make_recruiter()
+        self.candidate = make_candidate(
+            skills=['Python', 'django', 'SQL'], experience_years=3, education='Master en informatique',
+            desired_salary_min=Decimal('500000'),
+        )
+        self.match = make_job(
+            recruiter, skills_required=['Python', 'Django'], experience_level='INTERMEDIATE', location='Thiès'
+        )
+        self.remote = make_job(
+            recruiter, skills_required=['Python', 'React'], experience_level='INTERMEDIATE',
+            location='Accra', is_remote=True
+        )
+        self.distant = make_job(
+            recruiter, skills_required=['Java', 'Spring'], experience_level='EXPERT', location='Bamako',
+            salary_max=Decimal('300000')
+        )
+        self.client.force_authenticate(self.candidate.id)
+
+    def get(self, url='/api/v1/jobs/recommended/'):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_ranking(self):
+        results = self.get()['results']
+        self.assertEqual(
+            [item['id'] for item in results], [str(self.match.pk), str(self.remote.pk), str(self.distant.pk)]
+        )
+        self.assertGreater(results[0]['match_score'], 0.9)
+        self.assertLess(results[2]['match_score'], 0.4)
+
+    def test_score_matrix(self):
+        jobs = recommendations.load_jobs()
+        candidates = recommendations.load_candidates(
+            type(self.candidate).objects.filter(pk=self.candidate.pk), jobs.vocabulary
+        )
+        scores = recommendations.score_matrix(candidates, jobs)
+        self.assertEqual(scores.shape, (1, 3))
+        self.assertTrue(((scores >= 0) & (scores <= 1)).all())
+
+    def test_applied_and_closed_jobs_are_left_out(self):
+        self.get()
+        make_application(self.candidate, self.match)
+        self.distant.close()
+        results = self.get()['results']
+        self.assertEqual([item['id'] for item in results], [str(self.remote.pk)])
+
+    def test_limit(self):
+        self.assertEqual(len(self.get('/api/v1/jobs/recommended/?limit=1')['results']), 1)
+        response = self.client.get('/api/v1/jobs/recommended/?limit=many')
+        self.assertEqual(response.status_code, 400)
+
+    def test_profile_change_invalidates(self):
+        self.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.candidate.skills = ['Java', 'Spring']
+            self.candidate.experience_years = 12
+            self.candidate.save()
+        self.assertEqual(self.get()['results'][0]['id'], str(self.distant.pk))
+
+    def test_refresh_and_budget(self):
+        self.assertEqual(recommendations.refresh_recommendations(), 1)
+        for _ in range(3):
+            make_job(self.match.recruiter, skills_required=['SQL'])
+        # Served from the cache: candidate permission check and job cards
+        request = lambda: self.client.get('/api/v1/jobs/recommended/')
+        self.assertQueryBudget(2, request)
+        # A miss scores the candidate against every job: jobs, candidate, applications
+        recommendations.invalidate(self.candidate.pk)
+        self.assertQueryBudget(5, request)
+
+    def test_recruiters_are_refused(self):
+        self.client.force_authenticate(self.match.recruiter.id)
+        self.assertEqual(self.client.get('/api/v1/jobs/recommended/').status_code, 403)
+
+
+class JobSimilarityTests(QueryBudgetTestCase):
+
+    DESCRIPTION = (
+        'Nous recherchons un développeur backend pour concevoir nos API REST, '
+        'maintenir la base PostgreSQL, écrire des tests automatisés et '
+        'accompagner une équipe produit en croissance rapide à Dakar.'
+    )
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.job = make_job(self.recruiter, title='Développeur Backend Python', description=self.DESCRIPTION)
+        self.twin = make_job(
+            self.recruiter, title='Développeur Backend Python Senior',
+            description=self.DESCRIPTION + ' Expérience Django appréciée.'
+        )
+        self.other = make_job(
+            self.recruiter, title='Comptable', description='Tenue de la comptabilité générale et fiscale.',
+            skills_required=['Sage', 'Excel']
+        )
+        similarity.rebuild_index()
+        self.client.force_authenticate(make_candidate().id)
+
+    def similar_ids(self, job):
+        response = self.client.get(f'/api/v1/jobs/{job.pk}/similar/')
+        self.assertEqual(response.status_code, 200, response.data)
+        return [item['id'] for item in response.data['results']]
+
+    def test_neighbors(self):
+        self.assertEqual(self.similar_ids(self.job), [str(self.twin.pk)])
+        self.assertEqual(self.similar_ids(self.other), [])
+        similar = self.client.get(f'/api/v1/jobs/{self.twin.pk}/similar/').data['results'][0]
+        self.assertGreater(similar['similarity'], 0.5)
+
+    def test_publishing_and_closing_update_the_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            copy = make_job(self.recruiter, title='Développeur Backend Python', description=self.DESCRIPTION)
+        self.assertEqual(self.similar_ids(self.job)[0], str(copy.pk))
+        self.assertIn(str(self.job.pk), self.similar_ids(copy))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            copy.close()
+        self.assertNotIn(str(copy.pk), [job_id for job_id, _ in similarity.get_neighbors(self.job.pk)])
+        self.assertEqual(self.similar_ids(self.job), [str(self.twin.pk)])
+
+    def test_edit_moves_job_out_of_neighbors(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.twin.title = 'Chauffeur'
+            self.twin.description = 'Transport du personnel entre les sites de la société.'
+            self.twin.skills_required = []
+            self.twin.save()
+        self.assertEqual(self.similar_ids(self.job), [])
+
+    def test_unknown_job(self):
+        self.assertEqual(self.client.get(f'/api/v1/jobs/{uuid.uuid4()}/similar/').status_code, 404)
+        self.assertEqual(self.client.get('/api/v1/jobs/not-a-job/similar/').status_code, 404)
+        draft = make_job(self.recruiter, status='DRAFT')
+        self.assertEqual(self.client.get(f'/api/v1/jobs/{draft.pk}/similar/').status_code, 404)
+
+    def test_budget(self):
+        self.assertQueryBudget(2, lambda: self.client.get(f'/api/v1/jobs/{self.job.pk}/similar/'))
+
+
+class JobAlertTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.draft = make_job(
+            self.recruiter, status='DRAFT', skills_required=['Python', 'Django'], location='Dakar, Sénégal',
+            contract_type='CDI', experience_level='SENIOR'
+        )
+
+    def make_alert(self, candidate=None, **criteria):
+        return JobAlert.objects.create(candidate=candidate or make_candidate(), name='Alert', **criteria)
+
+    def publish(self, job=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            (job or self.draft).publish()
+        return set(
+            Notification.objects.filter(type='JOB_MATCH').values_list('user_id', flat=True)
+        )
+
+    def test_crud_indexes_criteria(self):
+        candidate = make_candidate()
+        self.client.force_authenticate(candidate.id)
+        response = self.client.post('/api/v1/job-alerts/', {
+            'name': 'Backend', 'skills': ['python', 'Go'], 'locations': ['dakar'],
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['criteria_count'], 2)
+        alert = JobAlert.objects.get(pk=response.data['id'])
+        self.assertEqual(
+            set(alert.tokens.values_list('token', flat=True)),
+            {'skill:python', 'skill:go', 'location:dakar'}
+        )
+
+        response = self.client.patch(f'/api/v1/job-alerts/{alert.pk}/', {'locations': []}, format='json')
+        self.assertEqual(response.data['criteria_count'], 1)
+        self.assertEqual(alert.tokens.count(), 2)
+
+        response = self.client.post('/api/v1/job-alerts/', {'name': 'Anything'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertEqual(self.client.get('/api/v1/job-alerts/').status_code, 403)
+
+    def test_publish_notifies_matching_alerts(self):
+        skills = self.make_alert(skills=['django', 'React'])
+        everything = self.make_alert(
+            skills=['Python'], locations=['Dakar'], contract_types=['CDI', 'CDD'], experience_levels=['SENIOR']
+        )
+        wrong_city = self.make_alert(skills=['Python'], locations=['Abidjan'])
+        wrong_contract = self.make_alert(contract_types=['FREELANCE'])
+        inactive = self.make_alert(skills=['Python'], is_active=False)
+        twice = make_candidate()
+        self.make_alert(twice, skills=['Python'])
+        self.make_alert(twice, locations=['Dakar'])
+
+        notified = self.publish()
+        self.assertEqual(notified, {skills.candidate_id, everything.candidate_id, twice.pk})
+        self.assertNotIn(wrong_city.candidate_id, notified)
+        self.assertNotIn(wrong_contract.candidate_id, notified)
+        self.assertNotIn(inactive.candidate_id, notified)
+        notification = Notification.objects.get(user_id=skills.candidate_id)
+        self.assertEqual(notification.data['job_offer_id'], str(self.draft.pk))
+
+    def test_remote_jobs_match_remote_alerts(self):
+        alert = self.make_alert(locations=['Télétravail'])
+        remote = make_job(self.recruiter, status='DRAFT', location='Lomé', is_remote=True)
+        self.assertEqual(self.publish(remote), {alert.candidate_id})
+
+    def test_retry_does_not_notify_twice(self):
+        self.make_alert(skills=['Python'])
+        self.publish()
+        self.assertEqual(alerts.notify_matches(self.draft.pk), 0)
+        self.assertEqual(Notification.objects.filter(type='JOB_MATCH').count(), 1)
+
+    def test_chunked_fan_out(self):
+        for _ in range(5):
+            self.make_alert(skills=['Python'])
+        for _ in range(5):
+            self.make_alert(skills=['Cobol'])
+        self.draft.status = 'PUBLISHED'
+        self.draft.save()
+        with self.settings(JOB_ALERT_NOTIFICATION_CHUNK_SIZE=2):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(alerts.notify_matches(self.draft.pk), 5)
+        inserts = [query for query in queries if query['sql'].startswith('INSERT INTO "notifications"')]
+        self.assertEqual(len(inserts), 3)
+        # Job, matching alerts, already notified, then one INSERT per chunk
+        self.assertEqual(len([query for query in queries if not query['sql'].startswith(('SAVEPOINT', 'RELEASE'))]), 6)
+
+
+class JobCandidateFlagsTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.candidate = make_candidate()
+        self.saved = make_job(self.recruiter)
+        self.applied = make_job(self.recruiter)
+        self.other = make_job(self.recruiter)
+        SavedJob.objects.create(candidate=self.candidate, job_offer=self.saved)
+        make_application(self.candidate, self.applied)
+
+    def add_jobs(self, n=5):
+        for _ in range(n):
+            job = make_job(make_recruiter())
+            SavedJob.objects.create(candidate=self.candidate, job_offer=job)
+
+    def flags(self, data):
+        return {row['id']: (row['is_saved'], row['has_applied']) for row in data['results']}
+
+    def test_list_and_retrieve_flags(self):
+        self.client.force_authenticate(self.candidate.id)
+        flags = self.flags(self.client.get('/api/v1/jobs/').data)
+        self.assertEqual(flags[str(self.saved.pk)], (True, False))
+        self.assertEqual(flags[str(self.applied.pk)], (False, True))
+        self.assertEqual(flags[str(self.other.pk)], (False, False))
+
+        data = self.client.get(f'/api/v1/jobs/{self.saved.pk}/').data
+        self.assertEqual((data['is_saved'], data['has_applied']), (True, False))
+        data = self.client.get(f'/api/v1/jobs/{self.other.pk}/?fields=id,is_saved').data
+        self.assertEqual(data, {'id': str(self.other.pk), 'is_saved': False})
+
+    def test_saving_a_job_changes_etag_and_cached_detail(self):
+        self.client.force_authenticate(self.candidate.id)
+        for url in ('/api/v1/jobs/', f'/api/v1/jobs/{self.other.pk}/'):
+            etag = self.client.get(url)['ETag']
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+            with self.captureOnCommitCallbacks(execute=True):
+                saved = SavedJob.objects.create(candidate=self.candidate, job_offer=self.other)
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            with self.captureOnCommitCallbacks(execute=True):
+                saved.delete()
+
+        # Cached details are per candidate
+        url = f'/api/v1/jobs/{self.applied.pk}/'
+        self.assertTrue(self.client.get(url).data['has_applied'])
+        self.client.force_authenticate(make_candidate().id)
+        self.assertFalse(self.client.get(url).data['has_applied'])
+
+    def test_other_users_get_no_flags(self):
+        for user_id in (None, self.recruiter.id, make_admin().id):
+            self.client.force_authenticate(user_id)
+            data = self.client.get('/api/v1/jobs/').data
+            self.assertNotIn('is_saved', data['results'][0])
+            if user_id:
+                self.assertNotIn('has_applied', self.client.get(f'/api/v1/jobs/{self.saved.pk}/').data)
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertEqual(self.client.get('/api/v1/jobs/?fields=is_saved').status_code, 400)
+
+    def test_budget(self):
+        self.client.force_authenticate(self.candidate.id)
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/jobs/?page_size=100'), grow=self.add_jobs)
+        self.assertQueryBudget(2, lambda: self.client.get(f'/api/v1/jobs/{self.saved.pk}/'))
+
+
+class JobDuplicateTests(QueryBudgetTestCase):
+
+    DESCRIPTION = (
+        'Nous recherchons un developpeur backend pour concevoir et maintenir nos API de paiement mobile. '
+        'Vous travaillerez avec une equipe produit de huit personnes sur des services Django et PostgreSQL, '
+        'participerez aux revues de code, a la supervision et aux astreintes, et accompagnerez deux '
+        'developpeurs juniors. Une experience de trois ans minimum sur des services en production est attendue.'
+    )
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.job = make_job(
+            self.recruiter, title='Developpeur Backend Django', description=self.DESCRIPTION,
+            skills_required=['Python', 'Django', 'PostgreSQL']
+        )
+        self.client.force_authenticate(self.recruiter.id)
+
+    def repost(self, **changes):
+        payload = {
+            'title': 'Developpeur Backend Django (H/F)',
+            'description': self.DESCRIPTION + ' Postulez vite !',
+            'contract_type': 'CDI',
+            'skills_required': ['Python', 'Django', 'PostgreSQL'],
+            **changes,
+        }
+        return self.client.post('/api/v1/jobs/', payload, format='json')
+
+    def test_fingerprint(self):
+        self.assertEqual(self.job.simhash_bands, simhash.bands(self.job.simhash))
+        self.assertIsNone(simhash.simhash(simhash.text_tokens('', None)))
+        self.assertEqual(simhash.distance(self.job.simhash, self.job.simhash), 0)
+        self.assertEqual(simhash.distance(0, -1), 64)
+
+        self.job.description = 'Tout autre chose'
+        self.job.save(update_fields=['description'])
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.simhash, simhash.simhash(simhash.text_tokens(
+            self.job.title, 'Tout autre chose', tags=self.job.skills_required
+        )))
+
+    def test_warn_policy(self):
+        response = self.repost()
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual([match['id'] for match in response.data['duplicates']], [str(self.job.pk)])
+        self.assertLessEqual(response.data['duplicates'][0]['distance'], 6)
+
+        response = self.repost(title='Comptable senior', description='Tenue des comptes et fiscalite', skills_required=[])
+        self.assertNotIn('duplicates', response.data)
+
+    def test_only_live_offers_of_the_recruiter(self):
+        self.client.force_authenticate(make_recruiter().id)
+        self.assertNotIn('duplicates', self.repost().data)
+
+        self.client.force_authenticate(self.recruiter.id)
+        self.job.close()
+        self.assertNotIn('duplicates', self.repost().data)
+
+    def test_block_policy(self):
+        with self.settings(JOB_DUPLICATE_POLICY='block'):
+            response = self.repost()
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['duplicate_of'], [str(self.job.pk)])
+        self.assertEqual(JobOffer.objects.count(), 1)
+
+        with self.settings(JOB_DUPLICATE_POLICY='off'):
+            self.assertEqual(self.repost().status_code, 201)
+
+    def test_bulk_import(self):
+        rows = [
+            {'title': 'Developpeur Backend Django', 'description': self.DESCRIPTION, 'contract_type': 'CDI',
+             'skills_required': ['Python', 'Django', 'PostgreSQL']},
+            {'title': 'Comptable', 'description': 'Tenue des comptes', 'contract_type': 'CDD'},
+            {'title': 'Comptable', 'description': 'Tenue des comptes', 'contract_type': 'CDI'},
+        ]
+        with self.settings(JOB_DUPLICATE_POLICY='block'):
+            response = self.client.post('/api/v1/jobs/bulk/', rows, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'], [
+            {'row': 1, 'errors': {'duplicate_of': [str(self.job.pk)]}},
+            {'row': 3, 'errors': {'duplicate_of': ['row 2']}},
+        ])
+
+        response = self.client.post('/api/v1/jobs/bulk/', rows, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([duplicate['row'] for duplicate in response.data['duplicates']], [1, 3])
+        self.assertTrue(all(job.simhash_bands for job in JobOffer.objects.all()))
@@ -5,11 +5,12 @@ URL Configuration for Jobs app
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from .views import JobOfferViewSet, SavedJobViewSet
+from .views import JobOfferViewSet, SavedJobViewSet, JobAlertViewSet
 
 router = DefaultRouter()
 router.register(r'jobs', JobOfferViewSet, basename='job')
 router.register(r'saved-jobs', SavedJobViewSet, basename='saved-job')
+router.register(r'job-alerts', JobAlertViewSet, basename='job-alert')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -2,39 +2,142 @@
 API Views for Jobs app
 """
 
+import uuid
+
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
 from django.utils import timezone
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Greatest
 
-from .models import JobOffer, SavedJob
+from .models import (
+    JobOffer, SavedJob, PublishedJobCard, JobAlert, activity_changed_at, candidate_flags, unexpired,
+)
 from .serializers import (
     JobOfferSerializer, JobOfferListSerializer, JobOfferDetailSerializer,
-    JobOfferCreateSerializer, SavedJobSerializer
+    JobOfferCreateSerializer, SavedJobSerializer, PublishedJobCardSerializer,
+    RecruiterJobOfferListSerializer, JobAlertSerializer
 )
-from users.permissions import IsRecruiter, IsActiveRecruiter, IsRecruiterOwner
+from . import bulk_import, recommendations, response_cache, similarity
+from .counters import merge_pending_views, record_view
+from .facets import get_facet_counts
+from .filters import JobOfferFilter, PublishedJobCardFilter
+from .search import JobOfferFullTextFilter
+from .suggest import SUGGEST_FIELDS, get_suggestions, did_you_mean
+from applications import pipeline
+from applications.tasks import rescore_job_applications
+from users.permissions import IsCandidate, IsRecruiter, IsActiveRecruiter, IsRecruiterOwner
+from core.conditional import ConditionalGetMixin
+from core.parsers import CSVParser, FastJSONParser
+from core.projection import SparseFieldsetViewMixin
+from core.filters import AliasedOrderingFilter
 
 
-class JobOfferViewSet(viewsets.ModelViewSet):
+class JobOfferViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for JobOffer model
     Provides CRUD operations for job offers
     """
     queryset = JobOffer.objects.all()
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['status', 'contract_type', 'experience_level', 'is_remote', 'location']
+    filter_backends = [
+        DjangoFilterBackend, filters.SearchFilter, AliasedOrderingFilter,
+        JobOfferFullTextFilter,
+    ]
     search_fields = ['title', 'description', 'skills_required']
-    ordering_fields = ['created_at', 'published_at', 'salary_min', 'applications_count', 'views_count']
+    ordering_fields = ['created_at', 'published_at', 'salary_min', 'salary_max', 'applications_count', 'views_count']
+    # Salaries sort on their comparable yearly XOF equivalents
+    ordering_aliases = {
+        'salary_min': 'salary_min_yearly_xof',
+        'salary_max': 'salary_max_yearly_xof',
+    }
     ordering = ['-published_at', '-created_at']
+    cursor_ordering = ['-published_at', '-created_at', 'pk']
+    last_modified_fields = ['updated_at', 'recruiter__updated_at']
+    
+    # Query parameters that need columns only the job_offers table has
+    job_table_params = ['q', 'search', 'skills_any', 'skills_all', 'near', 'salary_gte', 'salary_lte']
+    
+    @property
+    def filterset_class(self):
+        """Job cards carry no skills, coordinates or normalized salaries: they get the plain filters only"""
+        if self.serves_job_cards():
+            return PublishedJobCardFilter
+        return JobOfferFilter
+    
+    def serves_job_cards(self):
+        """Whether this request can be answered from the published job cards"""
+        if self.action not in ('list', 'facets'):
+            return False
+        
+        # Facets always describe the public board, whoever asks
+        user = self.request.user
+        if self.action == 'list' and user.is_authenticated and user.role != 'CANDIDATE':
+            return False
+        
+        params = self.request.query_params
+        if any(params.get(param) for param in self.job_table_params):
+            return False
+        ordering = params.get('ordering', '').split(',')
+        return not any(term.strip().lstrip('-') in self.ordering_aliases for term in ordering)
+    
+    def shows_candidate_flags(self):
+        """Whether job rows carry the current candidate's `is_saved` / `has_applied` badges"""
+        user = self.request.user
+        return (
+            self.action in ('list', 'retrieve') and
+            user.is_authenticated and user.role == 'CANDIDATE'
+        )
+    
+    def make_etag(self, *parts):
+        """Candidates' validators also change with their saved jobs and applications"""
+        if self.shows_candidate_flags():
+            parts += (response_cache.get_user_generation(self.request.user.pk),)
+        return super().make_etag(*parts)
+    
+    def get_last_modified_expression(self):
+        """
+        Jobs also change with time passing: `is_active` at expiry, and the detail's `days_remaining`
+        View flushes and application counters bump updated_at themselves.
+        """
+        return Greatest(
+            *self.last_modified_fields, activity_changed_at(days_remaining=self.action == 'retrieve')
+        )
+    
+    def get_list_validators(self):
+        """Job cards only change with the response cache generation: no query needed"""
+        if self.serves_job_cards():
+            return self.make_etag(response_cache.get_generation()), None
+        return super().get_list_validators()
+    
+    def is_job_owner(self, request, job_id, data=None):
+        """Whether the current user is the recruiter who owns the job, from `data` when it says"""
+        user = request.user
+        if not user.is_authenticated or user.role != 'RECRUITER':
+            return False
+        if data and 'recruiter' in data:
+            return str(data['recruiter']) == str(user.pk)
+        return JobOffer.objects.filter(pk=job_id, recruiter_id=user.pk).exists()
+    
+    def on_not_modified(self, request):
+        """A revalidated job detail still counts as a view"""
+        if self.action != 'retrieve':
+            return
+        job_id = self.kwargs[self.lookup_field]
+        if not self.is_job_owner(request, job_id):
+            record_view(job_id)
     
     def get_serializer_class(self):
-        if self.action == 'create':
+        if self.action in ('create', 'bulk_import'):
             return JobOfferCreateSerializer
         elif self.action == 'list':
+            if self.serves_job_cards():
+                return PublishedJobCardSerializer
             return JobOfferListSerializer
         elif self.action in ['retrieve', 'update', 'partial_update']:
             return JobOfferDetailSerializer
@@ -42,10 +145,21 @@ class JobOfferViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter based on user role"""
+        if self.serves_job_cards():
+            # Public feed: every card is a published job
+            queryset = PublishedJobCard.objects.with_activity()
+            if self.shows_candidate_flags():
+                queryset = queryset.annotate(**candidate_flags(self.request.user.pk, 'job_offer_id'))
+            return queryset
+        
         user = self.request.user
-        queryset = JobOffer.objects.all()
+        queryset = JobOffer.objects.select_related('recruiter__id').with_activity()
+        if self.shows_candidate_flags():
+            queryset = queryset.annotate(**candidate_flags(user.pk))
         
-        if user.role == 'RECRUITER':
+        if not user.is_authenticated or self.action == 'facets':
+            queryset = queryset.filter(status='PUBLISHED')
+        elif user.role == 'RECRUITER':
             # Recruiters see their own jobs and published jobs from others
             queryset = queryset.filter(
                 models.Q(recruiter=user.recruiter_profile) | 
@@ -59,7 +173,7 @@ class JobOfferViewSet(viewsets.ModelViewSet):
     
     def get_permissions(self):
         """Set permissions based on action"""
-        if self.action == 'create':
+        if self.action in ('create', 'bulk_import'):
             return [IsActiveRecruiter()]
         elif self.action in ['update', 'partial_update', 'destroy']:
             return [IsRecruiterOwner()]
@@ -67,6 +181,33 @@ class JobOfferViewSet(viewsets.ModelViewSet):
             return [AllowAny()] if self.action == 'list' else [IsAuthenticated()]
         return super().get_permissions()
     
+    def paginate_queryset(self, queryset):
+        """Paginate and add views still buffered in Redis to each job"""
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            merge_pending_views(page)
+        return page
+    
+    def list(self, request, *args, **kwargs):
+        """List job offers, suggesting a correction when a search finds nothing"""
+        # The anonymous feed is the same for everyone: serve it from the cache
+        cache_key = None
+        if not request.user.is_authenticated:
+            cache_key = response_cache.make_key('list', request)
+            data = response_cache.load(cache_key)
+            if data is not None:
+                return Response(data)
+        
+        response = super().list(request, *args, **kwargs)
+        
+        search_text = request.query_params.get('q') or request.query_params.get('search')
+        if search_text and isinstance(response.data, dict) and not response.data.get('results'):
+            response.data['did_you_mean'] = did_you_mean(search_text)
+        
+        if cache_key:
+            response_cache.store(cache_key, response.data)
+        return response
+    
     def create(self, request, *args, **kwargs):
         """Create job offer"""
         serializer = self.get_serializer(data=request.data)
@@ -75,24 +216,95 @@ class JobOfferViewSet(viewsets.ModelViewSet):
         # Set recruiter from request user
         job_offer = serializer.save(recruiter=request.user.recruiter_profile)
         
-        return Response(
-            JobOfferDetailSerializer(job_offer).data,
-            status=status.HTTP_201_CREATED
-        )
+        data = JobOfferDetailSerializer(job_offer).data
+        if serializer.duplicates:
+            # JOB_DUPLICATE_POLICY is 'warn': created, with the offers it repeats
+            data['duplicates'] = serializer.duplicates
+        return Response(data, status=status.HTTP_201_CREATED)
+    
+    def perform_update(self, serializer):
+        """Save the job offer, rescoring its applications when a field they are scored on changed"""
+        scored_values = lambda job_offer: [getattr(job_offer, name) for name in recommendations.JOB_COLUMNS]
+        before = scored_values(serializer.instance)
+        job_offer = serializer.save()
+        if scored_values(job_offer) != before:
+            transaction.on_commit(lambda: rescore_job_applications.delay(str(job_offer.pk)))
     
     def retrieve(self, request, *args, **kwargs):
         """Retrieve job offer and increment view count"""
-        instance = self.get_object()
+        parts = [self.kwargs[self.lookup_field]]
+        if self.shows_candidate_flags():
+            # Candidates' badges are their own: their payloads are cached per candidate
+            parts += [request.user.pk, response_cache.get_user_generation(request.user.pk)]
+        elif request.user.is_authenticated and request.user.role == 'RECRUITER':
+            # Owners see their pipeline counts: recruiters never share the anonymous payload
+            parts += [request.user.pk]
+        cache_key = response_cache.make_key('retrieve', request, *parts)
+        data = response_cache.load(cache_key)
+        if data is None:
+            instance = self.get_object()
+            merge_pending_views([instance])
+            data = self.get_serializer(instance).data
+            # Published jobs look the same to every user allowed to retrieve them, badges aside;
+            # owners' payloads are not cached, their pipeline counts change with every application
+            if instance.status == 'PUBLISHED' and 'submitted_count' not in data:
+                response_cache.store(cache_key, data)
+        
+        # Increment views if not the owner, cached or not (?fields= may leave out the recruiter)
+        job_id = self.kwargs[self.lookup_field]
+        if not self.is_job_owner(request, job_id, data):
+            record_view(job_id)
         
-        # Increment views if not the owner
-        if request.user.is_authenticated:
-            if request.user.role != 'RECRUITER' or instance.recruiter.id != request.user:
-                instance.increment_views()
+        return Response(data)
+    
+    @action(
+        detail=False, methods=['post'], url_path='bulk',
+        parser_classes=[FastJSONParser, CSVParser, MultiPartParser]
+    )
+    def bulk_import(self, request):
+        """Create many job offers from a JSON array or a CSV upload, all or none"""
+        if isinstance(request.data, list):
+            rows = request.data
+        elif 'file' in request.FILES:
+            rows = CSVParser().parse(request.FILES['file'])
         else:
-            instance.increment_views()
+            return Response({
+                'error': 'Send a JSON array of jobs, a text/csv body or a CSV file upload named file'
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        if request.content_type.startswith(('text/csv', 'multipart/form-data')):
+            rows = [bulk_import.normalize_csv_row(row) for row in rows]
+        
+        if not rows:
+            return Response({
+                'error': 'No jobs to import'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > settings.JOB_BULK_IMPORT_MAX_ROWS:
+            return Response({
+                'error': f'At most {settings.JOB_BULK_IMPORT_MAX_ROWS} jobs can be imported at once'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        publish = request.query_params.get('publish', '').lower() in ('1', 'true', 'yes')
+        
+        validated, errors = bulk_import.validate_rows(rows, self.get_serializer_context())
+        if not errors:
+            duplicates, errors = bulk_import.check_duplicates(request.user.pk, validated)
+        if errors:
+            return Response({
+                'error': f'{len(errors)} of {len(rows)} jobs are invalid, none was imported',
+                'errors': errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        jobs = bulk_import.import_jobs(request.user.recruiter_profile, validated, publish=publish)
+        
+        data = {
+            'created': len(jobs),
+            'published': publish,
+            'jobs': JobOfferListSerializer(jobs, many=True).data
+        }
+        if duplicates:
+            data['duplicates'] = duplicates
+        return Response(data, status=status.HTTP_201_CREATED)
     
     @action(detail=True, methods=['post'], permission_classes=[IsRecruiterOwner])
     def publish(self, request, pk=None):
@@ -128,6 +340,120 @@ class JobOfferViewSet(viewsets.ModelViewSet):
             'job': JobOfferDetailSerializer(job_offer).data
         })
     
+    @action(detail=True, methods=['get'], permission_classes=[IsRecruiterOwner])
+    def pipeline(self, request, pk=None):
+        """Applications to the job as a board: count and first cards of every status"""
+        try:
+            limit = int(request.query_params.get('limit', settings.JOB_PIPELINE_DEFAULT_LIMIT))
+        except ValueError:
+            return Response({
+                'error': 'limit must be an integer'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, settings.JOB_PIPELINE_MAX_LIMIT))
+        
+        job_offer = self.get_object()
+        columns = pipeline.get_pipeline(job_offer.pk, limit)
+        return Response({
+            'job_offer': str(job_offer.pk),
+            'count': sum(column['count'] for column in columns),
+            'columns': columns
+        })
+    
+    @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    def suggest(self, request):
+        """Autocomplete job titles, locations and company names"""
+        prefix = request.query_params.get('q', '').strip()
+        if len(prefix) < 2:
+            return Response({
+                'error': 'q must be at least 2 characters long'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        field = request.query_params.get('field')
+        if field and field not in SUGGEST_FIELDS:
+            return Response({
+                'error': f"field must be one of: {', '.join(SUGGEST_FIELDS)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            limit = int(request.query_params.get('limit', settings.JOB_SUGGEST_DEFAULT_LIMIT))
+        except ValueError:
+            return Response({
+                'error': 'limit must be an integer'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, settings.JOB_SUGGEST_MAX_LIMIT))
+        
+        suggestions = get_suggestions(prefix, fields=[field] if field else SUGGEST_FIELDS, limit=limit)
+        data = {'query': prefix, 'suggestions': suggestions}
+        if not any(suggestions.values()):
+            data['did_you_mean'] = did_you_mean(prefix)
+        
+        return Response(data)
+    
+    @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    def facets(self, request):
+        """Counts per contract type, experience level, remote and location for the current filters"""
+        cache_key = response_cache.make_key('facets', request)
+        data = response_cache.load(cache_key)
+        if data is None:
+            data = get_facet_counts(request, self.get_queryset(), self)
+            response_cache.store(cache_key, data)
+        return Response(data)
+    
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """Published jobs closest to this one, from the precomputed neighbor lists"""
+        try:
+            neighbors = similarity.get_neighbors(uuid.UUID(pk))
+        except ValueError:
+            return Response({
+                'error': 'Job offer not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        if neighbors is None:
+            # Not indexed: unpublished, without text, or not indexed yet
+            if not self.get_queryset().filter(pk=pk).exists():
+                return Response({
+                    'error': 'Job offer not found'
+                }, status=status.HTTP_404_NOT_FOUND)
+            neighbors = []
+        
+        position = {job_id: index for index, (job_id, _) in enumerate(neighbors)}
+        scores = dict(neighbors)
+        cards = PublishedJobCard.objects.filter(unexpired(), job_offer_id__in=list(position))
+        cards = sorted(cards, key=lambda card: position[str(card.job_offer_id)])
+        merge_pending_views(cards)
+        
+        results = PublishedJobCardSerializer(cards, many=True, context=self.get_serializer_context()).data
+        for card, data in zip(cards, results):
+            data['similarity'] = scores[str(card.job_offer_id)]
+        return Response({'count': len(results), 'results': results})
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsCandidate])
+    def recommended(self, request):
+        """Active jobs best matching the current candidate, from the recommendation cache"""
+        try:
+            limit = int(request.query_params.get('limit', settings.JOB_RECOMMENDATION_DEFAULT_LIMIT))
+        except ValueError:
+            return Response({
+                'error': 'limit must be an integer'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, settings.JOB_RECOMMENDATION_TOP_N))
+        
+        ranked = recommendations.get_recommendations(request.user.pk)
+        position = {job_id: index for index, (job_id, _) in enumerate(ranked)}
+        scores = dict(ranked)
+        
+        # Cached rankings may predate a closed job or a new application: drop those here
+        cards = PublishedJobCard.objects.filter(unexpired(), job_offer_id__in=list(position)).exclude(
+            job_offer__applications__candidate_id=request.user.pk
+        )
+        cards = sorted(cards, key=lambda card: position[str(card.job_offer_id)])[:limit]
+        merge_pending_views(cards)
+        
+        results = PublishedJobCardSerializer(cards, many=True, context=self.get_serializer_context()).data
+        for card, data in zip(cards, results):
+            data['match_score'] = scores[str(card.job_offer_id)]
+        return Response({'count': len(results), 'results': results})
+    
     @action(detail=False, methods=['get'])
     def my_jobs(self, request):
         """Get jobs created by current recruiter"""
@@ -136,18 +462,18 @@ class JobOfferViewSet(viewsets.ModelViewSet):
                 'error': 'Only recruiters can access this endpoint'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        jobs = JobOffer.objects.filter(recruiter=request.user.recruiter_profile)
+        jobs = JobOffer.objects.filter(recruiter_id=request.user.pk).select_related('recruiter').with_activity()
         page = self.paginate_queryset(jobs)
         
         if page is not None:
-            serializer = JobOfferListSerializer(page, many=True)
+            serializer = RecruiterJobOfferListSerializer(page, many=True)
             return self.get_paginated_response(serializer.data)
         
-        serializer = JobOfferListSerializer(jobs, many=True)
+        serializer = RecruiterJobOfferListSerializer(jobs, many=True)
         return Response(serializer.data)
 
 
-class SavedJobViewSet(viewsets.ModelViewSet):
+class SavedJobViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for SavedJob model
     Allows candidates to save/bookmark jobs
@@ -155,13 +481,23 @@ class SavedJobViewSet(viewsets.ModelViewSet):
     queryset = SavedJob.objects.all()
     serializer_class = SavedJobSerializer
     permission_classes = [IsAuthenticated]
+    last_modified_fields = ['saved_at', 'job_offer__updated_at']
     
     def get_queryset(self):
         """Return saved jobs for current candidate"""
         if self.request.user.role == 'CANDIDATE':
-            return SavedJob.objects.filter(candidate=self.request.user.candidate_profile)
+            return SavedJob.objects.filter(
+                candidate_id=self.request.user.pk
+            ).select_related('job_offer__recruiter')
         return SavedJob.objects.none()
     
+    def paginate_queryset(self, queryset):
+        """Paginate and add views still buffered in Redis to each job"""
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            merge_pending_views([saved.job_offer for saved in page])
+        return page
+    
     def create(self, request, *args, **kwargs):
         """Save a job for the current candidate"""
         if request.user.role != 'CANDIDATE':
@@ -182,10 +518,27 @@ class SavedJobViewSet(viewsets.ModelViewSet):
         """Remove a saved job"""
         instance = self.get_object()
         
-        if instance.candidate.id != request.user:
+        if instance.candidate_id != request.user.pk:
             return Response({
                 'error': 'You can only delete your own saved jobs'
             }, status=status.HTTP_403_FORBIDDEN)
         
         self.perform_destroy(instance)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class JobAlertViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    """
+    ViewSet for JobAlert model
+    Candidates manage the saved searches they get JOB_MATCH notifications for
+    """
+    queryset = JobAlert.objects.all()
+    serializer_class = JobAlertSerializer
+    permission_classes = [IsCandidate]
+    
+    def get_queryset(self):
+        """Return job alerts of current candidate"""
+        return JobAlert.objects.filter(candidate_id=self.request.user.pk)
+    
+    def perform_create(self, serializer):
+        serializer.save(candidate=self.request.user.candidate_profile)
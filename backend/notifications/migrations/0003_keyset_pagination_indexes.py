@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at', 'id'], name='notificatio_user_id_1476e5_idx'),
+        ),
+    ]
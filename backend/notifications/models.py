@@ -62,6 +62,7 @@ class Notification(models.Model):
             models.Index(fields=['type']),
             models.Index(fields=['read']),
             models.Index(fields=['-created_at']),
+            models.Index(fields=['user', '-created_at', 'id']),
         ]
     
     def __str__(self):
@@ -4,9 +4,10 @@ Serializers for Notifications app
 
 from rest_framework import serializers
 from .models import Notification
+from core.projection import SparseFieldsetMixin
 
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Notification model"""
     
     class Meta:
@@ -20,7 +21,7 @@ class NotificationSerializer(serializers.ModelSerializer):
         ]
 
 
-class NotificationListSerializer(serializers.ModelSerializer):
+class NotificationListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Lightweight serializer for listing notifications"""
     
     class Meta:
@@ -31,7 +32,7 @@ class NotificationListSerializer(serializers.ModelSerializer):
         ]
 
 
-class NotificationCreateSerializer(serializers.ModelSerializer):
+class NotificationCreateSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for creating notifications"""
     
     class Meta:
@@ -1,3 +1,36 @@
-from django.test import TestCase
+"""
+Query budget tests for the Notifications API
+"""
 
-# Create your tests here.
+from core.testing import QueryBudgetTestCase, make_candidate, make_notification
+
+
+class NotificationQueryBudgetTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = make_candidate().id
+        self.notification = make_notification(self.user)
+        self.client.force_authenticate(self.user)
+
+    def add_notifications(self, n=5):
+        for _ in range(n):
+            make_notification(self.user)
+
+    def test_list(self):
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/notifications/?page_size=100'), grow=self.add_notifications)
+
+    def test_list_cursor(self):
+        self.assertQueryBudget(1, lambda: self.client.get('/api/v1/notifications/?pagination=cursor'), grow=self.add_notifications)
+
+    def test_retrieve(self):
+        self.assertQueryBudget(1, lambda: self.client.get(f'/api/v1/notifications/{self.notification.pk}/'))
+
+    def test_mark_read(self):
+        self.assertQueryBudget(2, lambda: self.client.post(f'/api/v1/notifications/{self.notification.pk}/mark_read/'))
+
+    def test_mark_all_read(self):
+        self.assertQueryBudget(1, lambda: self.client.post('/api/v1/notifications/mark_all_read/'), grow=self.add_notifications)
+
+    def test_unread(self):
+        self.assertQueryBudget(1, lambda: self.client.get('/api/v1/notifications/unread/'), grow=self.add_notifications)
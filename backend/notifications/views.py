@@ -9,15 +9,17 @@ from rest_framework.permissions import IsAuthenticated
 
 from .models import Notification
 from .serializers import NotificationSerializer, NotificationListSerializer
+from core.projection import SparseFieldsetViewMixin
 
 
-class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+class NotificationViewSet(SparseFieldsetViewMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for Notification model
     Read-only viewset for user notifications
     """
     queryset = Notification.objects.all()
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ['-created_at', 'pk']
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -33,7 +35,7 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         """Mark notification as read"""
         notification = self.get_object()
         
-        if notification.user != request.user:
+        if notification.user_id != request.user.pk:
             return Response({
                 'error': 'You can only mark your own notifications as read'
             }, status=status.HTTP_403_FORBIDDEN)
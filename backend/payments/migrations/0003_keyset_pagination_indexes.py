@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0002_initial'),
+        ('users', '0002_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['recruiter', '-created_at', 'id'], name='payments_recruit_7f7b3c_idx'),
+        ),
+    ]
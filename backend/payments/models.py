@@ -90,6 +90,7 @@ class Payment(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['-created_at']),
             models.Index(fields=['transaction_id']),
+            models.Index(fields=['recruiter', '-created_at', 'id']),
         ]
     
     def __str__(self):
@@ -5,9 +5,10 @@ Serializers for Payments app
 from rest_framework import serializers
 from .models import Payment
 from users.serializers import RecruiterListSerializer
+from core.projection import SparseFieldsetMixin
 
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Payment model"""
     
     recruiter_info = RecruiterListSerializer(source='recruiter', read_only=True)
@@ -26,7 +27,7 @@ class PaymentSerializer(serializers.ModelSerializer):
         ]
 
 
-class PaymentCreateSerializer(serializers.ModelSerializer):
+class PaymentCreateSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for creating payments"""
     
     class Meta:
@@ -40,7 +41,7 @@ class PaymentCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class PaymentListSerializer(serializers.ModelSerializer):
+class PaymentListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Lightweight serializer for listing payments"""
     
     company_name = serializers.CharField(source='recruiter.company_name', read_only=True)
@@ -1,3 +1,61 @@
-from django.test import TestCase
+"""
+Query budget tests for the Payments API
+"""
 
-# Create your tests here.
+from core.testing import QueryBudgetTestCase, make_recruiter, make_admin, make_payment
+
+
+class PaymentQueryBudgetTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.admin = make_admin()
+        self.payment = make_payment(self.recruiter)
+
+    def add_payments(self, n=5):
+        for _ in range(n):
+            make_payment(self.recruiter)
+            make_payment(make_recruiter())
+
+    def test_recruiter_list(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/payments/?page_size=100'), grow=self.add_payments)
+
+    def test_admin_list(self):
+        self.client.force_authenticate(self.admin.id)
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/payments/?page_size=100'), grow=self.add_payments)
+
+    def test_my_payments(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/payments/my_payments/?page_size=100'), grow=self.add_payments)
+
+    def test_retrieve(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertQueryBudget(1, lambda: self.client.get(f'/api/v1/payments/{self.payment.pk}/'))
+
+    def test_create(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertQueryBudget(1, lambda: self.client.post(
+            '/api/v1/payments/', {'amount': '25000', 'method': 'MOBILE_MONEY'}, format='json'
+        ))
+
+    def test_verify(self):
+        self.client.force_authenticate(self.admin.id)
+        self.assertQueryBudget(3, lambda: self.client.post(
+            f'/api/v1/payments/{self.payment.pk}/verify/', {'transaction_id': 'TX-1'}, format='json'
+        ))
+
+    def test_reject(self):
+        self.client.force_authenticate(self.admin.id)
+        self.assertQueryBudget(2, lambda: self.client.post(
+            f'/api/v1/payments/{self.payment.pk}/reject/', {'reason': 'Invalid proof'}, format='json'
+        ))
+
+    def test_refund(self):
+        self.client.force_authenticate(self.admin.id)
+        make_payment(self.recruiter, status='COMPLETED')
+        completed = make_payment(self.recruiter, status='COMPLETED')
+        self.assertQueryBudget(3, lambda: self.client.post(
+            f'/api/v1/payments/{completed.pk}/refund/', {'reason': 'Duplicate'}, format='json'
+        ))
@@ -12,15 +12,17 @@ from .serializers import (
     PaymentSerializer, PaymentListSerializer, PaymentCreateSerializer
 )
 from users.permissions import IsRecruiter, IsAdmin
+from core.projection import SparseFieldsetViewMixin
 
 
-class PaymentViewSet(viewsets.ModelViewSet):
+class PaymentViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for Payment model
     Handles subscription payments
     """
     queryset = Payment.objects.all()
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ['-created_at', 'pk']
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -33,10 +35,11 @@ class PaymentViewSet(viewsets.ModelViewSet):
         """Filter based on user role"""
         user = self.request.user
         
+        queryset = Payment.objects.select_related('recruiter__id')
         if user.role == 'ADMIN':
-            return Payment.objects.all()
+            return queryset
         elif user.role == 'RECRUITER':
-            return Payment.objects.filter(recruiter=user.recruiter_profile)
+            return queryset.filter(recruiter_id=user.pk)
         
         return Payment.objects.none()
     
@@ -128,7 +131,7 @@ class PaymentViewSet(viewsets.ModelViewSet):
                 'error': 'Only recruiters can access this endpoint'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        payments = Payment.objects.filter(recruiter=request.user.recruiter_profile)
+        payments = Payment.objects.filter(recruiter_id=request.user.pk).select_related('recruiter')
         page = self.paginate_queryset(payments)
         
         if page is not None:
@@ -0,0 +1,23 @@
+"""
+Filter sets for the Users API
+"""
+
+from django_filters import rest_framework as filters
+
+from core.filters import ArrayFilter, NearFilter, RadiusFilter
+from .models import Candidate
+
+
+class CandidateFilter(filters.FilterSet):
+    """Candidate filters: skills through the GIN index, `near` through the coordinates index"""
+    skills_any = ArrayFilter(field_name='skills', lookup_expr='overlap')
+    skills_all = ArrayFilter(field_name='skills', lookup_expr='contains')
+    near = NearFilter()
+    radius_km = RadiusFilter()
+    # Yearly XOF amounts: candidates whose desired range reaches the bound
+    salary_gte = filters.NumberFilter(field_name='desired_salary_max_yearly_xof', lookup_expr='gte')
+    salary_lte = filters.NumberFilter(field_name='desired_salary_min_yearly_xof', lookup_expr='lte')
+
+    class Meta:
+        model = Candidate
+        fields = []
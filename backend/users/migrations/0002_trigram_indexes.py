@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:25
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='recruiter',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['company_name'], name='recruiters_company_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
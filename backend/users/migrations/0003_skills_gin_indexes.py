@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:43
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidate',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['skills'], name='candidates_skills_gin'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:48
+
+from django.db import migrations, models
+
+
+# Same conversion as core.salaries.set_yearly_salaries, for existing rows
+BACKFILL_SQL = """
+UPDATE candidates AS t SET
+    desired_salary_min_yearly_xof = round(coalesce(t.desired_salary_min, t.desired_salary_max) * r.rate_to_xof * 12),
+    desired_salary_max_yearly_xof = round(coalesce(t.desired_salary_max, t.desired_salary_min) * r.rate_to_xof * 12)
+FROM exchange_rates AS r
+WHERE r.currency = upper(t.salary_currency);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('users', '0004_location_coordinates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='desired_salary_max_yearly_xof',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='desired_salary_min_yearly_xof',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['desired_salary_min_yearly_xof'], name='candidates_desired_36f670_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['desired_salary_max_yearly_xof'], name='candidates_desired_4a4ea5_idx'),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
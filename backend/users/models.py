@@ -6,10 +6,13 @@ Implements custom User model with Candidate, Recruiter, and Admin profiles
 import uuid
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import EmailValidator, MinValueValidator, MaxValueValidator
 from django.db import models
 from django.utils import timezone
 
+from core import geo, salaries
+
 
 class UserManager(BaseUserManager):
     """Custom user manager for email-based authentication"""
@@ -126,6 +129,13 @@ class Candidate(models.Model):
     Contains candidate-specific information and CV
     """
     
+    # Salary bound -> yearly XOF column, maintained by core.salaries
+    yearly_salary_fields = {
+        'desired_salary_min': 'desired_salary_min_yearly_xof',
+        'desired_salary_max': 'desired_salary_max_yearly_xof',
+    }
+    salary_period_field = None
+    
     id = models.OneToOneField(
         User,
         on_delete=models.CASCADE,
@@ -158,10 +168,15 @@ class Candidate(models.Model):
         blank=True
     )
     salary_currency = models.CharField(max_length=3, default='XOF')
+    # Yearly XOF equivalents of the (monthly) desired salary, see core.salaries
+    desired_salary_min_yearly_xof = models.BigIntegerField(null=True, blank=True, editable=False)
+    desired_salary_max_yearly_xof = models.BigIntegerField(null=True, blank=True, editable=False)
     
     # Availability
     available_from = models.DateField(null=True, blank=True)
     location = models.CharField(max_length=255, blank=True, null=True)
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
     is_available = models.BooleanField(default=True)
     
     # Files and media
@@ -190,11 +205,21 @@ class Candidate(models.Model):
         indexes = [
             models.Index(fields=['location']),
             models.Index(fields=['is_available']),
+            models.Index(fields=['latitude', 'longitude']),
+            models.Index(fields=['desired_salary_min_yearly_xof']),
+            models.Index(fields=['desired_salary_max_yearly_xof']),
+            GinIndex(fields=['skills'], name='candidates_skills_gin'),
         ]
     
     def __str__(self):
         return f"Candidate: {self.id.full_name}"
     
+    def save(self, *args, **kwargs):
+        """Resolve the location and normalize the desired salary before saving"""
+        kwargs['update_fields'] = geo.set_coordinates(self, kwargs.get('update_fields'))
+        kwargs['update_fields'] = salaries.set_yearly_salaries(self, kwargs['update_fields'])
+        super().save(*args, **kwargs)
+    
     def calculate_profile_completeness(self):
         """Calculate and update profile completeness percentage"""
         completeness = 0
@@ -283,6 +308,8 @@ class Recruiter(models.Model):
     )
     industry = models.CharField(max_length=100, blank=True, null=True)
     location = models.CharField(max_length=255, blank=True, null=True)
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
     
     # Payment and subscription
     payment_status = models.CharField(
@@ -303,11 +330,21 @@ class Recruiter(models.Model):
             models.Index(fields=['company_name']),
             models.Index(fields=['payment_status']),
             models.Index(fields=['industry']),
+            GinIndex(
+                fields=['company_name'],
+                name='recruiters_company_name_trgm',
+                opclasses=['gin_trgm_ops']
+            ),
         ]
     
     def __str__(self):
         return f"{self.company_name} - {self.id.full_name}"
     
+    def save(self, *args, **kwargs):
+        """Resolve the location to gazetteer coordinates before saving"""
+        kwargs['update_fields'] = geo.set_coordinates(self, kwargs.get('update_fields'))
+        super().save(*args, **kwargs)
+    
     @property
     def is_subscription_valid(self):
         """Check if subscription is still valid"""
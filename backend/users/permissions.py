@@ -93,13 +93,15 @@ class IsRecruiterOwner(permissions.BasePermission):
         if not request.user.is_authenticated:
             return False
         
-        if hasattr(request.user, 'recruiter_profile'):
+        # Recruiter profiles share their primary key with the user, so
+        # ownership is a foreign key comparison with no extra lookups
+        if request.user.role == 'RECRUITER':
             # For job offers
-            if hasattr(obj, 'recruiter'):
-                return obj.recruiter == request.user.recruiter_profile
+            if hasattr(obj, 'recruiter_id'):
+                return obj.recruiter_id == request.user.pk
             # For applications through job offers
             elif hasattr(obj, 'job_offer'):
-                return obj.job_offer.recruiter == request.user.recruiter_profile
+                return obj.job_offer.recruiter_id == request.user.pk
         
         return False
 
@@ -6,9 +6,10 @@ Handles serialization of User, Candidate, Recruiter, and Admin models
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from .models import User, Candidate, Recruiter, Admin
+from core.projection import SparseFieldsetMixin
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for User model"""
 
     password = serializers.CharField(
@@ -46,7 +47,7 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
 
-class UserDetailSerializer(serializers.ModelSerializer):
+class UserDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Detailed serializer for User model (without password)"""
 
     full_name = serializers.CharField(read_only=True)
@@ -62,7 +63,7 @@ class UserDetailSerializer(serializers.ModelSerializer):
                             'updated_at', 'last_login_at', 'full_name']
 
 
-class CandidateSerializer(serializers.ModelSerializer):
+class CandidateSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Candidate profile"""
 
     user = UserDetailSerializer(source='id', read_only=True)
@@ -89,7 +90,7 @@ class CandidateSerializer(serializers.ModelSerializer):
         return instance
 
 
-class CandidateListSerializer(serializers.ModelSerializer):
+class CandidateListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Lightweight serializer for listing candidates"""
 
     email = serializers.EmailField(source='id.email', read_only=True)
@@ -103,7 +104,7 @@ class CandidateListSerializer(serializers.ModelSerializer):
         ]
 
 
-class RecruiterSerializer(serializers.ModelSerializer):
+class RecruiterSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Recruiter profile"""
 
     user = UserDetailSerializer(source='id', read_only=True)
@@ -126,7 +127,7 @@ class RecruiterSerializer(serializers.ModelSerializer):
         ]
 
 
-class RecruiterListSerializer(serializers.ModelSerializer):
+class RecruiterListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Lightweight serializer for listing recruiters"""
 
     email = serializers.EmailField(source='id.email', read_only=True)
@@ -140,7 +141,7 @@ class RecruiterListSerializer(serializers.ModelSerializer):
         ]
 
 
-class AdminSerializer(serializers.ModelSerializer):
+class AdminSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Admin profile"""
 
     user = UserDetailSerializer(source='id', read_only=True)
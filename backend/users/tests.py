@@ -1,3 +1,196 @@
-from django.test import TestCase
+"""
+Query budget tests for the Users API
+"""
 
-# Create your tests here.
+from decimal import Decimal
+
+from core.testing import (
+    QueryBudgetTestCase, make_user, make_candidate, make_recruiter, make_admin,
+)
+
+
+class UserQueryBudgetTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.admin = make_admin()
+        self.candidate = make_candidate()
+
+    def add_users(self, n=5):
+        for _ in range(n):
+            make_user('CANDIDATE')
+
+    def test_admin_list(self):
+        self.client.force_authenticate(self.admin.id)
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/users/?page_size=100'), grow=self.add_users)
+
+    def test_retrieve(self):
+        self.client.force_authenticate(self.admin.id)
+        self.assertQueryBudget(2, lambda: self.client.get(f'/api/v1/users/{self.candidate.pk}/'))
+
+    def test_me(self):
+        self.client.force_authenticate(self.candidate.id)
+        self.assertQueryBudget(0, lambda: self.client.get('/api/v1/users/me/'))
+
+    def test_update_profile(self):
+        self.client.force_authenticate(self.candidate.id)
+        self.assertQueryBudget(1, lambda: self.client.patch(
+            '/api/v1/users/update_profile/', {'first_name': 'Awa'}, format='json'
+        ))
+
+
+class CandidateQueryBudgetTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.candidate = make_candidate()
+        self.recruiter = make_recruiter()
+
+    def add_candidates(self, n=5):
+        for _ in range(n):
+            make_candidate()
+
+    def test_recruiter_list(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/candidates/?page_size=100'), grow=self.add_candidates)
+
+    def test_retrieve(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertQueryBudget(2, lambda: self.client.get(f'/api/v1/candidates/{self.candidate.pk}/'))
+
+    def test_me(self):
+        self.client.force_authenticate(self.candidate.id)
+        self.assertQueryBudget(1, lambda: self.client.get('/api/v1/candidates/me/'))
+
+    def test_update_profile(self):
+        self.client.force_authenticate(self.candidate.id)
+        self.assertQueryBudget(2, lambda: self.client.patch(
+            '/api/v1/candidates/update_profile/', {'title': 'Backend Developer'}, format='json'
+        ))
+
+
+class RecruiterQueryBudgetTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_recruiter()
+        self.admin = make_admin()
+
+    def add_recruiters(self, n=5):
+        for _ in range(n):
+            make_recruiter()
+
+    def test_admin_list(self):
+        self.client.force_authenticate(self.admin.id)
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/recruiters/?page_size=100'), grow=self.add_recruiters)
+
+    def test_retrieve(self):
+        self.client.force_authenticate(self.admin.id)
+        self.assertQueryBudget(2, lambda: self.client.get(f'/api/v1/recruiters/{self.recruiter.pk}/'))
+
+    def test_me(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertQueryBudget(1, lambda: self.client.get('/api/v1/recruiters/me/'))
+
+    def test_update_profile(self):
+        self.client.force_authenticate(self.recruiter.id)
+        self.assertQueryBudget(1, lambda: self.client.patch(
+            '/api/v1/recruiters/update_profile/', {'industry': 'Fintech'}, format='json'
+        ))
+
+
+class AdminQueryBudgetTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.admin = make_admin()
+        self.client.force_authenticate(self.admin.id)
+
+    def add_admins(self, n=5):
+        for _ in range(n):
+            make_admin()
+
+    def test_list(self):
+        self.assertQueryBudget(2, lambda: self.client.get('/api/v1/admins/?page_size=100'), grow=self.add_admins)
+
+    def test_retrieve(self):
+        self.assertQueryBudget(2, lambda: self.client.get(f'/api/v1/admins/{self.admin.pk}/'))
+
+
+class ProfileConditionalGetTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.candidate = make_candidate()
+        self.client.force_authenticate(make_recruiter().id)
+
+    def test_candidate_detail_follows_user_changes(self):
+        url = f'/api/v1/candidates/{self.candidate.pk}/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        user = self.candidate.id
+        user.first_name = 'Aminata'
+        user.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_candidate_list_not_modified(self):
+        url = '/api/v1/candidates/'
+        etag = self.client.get(url)['ETag']
+        self.assertQueryBudget(1, lambda: self.client.get(url, HTTP_IF_NONE_MATCH=etag))
+
+        make_candidate()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class CandidateSkillsFilterTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.python = make_candidate(skills=['Python', 'Django'])
+        self.react = make_candidate(skills=['React', 'TypeScript'])
+        self.client.force_authenticate(make_recruiter().id)
+
+    def ids(self, response):
+        return {str(item['id']) for item in response.data['results']}
+
+    def test_skills_any(self):
+        response = self.client.get('/api/v1/candidates/?skills_any=Django,React')
+        self.assertEqual(self.ids(response), {str(self.python.pk), str(self.react.pk)})
+
+    def test_skills_all(self):
+        response = self.client.get('/api/v1/candidates/?skills_all=Python,Django')
+        self.assertEqual(self.ids(response), {str(self.python.pk)})
+        self.assertEqual(self.ids(self.client.get('/api/v1/candidates/?skills_all=Python,React')), set())
+
+
+class CandidateRadiusSearchTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cotonou = make_candidate(location='Cotonou, Bénin')
+        self.calavi = make_candidate(location='Abomey-Calavi')
+        self.lome = make_candidate(location='Lomé, Togo')
+        self.client.force_authenticate(make_recruiter().id)
+
+    def test_near(self):
+        response = self.client.get('/api/v1/candidates/?near=Cotonou&radius_km=20')
+        ids = {str(item['id']) for item in response.data['results']}
+        self.assertEqual(ids, {str(self.cotonou.pk), str(self.calavi.pk)})
+
+        response = self.client.get('/api/v1/candidates/?near=Cotonou&radius_km=200')
+        self.assertEqual(response.data['count'], 3)
+
+
+class CandidateSalaryFilterTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.junior = make_candidate(desired_salary_min=Decimal('300000'), desired_salary_max=Decimal('450000'))
+        self.senior = make_candidate(desired_salary_min=Decimal('2000'), salary_currency='EUR')
+        self.client.force_authenticate(make_recruiter().id)
+
+    def test_salary_lte(self):
+        self.assertEqual(self.senior.desired_salary_max_yearly_xof, 15742968)
+        response = self.client.get('/api/v1/candidates/?salary_lte=6000000')
+        self.assertEqual([str(item['id']) for item in response.data['results']], [str(self.junior.pk)])
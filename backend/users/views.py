@@ -19,7 +19,10 @@ from .serializers import (
     RecruiterSerializer, RecruiterListSerializer,
     AdminSerializer, LoginSerializer, LogoutSerializer
 )
+from .filters import CandidateFilter
 from .permissions import IsCandidate, IsRecruiter, IsAdmin
+from core.conditional import ConditionalGetMixin
+from core.projection import SparseFieldsetViewMixin
 
 
 class RegisterView(generics.CreateAPIView):
@@ -105,7 +108,7 @@ class LogoutView(generics.GenericAPIView):
             return Response({'error': 'Invalid token'}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for User model
     Provides CRUD operations for users
@@ -140,13 +143,15 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class CandidateViewSet(viewsets.ModelViewSet):
+class CandidateViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for Candidate model
     Provides CRUD operations for candidate profiles
     """
     queryset = Candidate.objects.all()
     permission_classes = [IsAuthenticated]
+    filterset_class = CandidateFilter
+    last_modified_fields = ['updated_at', 'id__updated_at']
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -156,13 +161,14 @@ class CandidateViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter based on user role"""
         user = self.request.user
+        queryset = Candidate.objects.select_related('id')
         if user.role == 'ADMIN':
-            return Candidate.objects.all()
+            return queryset
         elif user.role == 'CANDIDATE':
-            return Candidate.objects.filter(id=user)
+            return queryset.filter(id=user)
         elif user.role == 'RECRUITER':
             # Recruiters can view all candidates
-            return Candidate.objects.all()
+            return queryset
         return Candidate.objects.none()
 
     @action(detail=False, methods=['get'])
@@ -208,13 +214,14 @@ class CandidateViewSet(viewsets.ModelViewSet):
         }, status=status.HTTP_501_NOT_IMPLEMENTED)
 
 
-class RecruiterViewSet(viewsets.ModelViewSet):
+class RecruiterViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for Recruiter model
     Provides CRUD operations for recruiter profiles
     """
     queryset = Recruiter.objects.all()
     permission_classes = [IsAuthenticated]
+    last_modified_fields = ['updated_at', 'id__updated_at']
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -224,10 +231,11 @@ class RecruiterViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter based on user role"""
         user = self.request.user
+        queryset = Recruiter.objects.select_related('id')
         if user.role == 'ADMIN':
-            return Recruiter.objects.all()
+            return queryset
         elif user.role == 'RECRUITER':
-            return Recruiter.objects.filter(id=user)
+            return queryset.filter(id=user)
         return Recruiter.objects.none()
 
     @action(detail=False, methods=['get'])
@@ -259,7 +267,7 @@ class RecruiterViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class AdminViewSet(viewsets.ModelViewSet):
+class AdminViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for Admin model
     Provides CRUD operations for admin profiles
@@ -267,9 +275,10 @@ class AdminViewSet(viewsets.ModelViewSet):
     queryset = Admin.objects.all()
     serializer_class = AdminSerializer
     permission_classes = [IsAdmin]
+    last_modified_fields = ['updated_at', 'id__updated_at']
 
     def get_queryset(self):
         """Only admins can view admin profiles"""
         if self.request.user.role == 'ADMIN':
-            return Admin.objects.all()
+            return Admin.objects.select_related('id')
         return Admin.objects.none()